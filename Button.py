@@ -4,8 +4,12 @@ import random
 import time
 import math
 
+from input_manager import InputManager
+
 
 class Button:
+    scaled_cache_size = 12  # Scaled surfaces kept per button
+
     def __init__(self,
                  surf,
                  pos,
@@ -36,6 +40,7 @@ class Button:
         if on_click_args==None:
             on_click_args=()
         self.on_click_args = on_click_args
+        self.scaled = {}  # Maps (state surface, size) to that surface scaled, least recently used first
 
     def click(self):
         if not self.enabled:
@@ -56,8 +61,15 @@ class Button:
     def toggle(self):
         self.enabled = not self.enabled
 
+    def reset(self):
+        """ Puts the button back as it was made: enabled, not clicked, and at full size. """
+        self.enabled = True
+        self.clicked = False
+        self.scale = 1.0
+        self.target_scale = 1.0
+
     def is_hovered(self):
-        mpos = pygame.mouse.get_pos()
+        mpos = InputManager.get_mouse_pos()
         min_x = self.x - self.width/2
         max_x = self.x + self.width/2
         min_y = self.y - self.height/2
@@ -77,9 +89,15 @@ class Button:
         else:
             surf = self.surf
         if self.scale != 1.0:
-            width = int(self.width * self.scale)
-            height = int(self.height * self.scale)
-            surf = pygame.transform.scale(surf, (width, height))
+            # Scales only ever differ by whole pixels, so keep each size made, rather than scaling every frame
+            key = surf, (int(self.width * self.scale), int(self.height * self.scale))
+            scaled = self.scaled.pop(key, None)
+            if scaled is None:
+                scaled = pygame.transform.scale(surf, key[1])
+                if len(self.scaled) >= self.scaled_cache_size:
+                    del self.scaled[next(iter(self.scaled))]
+            self.scaled[key] = scaled
+            surf = scaled
         return surf
 
     def draw(self, surface, xoff=0, yoff=0):
@@ -88,20 +106,21 @@ class Button:
         surface.blit(self.get_surf(), (x, y))
 
     def update(self, dt, events):
+        hovered = self.is_hovered()
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
-                    if self.clicked and self.is_hovered():
+                    if self.clicked and hovered:
                         self.click()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
-                    if self.is_hovered():
+                    if hovered:
                         self.clicked = True
         if self.clicked:
-            if not self.is_hovered():
+            if not hovered:
                 self.clicked = False
 
-        if self.is_hovered() and self.enabled:
+        if hovered and self.enabled:
             self.target_scale = 1.0 + self.grow_percent/100
         elif self.pulse and self.enabled:
             self.target_scale = 1.0 + 0.02*math.sin(time.time()*4)
@@ -0,0 +1,173 @@
+"""
+Bakes the game's sprites into one packed atlas, so starting up reads a single file instead of decoding every PNG and
+slicing, flipping and scaling each sprite sheet the first time something needs it.
+
+    python asset_cache.py
+
+writes constants.ASSET_CACHE_PATH. Re-run it after changing any image or animation. The game ignores a cache that's
+older than any image in it, and loads images one at a time as before.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import struct
+
+import pygame
+
+import constants as c
+from image_manager import ImageManager
+from pyracy.sprite_tools import Animation
+
+
+class AssetCache:
+    """
+    Static class to bake and load the atlas.
+
+    The file is a short header, a JSON index, then the atlas as raw BGRA pixels, so loading it is a single
+    pygame.image.frombuffer. The index maps each Animation.from_path key and each image path to rects in the atlas.
+    Loading fills Animation.cache and ImageManager with subsurfaces of the atlas, so later calls find them ready.
+    """
+
+    magic = b"HOATLAS1"
+    pixel_format = "BGRA"  # What convert_alpha gives on little-endian machines, so loading doesn't have to convert
+    width = 1024  # Atlas width in pixels. It's as tall as it needs to be.
+    max_image_side = 512  # Bigger images (backgrounds, splash screens) stay as PNGs
+    image_directory = "assets/images"
+    loaded = False
+    pixels = None  # The loaded file, which the atlas may be using as its pixels, so it has to stay alive
+
+    @staticmethod
+    def collect():
+        """
+        Returns ({cache key: frames}, {path: surface}) for everything to bake: every animation the player and both
+        kinds of enemy use, and every other image that's small enough.
+        """
+        import frame
+        from enemy import Enemy, FastEnemy
+
+        ImageManager.clear_all()
+        Animation.clear_cache()
+        game_frame = frame.GameFrame(None)
+        Enemy(game_frame, (0, 0))
+        FastEnemy(game_frame, (0, 0))
+        animations = {key: animation.frames for key, animation in Animation.cache.items()}
+
+        sheets = {key[0] for key in animations}
+        images = {}
+        for name in sorted(os.listdir(AssetCache.image_directory)):
+            path = f"{AssetCache.image_directory}/{name}"
+            if not name.endswith(".png") or path in sheets:
+                continue
+            surface = ImageManager.load(path)
+            if max(surface.get_size()) <= AssetCache.max_image_side:
+                images[path] = surface
+        return animations, images
+
+    @staticmethod
+    def pack(sizes):
+        """ Lays out rectangles in rows, tallest first. Returns the top left of each, and the height they take. """
+        order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+        positions = [None]*len(sizes)
+        x = y = row_height = 0
+        for i in order:
+            width, height = sizes[i]
+            if x + width > AssetCache.width:
+                x = 0
+                y += row_height
+                row_height = 0
+            positions[i] = (x, y)
+            x += width
+            row_height = max(row_height, height)
+        return positions, y + row_height
+
+    @staticmethod
+    def bake(path=c.ASSET_CACHE_PATH):
+        animations, images = AssetCache.collect()
+        surfaces = [frame for frames in animations.values() for frame in frames] + list(images.values())
+        positions, height = AssetCache.pack([surface.get_size() for surface in surfaces])
+        atlas = pygame.Surface((AssetCache.width, height), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        # Max against transparent black copies every channel exactly, where a normal blit would blend the alpha
+        atlas.blits([(surface, position, None, pygame.BLEND_RGBA_MAX)
+                     for surface, position in zip(surfaces, positions)], doreturn=False)
+
+        rects = iter([x, y, surface.get_width(), surface.get_height()]
+                     for surface, (x, y) in zip(surfaces, positions))
+        fields = tuple(inspect.signature(Animation.cache_key).parameters)
+        index = {
+            "size": [AssetCache.width, height],
+            "sources": sorted({key[0] for key in animations} | set(images)),
+            "animations": [{"key": dict(zip(fields, key)), "frames": [next(rects) for frame in frames]}
+                           for key, frames in animations.items()],
+            "images": {image: next(rects) for image in images},
+        }
+        index_bytes = json.dumps(index, separators=(",", ":")).encode()
+        with open(path, "wb") as file:
+            file.write(AssetCache.magic)
+            file.write(struct.pack("<I", len(index_bytes)))
+            file.write(index_bytes)
+            file.write(pygame.image.tobytes(atlas, AssetCache.pixel_format))
+        return len(surfaces), atlas.get_size()
+
+    @staticmethod
+    def load(path=c.ASSET_CACHE_PATH):
+        """
+        Fills Animation.cache and ImageManager from a baked cache. Needs the display set up, like ImageManager.load.
+        Returns False, leaving them alone, if there's no cache or it's older than any image in it.
+        """
+        if not os.path.exists(path):
+            return False
+        data = bytearray(os.path.getsize(path))  # Writable, since the atlas will use it as its pixels
+        with open(path, "rb") as file:
+            file.readinto(data)
+        if not data.startswith(AssetCache.magic):
+            return False
+        header = len(AssetCache.magic)
+        (index_length,) = struct.unpack_from("<I", data, header)
+        start = header + 4
+        index = json.loads(data[start:start + index_length])
+        baked = os.path.getmtime(path)
+        for source in index["sources"]:
+            if not os.path.exists(source) or os.path.getmtime(source) > baked:
+                return False
+
+        AssetCache.pixels = data
+        pixels = memoryview(data)[start + index_length:]
+        atlas = pygame.image.frombuffer(pixels, tuple(index["size"]), AssetCache.pixel_format)
+        if atlas.get_masks() != pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks():
+            atlas = atlas.convert_alpha()  # Only if the display wants a different layout than the one baked
+        for image, rect in index["images"].items():
+            ImageManager.put(image, atlas.subsurface(rect))
+        if Animation.use_cache:
+            for entry in index["animations"]:
+                key = entry["key"]
+                frames = [atlas.subsurface(rect) for rect in entry["frames"]]
+                if key["colorkey"]:
+                    for frame in frames:
+                        frame.set_colorkey(key["colorkey"])
+                Animation.cache[Animation.cache_key(**key)] = Animation.from_frames(
+                    frames, key["reverse_x"], key["reverse_y"], key["reverse_animation"], key["colorkey"],
+                    key["scale"], key["time_scaling"])
+        AssetCache.loaded = True
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake sprites into a packed atlas for faster startup.")
+    parser.add_argument("--output", default=c.ASSET_CACHE_PATH)
+    args = parser.parse_args()
+
+    from display import Display
+    from sound_manager import SoundManager
+    pygame.init()
+    SoundManager.init()
+    ImageManager.init()
+    Display.init()
+    count, (width, height) = AssetCache.bake(args.output)
+    print(f"Baked {count} sprites into a {width}x{height} atlas: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 import math
 
 import pygame
-import constants as c
+
+from image_manager import ImageManager
 
 
 class Background:
 
     def __init__(self):
         self.tile_size = (150, 150)
-        surf = pygame.image.load("assets/images/background.png")
+        surf = ImageManager.load("assets/images/background.png")
         self.width = surf.get_width()
         self.height = surf.get_height()
         tile_size = self.tile_size
@@ -28,16 +29,59 @@ class Background:
 
             self.tiles.append(row)
 
+        self.view = None  # What's on screen, reused between frames
+        self.view_offset = None  # The whole-pixel offset view was drawn at
+
     def draw(self, surface, offset=(0, 0)):
-        for y, row in enumerate(self.tiles):
-            for x, tile_surf in enumerate(row):
-                xpix = x * self.tile_size[0] + offset[0] - self.width//2
-                ypix = y * self.tile_size[1] + offset[1] - self.height//2
-                if xpix < -self.tile_size[0] or xpix > c.WINDOW_WIDTH + self.tile_size[0]:
-                    continue
-                if ypix < -self.tile_size[1] or ypix > c.WINDOW_HEIGHT + self.tile_size[1]:
-                    continue
-                surface.blit(tile_surf, (xpix, ypix))
+        """
+        Draws the background through a cached copy of the view. When the camera moves, the cache is scrolled and
+        only the strips along its newly exposed edges are redrawn from tiles.
+        """
+        x, y = math.floor(offset[0]), math.floor(offset[1])
+        width, height = surface.get_size()
+        if self.view is None or self.view.get_size() != (width, height):
+            self.view = pygame.Surface((width, height)).convert()
+            self.view_offset = None
+
+        if self.view_offset is None:
+            self.draw_tiles(self.view, (x, y))
+        else:
+            dx = x - self.view_offset[0]
+            dy = y - self.view_offset[1]
+            if abs(dx) >= width or abs(dy) >= height:
+                self.draw_tiles(self.view, (x, y))
+            elif dx or dy:
+                self.view.scroll(dx, dy)
+                if dx > 0:
+                    self.draw_tiles(self.view, (x, y), pygame.Rect(0, 0, dx, height))
+                elif dx < 0:
+                    self.draw_tiles(self.view, (x, y), pygame.Rect(width + dx, 0, -dx, height))
+                if dy > 0:
+                    self.draw_tiles(self.view, (x, y), pygame.Rect(0, 0, width, dy))
+                elif dy < 0:
+                    self.draw_tiles(self.view, (x, y), pygame.Rect(0, height + dy, width, -dy))
+        self.view_offset = (x, y)
+        surface.blit(self.view, (0, 0))
+
+    def draw_tiles(self, surface, offset=(0, 0), area=None):
+        """ Draws the tiles overlapping area (default all of surface) straight onto surface. """
+        if area is None:
+            area = surface.get_rect()
+        tile_width, tile_height = self.tile_size
+        left = math.floor(offset[0]) - self.width//2
+        top = math.floor(offset[1]) - self.height//2
+        first_x = max(0, (area.left - left)//tile_width)
+        last_x = min(len(self.tiles[0]) - 1, (area.right - 1 - left)//tile_width)
+        first_y = max(0, (area.top - top)//tile_height)
+        last_y = min(len(self.tiles) - 1, (area.bottom - 1 - top)//tile_height)
+
+        surface.set_clip(area)
+        surface.fill((0, 0, 0), area)  # Anything past the edge of the background
+        for y in range(first_y, last_y + 1):
+            row = self.tiles[y]
+            for x in range(first_x, last_x + 1):
+                surface.blit(row[x], (x*tile_width + left, y*tile_height + top))
+        surface.set_clip(None)
 
     def update(self, dt, events):
-        pass
\ No newline at end of file
+        pass
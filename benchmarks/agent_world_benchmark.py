@@ -0,0 +1,74 @@
+"""
+Simulation ticks per second against enemy count, with enemies as objects (each with its own update), with their
+kinematics in an EnemyStore, and as entities in an AgentWorld run by its systems. Also times the enemy step on
+its own, without the rest of GameFrame.update.
+"""
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from ecs import AgentWorld
+
+DT = 0.01
+WARMUP = 20
+TICKS = 30
+COUNTS = (100, 300, 1000, 3000)
+MODELS = (
+    ("objects", False, False),
+    ("EnemyStore", True, False),
+    ("AgentWorld", False, True),
+)
+
+
+def make_frame(count, vectorized, entities):
+    c.VECTORIZED_ENEMIES = vectorized
+    c.ENTITY_AGENTS = entities
+    frame = common.make_frame()
+    frame.player.god_mode()
+    for i in range(count):
+        frame.spawn_goomba()
+    frame.particles.clear()  # Each one lands with a puff of poofs
+    for i in range(WARMUP):  # Long enough for some to start walking and bumping into each other
+        frame.update(DT, [])
+    return frame
+
+
+def enemy_step(frame):
+    """ Just the agents stage of GameFrame.update. """
+    agents = frame.depth_order.items
+    if frame.agent_world is not None:
+        return lambda: frame.update_world_agents(DT, [])
+    if frame.enemy_store is not None:
+        return lambda: frame.update_stored_agents(agents, DT, [])
+
+    def step():
+        for agent in agents:
+            agent.update(DT, [])
+    return step
+
+
+def main():
+    common.init()
+    if not AgentWorld.available():
+        print("numpy isn't installed, so there's no AgentWorld to compare against")
+        return
+    print(f"Whole GameFrame.update, ticks per second (min of {TICKS} ticks)")
+    print(f"{'enemies':>10}" + "".join(f"{name:>14}" for name, vectorized, entities in MODELS))
+    steps = {}
+    for count in COUNTS:
+        row = f"{count:>10}"
+        for name, vectorized, entities in MODELS:
+            frame = make_frame(count, vectorized, entities)
+            seconds = min(common.time_it(lambda: frame.update(DT, [])) for i in range(TICKS))
+            row += f"{1/seconds:>14.1f}"
+            steps[count, name] = min(common.time_it(enemy_step(frame)) for i in range(TICKS))
+        print(row)
+
+    print("Enemy step alone, ms per tick")
+    print(f"{'enemies':>10}" + "".join(f"{name:>14}" for name, vectorized, entities in MODELS))
+    for count in COUNTS:
+        print(f"{count:>10}" + "".join(f"{steps[count, name]*1000:>14.3f}" for name, vectorized, entities in MODELS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Cold start: loading each image the first time something asks for it (the way the game always has), against loading
+a baked AssetCache up front. Each run is a fresh process, so nothing is already decoded.
+
+"All sprites" is every animation and image the cache holds, made the old way or read from the cache. The rest are
+the hitches in the middle of play the first time a zombie, fast zombie or shot needed its sprites, after a GameFrame
+has been made (and, for the cache, after loading it).
+"""
+
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # Before pygame, so the environment is set up first
+
+RUNS = 5
+PHASES = ("all sprites", "first zombie", "first fast zombie", "first shot")
+
+
+def load_everything(cache_path):
+    """ Asks for every animation and image in the cache, the way the game would. """
+    from asset_cache import AssetCache
+    from image_manager import ImageManager
+    from pyracy.sprite_tools import Animation
+
+    with open(cache_path, "rb") as file:
+        data = file.read()
+    header = len(AssetCache.magic)
+    (length,) = struct.unpack_from("<I", data, header)
+    index = json.loads(data[header + 4:header + 4 + length])
+    start = time.perf_counter()
+    if sys.argv[3] == "cache":
+        assert AssetCache.load(cache_path), "cache didn't load"
+    for entry in index["animations"]:
+        Animation.from_path(**entry["key"])
+    for image in index["images"]:
+        ImageManager.load(image)
+    return time.perf_counter() - start
+
+
+def play(cache_path):
+    """ Times the first zombie, fast zombie and shot after making a GameFrame. """
+    from asset_cache import AssetCache
+    from bullet import Bullet
+    from enemy import Enemy, FastEnemy
+    from particle import SparkParticle
+    from primitives import Pose
+
+    if sys.argv[3] == "cache":
+        assert AssetCache.load(cache_path), "cache didn't load"
+    frame = common.make_frame()
+    times = []
+    for make in (lambda: Enemy(frame, (0, 0)),
+                 lambda: FastEnemy(frame, (0, 0)),
+                 lambda: (Bullet((0, 0), (1, 0), frame=frame), frame.particles.spawn(SparkParticle, (0, 0), Pose((1, 0))))):
+        start = time.perf_counter()
+        make()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def child():
+    """ Runs in the subprocess, and prints its times on one line. """
+    common.init()
+    cache_path = sys.argv[2]
+    times = [load_everything(cache_path)] if sys.argv[4] == "sprites" else play(cache_path)
+    print(" ".join(str(seconds) for seconds in times))
+
+
+def best_of(cache_path, mode, part):
+    best = None
+    for i in range(RUNS):
+        output = subprocess.run([sys.executable, __file__, "--child", cache_path, mode, part],
+                                capture_output=True, text=True, check=True).stdout
+        times = [float(value) for value in output.split("\n")[-2].split()]
+        best = times if best is None else [min(pair) for pair in zip(best, times)]
+    return best
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        child()
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "atlas.cache")
+        subprocess.run([sys.executable, os.path.join(common.ROOT, "asset_cache.py"), "--output", cache_path],
+                       capture_output=True, check=True)
+        print(f"Cache: {os.path.getsize(cache_path)} bytes")
+        results = {label: best_of(cache_path, mode, "sprites") + best_of(cache_path, mode, "play")
+                   for label, mode in (("PNG on first use", "lazy"), ("AssetCache", "cache"))}
+    for i, phase in enumerate(PHASES):
+        print(phase)
+        for label, times in results.items():
+            common.report(f"  {label}", times[i])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Static layers per frame (background and vignette) at 800x600 and 1920x1080, with the camera drifting a few pixels
+a frame: drawn from tiles with an alpha blended vignette, against the scrolling background cache and the multiply
+blended vignette mask.
+"""
+
+import math
+import random
+
+import common  # Before pygame, so the environment is set up first
+import pygame
+
+FRAMES = 300
+
+
+def camera_path(seed=0):
+    """ A smooth wander around the middle of the arena, like the camera following the player. """
+    generator = random.Random(seed)
+    x, y, angle = 0.0, 0.0, 0.0
+    path = []
+    for i in range(FRAMES):
+        angle += generator.uniform(-0.3, 0.3)
+        x += math.cos(angle)*3
+        y += math.sin(angle)*3
+        path.append((x, y))
+    return path
+
+
+def main():
+    common.init()
+    frame = common.make_frame()
+    background = frame.background
+
+    for size in ((800, 600), (1920, 1080)):
+        surface = pygame.Surface(size).convert()
+        vignette = frame.vignette
+        if vignette.get_size() != size:
+            vignette = pygame.transform.smoothscale(vignette, size)
+        centre = (size[0]//2, size[1]//2)
+        path = [(centre[0] - x, centre[1] - y) for x, y in camera_path()]
+
+        def tiles():
+            for offset in path:
+                background.draw_tiles(surface, offset)
+                surface.blit(vignette, (0, 0))
+
+        def cached():
+            background.view = None
+            for offset in path:
+                background.draw(surface, offset)
+                surface.blit(frame.get_vignette_mask(size), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+
+        print(f"{size[0]}x{size[1]}, per frame")
+        common.report("  tiles and vignette", common.time_it(tiles)/FRAMES)
+        common.report("  background cache and vignette mask", common.time_it(cached)/FRAMES)
+
+
+if __name__ == "__main__":
+    main()
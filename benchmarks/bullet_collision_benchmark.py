@@ -0,0 +1,142 @@
+"""
+Bullet hits: each enemy checking the bullets that ended the tick near it (the way Enemy.update used to), against
+GameFrame.collide_bullets sweeping each bullet's path once per tick.
+
+First checks that the sweep can't be tunnelled through: bullets fired straight at an enemy from every distance, at
+several frame rates, should all register, and a piercing bullet should hit the enemies nearest it first.
+"""
+
+import random
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from bullet import Bullet
+from enemy import Enemy
+from primitives import Pose
+from spatial_hash import SpatialHash
+
+FRAME_TIMES = (1/120, 1/60, 1/30, 0.05)  # 0.05 is the longest step main.py allows
+REPEATS = 20
+
+
+def make_empty_frame():
+    frame = common.make_frame()
+    frame.enemies.clear()
+    for agent in list(frame.depth_order):
+        if not agent.is_player:
+            frame.depth_order.discard(agent)
+    frame.depth_order.repair()
+    return frame
+
+
+def add_enemy(frame, position):
+    enemy = Enemy(frame, position)
+    enemy.health = 10**9
+    frame.enemies.append(enemy)
+    frame.depth_order.insert(enemy)
+    frame.enemy_grid.insert(enemy)
+    return enemy
+
+
+def discrete_hits(frame, bullets):
+    """ The old test: each enemy looks for bullets overlapping it where they ended the tick. """
+    grid = SpatialHash(c.COLLISION_CELL_SIZE)
+    grid.rebuild(bullets)
+    diff = Pose((0, 0))
+    for enemy in frame.enemies:
+        for bullet in grid.query(enemy.position.x, enemy.position.y, 50):
+            if not bullet.can_hit(enemy):
+                continue
+            if bullet.position.sub_into(enemy.position, diff).magnitude() < enemy.radius + bullet.radius:
+                enemy.get_hurt(bullet)
+
+
+def fire(frame, distance, dt, swept):
+    """ Fires one bullet along the x axis at an enemy at the origin, and returns whether it hit. """
+    bullet = Bullet((-distance, 0), (1, 0), frame=frame)
+    enemy = frame.enemies[0]
+    while not bullet.destroyed and bullet.position.x < 200:
+        x, y = bullet.position.x, bullet.position.y
+        bullet.update(dt, [])
+        if swept:
+            frame.collide_bullets([(bullet, x, y)])
+        else:
+            discrete_hits(frame, [bullet])
+    return enemy in bullet.enemies_hit
+
+
+def check_tunnelling():
+    frame = make_empty_frame()
+    add_enemy(frame, (0, 0))
+    distances = range(60, 260)
+    print("Bullets fired straight at an enemy from 60 to 260 px away that hit it")
+    for dt in FRAME_TIMES:
+        discrete = sum(fire(frame, distance, dt, False) for distance in distances)
+        swept = sum(fire(frame, distance, dt, True) for distance in distances)
+        print(f"  {1/dt:>5.0f} FPS: discrete {discrete:>3}/{len(distances)}, swept {swept:>3}/{len(distances)}")
+        assert swept == len(distances), "swept bullets tunnelled"
+
+    frame = make_empty_frame()
+    # Listed furthest first, so the hits have to be put in order along the path
+    for x in (300, 200, 100):
+        add_enemy(frame, (x, 0))
+    bullet = Bullet((0, 0), (1, 0), pierce=2, frame=frame)
+    bullet.update(0.15, [])
+    frame.collide_bullets([(bullet, 0, 0)])
+    hit = sorted(enemy.position.x for enemy in bullet.enemies_hit)
+    print(f"  Pierce 2 through enemies at x = 100, 200 and 300 in one step hits x = {hit}")
+    assert hit == [100, 200], "pierce should take the nearest enemies first"
+
+
+def populate(frame, enemy_count, bullet_count, dt):
+    generator = random.Random(enemy_count + bullet_count)
+    for i in range(enemy_count):
+        add_enemy(frame, (generator.uniform(-c.ARENA_WIDTH/2, c.ARENA_WIDTH/2),
+                          generator.uniform(-c.ARENA_HEIGHT/2, c.ARENA_HEIGHT/2)))
+    frame.depth_order.repair()
+    paths = []
+    for i in range(bullet_count):
+        direction = Pose((1, 0))
+        direction.rotate_position(generator.random()*360)
+        bullet = Bullet((generator.uniform(-c.ARENA_WIDTH/2, c.ARENA_WIDTH/2),
+                         generator.uniform(-c.ARENA_HEIGHT/2, c.ARENA_HEIGHT/2)),
+                        direction.get_position(), pierce=10**9, frame=frame)
+        paths.append((bullet, bullet.position.x - bullet.velocity.x*dt, bullet.position.y - bullet.velocity.y*dt))
+    return paths
+
+
+def throughput():
+    dt = 1/60
+    for enemy_count in (40, 200, 1000):
+        for bullet_count in (10, 100, 1000):
+            frame = make_empty_frame()
+            paths = populate(frame, enemy_count, bullet_count, dt)
+            bullets = [bullet for bullet, x, y in paths]
+
+            def reset():
+                for bullet in bullets:
+                    bullet.enemies_hit.clear()
+
+            def old():
+                reset()
+                discrete_hits(frame, bullets)
+
+            def new():
+                reset()
+                frame.collide_bullets(paths)
+
+            print(f"{enemy_count} enemies, {bullet_count} bullets, per tick")
+            for label, func in (("per-enemy discrete checks", old), ("GameFrame.collide_bullets", new)):
+                seconds = common.time_it(func, REPEATS)
+                hits = sum(len(bullet.enemies_hit) for bullet in bullets)
+                common.report(f"  {label} ({hits} hits)", seconds)
+
+
+def main():
+    check_tunnelling()
+    throughput()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Draw cost of 500 live bullets, rotating the bullet sprite every frame versus reading from the RotationCache.
+"""
+
+import math
+import random
+
+import common  # Before pygame, so the environment is set up first
+import pygame
+from bullet import Bullet
+from primitives import Pose
+from rotation_cache import RotationCache
+
+BULLETS = 500
+
+
+def draw_uncached(bullets, surface):
+    """ The old Bullet.draw. """
+    for bullet in bullets:
+        position = bullet.position + Pose((0, 0))
+        surf = pygame.transform.rotate(Bullet.sprite, bullet.velocity.get_angle_of_position()*180/math.pi)
+        position += Pose((-surf.get_width()//2, -surf.get_height()//2))
+        surface.blit(surf, position.get_position())
+
+
+def draw_cached(bullets, surface):
+    for bullet in bullets:
+        bullet.draw(surface, (0, 0))
+
+
+def main():
+    screen = common.init()
+    frame = common.make_frame()
+    bullets = []
+    for i in range(BULLETS):
+        direction = Pose((1, 0))
+        direction.rotate_position(random.random()*360)
+        position = (random.random()*screen.get_width(), random.random()*screen.get_height())
+        bullets.append(Bullet(position, direction.get_position(), frame=frame))
+
+    repeats = 50
+    print(f"Drawing {BULLETS} bullets")
+    common.report("  pygame.transform.rotate per bullet", common.time_it(lambda: draw_uncached(bullets, screen), repeats))
+    RotationCache.clear_all()
+    common.report("  RotationCache, cold", common.time_it(lambda: draw_cached(bullets, screen)))
+    common.report("  RotationCache, warm", common.time_it(lambda: draw_cached(bullets, screen), repeats))
+    print(f"  cached rotations: {len(RotationCache.cache)}, hit rate "
+          f"{RotationCache.hits/(RotationCache.hits + RotationCache.misses):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+The bullet and projectile stages at 100, 1000 and 10000 bullets, a third of them seeking, among 40 enemies:
+Bullet.update and GameFrame.collide_bullets one bullet at a time (the default), against a BulletSystem updating and
+sweeping them all at once. Firing is timed separately, since that's where plain seeking bullets pick their first
+target; stored ones pick theirs on the next tick.
+"""
+
+import random
+import time
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from bullet import Bullet
+from bullet_system import BulletSystem, StoredBullet
+from primitives import Pose
+
+ENEMIES = 40
+TICKS = 10
+TRIALS = 3  # Best of, since firing thousands of bullets at once is noisy
+DT = 1/60
+
+
+def make_shots(count):
+    generator = random.Random(count)
+    shots = []
+    for i in range(count):
+        direction = Pose((1, 0))
+        direction.rotate_position(generator.random()*360)
+        position = (generator.uniform(-c.ARENA_WIDTH/2, c.ARENA_WIDTH/2),
+                    generator.uniform(-c.ARENA_HEIGHT/2, c.ARENA_HEIGHT/2))
+        shots.append((position, direction.get_position(), i % 3 == 0))
+    return shots
+
+
+def fire(frame, bullet_class, shots):
+    return [bullet_class(position, direction, frame=frame, homing=homing, refundable=True)
+            for position, direction, homing in shots]
+
+
+def scalar_tick(frame, bullets):
+    """ The bullet and projectile stages of GameFrame.update without a BulletSystem. """
+    paths = []
+    for bullet in bullets[:]:
+        x, y = bullet.position.x, bullet.position.y
+        bullet.update(DT, [])
+        if bullet.destroyed:
+            bullets.remove(bullet)
+        else:
+            paths.append((bullet, x, y))
+    frame.collide_bullets(paths)
+
+
+def stored_tick(frame):
+    frame.bullet_system.update(DT, frame)
+    frame.bullet_system.collide(frame)
+
+
+def run(frame, count):
+    shots = make_shots(count)
+    results = {}
+
+    start = time.perf_counter()
+    bullets = fire(frame, Bullet, shots)
+    fired = time.perf_counter()
+    for tick in range(TICKS):
+        scalar_tick(frame, bullets)
+    results["Bullet"] = fired - start, (time.perf_counter() - fired)/TICKS
+
+    frame.bullet_system = BulletSystem()
+    start = time.perf_counter()
+    fire(frame, StoredBullet, shots)
+    fired = time.perf_counter()
+    for tick in range(TICKS):
+        stored_tick(frame)
+    results["BulletSystem"] = fired - start, (time.perf_counter() - fired)/TICKS
+    return results
+
+
+def main():
+    frame = common.make_frame()
+    frame.player.upgrades = ["Seeking", "Green"]
+    frame.player.infinite_ammo = True
+    for i in range(ENEMIES):
+        frame.spawn_goomba()
+    for count in (100, 1000, 10000):
+        print(f"{count} bullets, {ENEMIES} enemies")
+        trials = [run(frame, count) for i in range(TRIALS)]
+        for label in trials[0]:
+            common.report(f"  {label}: firing", min(trial[label][0] for trial in trials))
+            common.report(f"  {label}: per tick", min(trial[label][1] for trial in trials))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+The delivery menu's buttons: scaling a hovered or pulsing button's surface every frame against keeping each size
+made, reading the mouse for every hover check against once a frame, and building every button each time the menu
+opens against building each upgrade's button once.
+"""
+
+import math
+
+import common  # Before pygame, so the environment is set up first
+
+import pygame
+
+from display import Display
+from input_manager import InputManager, PygameInput
+
+REPEATS = 2000
+OPENINGS = 50
+
+
+class UncachedInput(PygameInput):
+    """ Reads the mouse every time it's asked, as PygameInput used to. """
+
+    def get_mouse_pos(self):
+        return Display.window_to_render(pygame.mouse.get_pos())
+
+
+def draw_scaled(button, surface, cached):
+    if not cached:
+        button.scaled.clear()
+    button.draw(surface)
+
+
+def scaling(menu, surface):
+    button = menu.starting_buttons[0]
+    button.x, button.y = 400, 300
+    for label, scales in (("hovered, at 110%", [1.1]),
+                          ("pulsing", [1 + 0.02*math.sin(frame/60*4) for frame in range(120)])):
+        print(f"A delivery button {label}, per frame")
+        for name, cached in (("transform.scale every frame", False), ("Button.scaled", True)):
+            frames = iter(range(10**9))
+
+            def draw():
+                button.scale = scales[next(frames) % len(scales)]
+                draw_scaled(button, surface, cached)
+
+            common.report(f"  {name}", common.time_it(draw, REPEATS))
+
+
+def mouse_reads(menu, surface):
+    menu.lower()
+    menu.lowered = 1
+    calls = [0]
+    get_pos = pygame.mouse.get_pos
+
+    def counted_get_pos():
+        calls[0] += 1
+        return get_pos()
+
+    pygame.mouse.get_pos = counted_get_pos
+    print(f"Delivery menu with {len(menu.buttons)} buttons, update and draw per frame")
+    for name, provider in (("reading the mouse every time", UncachedInput()), ("once a frame", PygameInput())):
+        InputManager.set_provider(provider)
+
+        def frame():
+            PygameInput.refresh()
+            menu.update(1/60, [])
+            menu.draw(surface)
+
+        calls[0] = 0
+        seconds = common.time_it(frame, REPEATS)
+        common.report(f"  {name} ({calls[0]/REPEATS:.0f} mouse reads)", seconds)
+    pygame.mouse.get_pos = get_pos
+    InputManager.set_provider(PygameInput())
+    menu.raise_up()
+
+
+def openings(menu):
+    print(f"Opening the delivery menu, per opening ({OPENINGS} times)")
+    build = menu.build_delivery_button
+    built = [0]
+
+    def counted_build(upgrade):
+        built[0] += 1
+        return build(upgrade)
+
+    menu.build_delivery_button = counted_build
+    for name, memoized in (("building every button", False), ("building each upgrade's once", True)):
+        def open_menu():
+            if not memoized:
+                menu.made_buttons.clear()
+            menu.lower()
+
+        built[0] = 0
+        seconds = common.time_it(open_menu, OPENINGS)
+        common.report(f"  {name} ({built[0]} built)", seconds)
+    del menu.build_delivery_button
+
+
+def main():
+    frame = common.make_frame()
+    menu = frame.delivery
+    surface = common.screen
+    scaling(menu, surface)
+    mouse_reads(menu, surface)
+    openings(menu)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-tick cost of the enemy/bullet collision queries, using the spatial hash versus scanning every object.
+"""
+
+import random
+
+import common
+from primitives import Pose
+from bullet import Bullet
+from spatial_hash import SpatialHash
+import constants as c
+
+bullet_grid = SpatialHash(c.COLLISION_CELL_SIZE)
+
+
+def populate(frame, enemy_count, bullet_count):
+    for i in range(enemy_count):
+        frame.spawn_goomba()
+    frame.bullets = []
+    for i in range(bullet_count):
+        x = random.random()*c.ARENA_WIDTH - c.ARENA_WIDTH//2
+        y = random.random()*c.ARENA_HEIGHT - c.ARENA_HEIGHT//2
+        direction = Pose((1, 0))
+        direction.rotate_position(random.random()*360)
+        frame.bullets.append(Bullet((x, y), direction.get_position(), frame=frame))
+    frame.particles.clear()
+
+
+def brute_force_queries(frame):
+    """ The candidate scan each enemy used to do before the spatial hash. """
+    found = 0
+    for enemy in frame.enemies:
+        min_x, max_x = enemy.position.x - 50, enemy.position.x + 50
+        min_y, max_y = enemy.position.y - 50, enemy.position.y + 50
+        for item in frame.enemies:
+            if min_x <= item.position.x <= max_x and min_y <= item.position.y <= max_y:
+                found += 1
+        for bullet in frame.bullets:
+            if min_x <= bullet.position.x <= max_x and min_y <= bullet.position.y <= max_y:
+                found += 1
+    return found
+
+
+def grid_queries(frame):
+    found = 0
+    frame.enemy_grid.rebuild(frame.enemies)
+    bullet_grid.rebuild(frame.bullets)
+    for enemy in frame.enemies:
+        found += len(frame.enemy_grid.query(enemy.position.x, enemy.position.y, 50))
+        found += len(bullet_grid.query(enemy.position.x, enemy.position.y, 50))
+    return found
+
+
+def main():
+    for enemy_count in (40, 200, 1000):
+        frame = common.make_frame()
+        populate(frame, enemy_count, enemy_count//2)
+        repeats = max(2, 2000//enemy_count)
+        print(f"{enemy_count} enemies, {len(frame.bullets)} bullets")
+        common.report("  brute force queries per tick", common.time_it(lambda: brute_force_queries(frame), repeats))
+        common.report("  spatial hash queries per tick", common.time_it(lambda: grid_queries(frame), repeats))
+        common.report("  GameFrame.update per tick", common.time_it(lambda: frame.update(0.01, []), repeats))
+
+
+if __name__ == "__main__":
+    main()
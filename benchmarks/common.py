@@ -0,0 +1,57 @@
+"""
+Shared setup for the benchmark scripts. Run them from anywhere, e.g. ``python benchmarks/collision_benchmark.py``.
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.chdir(ROOT)  # Asset paths are relative to the repo root
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pygame
+
+from display import Display
+from image_manager import ImageManager
+from sound_manager import SoundManager
+
+screen = None
+
+
+def init():
+    global screen
+    if screen is not None:
+        return screen
+    pygame.init()
+    SoundManager.init()
+    ImageManager.init()
+    Display.init()
+    screen = Display.render_surface
+    return screen
+
+
+def make_frame(seed=0):
+    init()
+    import frame as f
+    random.seed(seed)
+    return f.GameFrame(None)
+
+
+def time_it(func, repeats=1):
+    """ Returns the average wall time of func() in seconds. """
+    start = time.perf_counter()
+    for i in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def report(label, seconds, unit="ms"):
+    scale = {"ms": 1000, "us": 1000000, "s": 1}[unit]
+    print(f"{label:<48}{seconds*scale:>12.3f} {unit}")
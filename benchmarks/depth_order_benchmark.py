@@ -0,0 +1,88 @@
+"""
+Keeping agents in depth order at 40, 400 and 4000 agents: building a list and sorting it every tick (the way
+GameFrame.update used to), against repairing a DepthOrder. Agents drift a pixel or two a tick. Also times spawning
+a few agents (appending and re-sorting, against inserting) and finding the agents in a band of y values.
+"""
+
+import random
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from depth_order import DepthOrder
+from primitives import Pose
+
+TICKS = 100
+SPAWNS = 10
+
+
+class Agent:
+    def __init__(self, generator):
+        self.position = Pose((generator.uniform(-c.ARENA_WIDTH/2, c.ARENA_WIDTH/2),
+                              generator.uniform(-c.ARENA_HEIGHT/2, c.ARENA_HEIGHT/2)))
+
+
+def run(count):
+    generator = random.Random(count)
+    player = Agent(generator)
+    enemies = [Agent(generator) for i in range(count - 1)]
+    enemies.sort(key=lambda each: each.position.y)
+    order = DepthOrder([player] + enemies)
+    # The same motion for both, generated up front so it isn't timed
+    steps = [[generator.uniform(-1.5, 1.5) for agent in enemies] for tick in range(TICKS)]
+
+    def move(tick):
+        for agent, step in zip(enemies, steps[tick]):
+            agent.position.y += step
+
+    def sort_every_tick():
+        for tick in range(TICKS):
+            move(tick)
+            agents = [player] + enemies
+            agents.sort(key=lambda agent: agent.position.y)
+
+    def repair_every_tick():
+        for tick in range(TICKS):
+            move(tick)
+            order.repair()
+
+    movement = common.time_it(lambda: [move(tick) for tick in range(TICKS)])
+    print(f"{count} agents, per tick")
+    common.report("  list and sort", (common.time_it(sort_every_tick) - movement)/TICKS, "us")
+    order.repair()  # Catch up with the movement above, so only the timed ticks' drift is repaired
+    common.report("  DepthOrder.repair", (common.time_it(repair_every_tick) - movement)/TICKS, "us")
+
+    order.repair()
+    enemies.sort(key=lambda each: each.position.y)
+    spawned = [Agent(generator) for i in range(SPAWNS)]
+
+    def append_and_sort():
+        agents = enemies[:]
+        for agent in spawned:
+            agents.append(agent)
+            agents.sort(key=lambda each: each.position.y)
+
+    def insert():
+        copy = DepthOrder()
+        copy.items = order.items[:]
+        copy.keys = order.keys[:]
+        for agent in spawned:
+            copy.insert(agent)
+
+    common.report(f"  spawn {SPAWNS}: append and sort", common.time_it(append_and_sort, 20), "us")
+    common.report(f"  spawn {SPAWNS}: DepthOrder.insert", common.time_it(insert, 20), "us")
+
+    def scan_band():
+        return [agent for agent in order.items if -50 <= agent.position.y <= 50]
+
+    common.report("  band of 100px: scan", common.time_it(scan_band, 100), "us")
+    common.report("  band of 100px: DepthOrder.between", common.time_it(lambda: order.between(-50, 50), 100), "us")
+
+
+def main():
+    for count in (40, 400, 4000):
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Enemy kinematics (damping, speed cap, integration and arena clamping) for 1k and 10k enemies, done per enemy with
+Poses and all at once through an EnemyStore. Also checks the two stay within float32 tolerance of each other, and
+times a whole GameFrame.update with each backend.
+"""
+
+import random
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from enemy import Enemy
+from enemy_store import EnemyStore, StoredEnemy
+
+DT = 0.01
+STEPS = 100
+
+
+def populate(frame, enemy_class, count, seed):
+    """ Adds count enemies with the same random kinematic state for the same seed. """
+    generator = random.Random(seed)
+    enemies = []
+    for i in range(count):
+        x = generator.uniform(-c.ARENA_WIDTH/2, c.ARENA_WIDTH/2)
+        y = generator.uniform(-c.ARENA_HEIGHT/2, c.ARENA_HEIGHT/2)
+        enemy = enemy_class(frame, (x, y))
+        enemy.velocity.set_position((generator.uniform(-200, 200), generator.uniform(-200, 200)))
+        enemy.arrived = generator.random() < 0.5
+        enemy.dead = generator.random() < 0.1
+        enemies.append(enemy)
+    frame.particles.clear()  # Each one lands with a puff of poofs
+    return enemies
+
+
+def step_scalar(enemies):
+    for enemy in enemies:
+        enemy.update_speed(DT)
+        enemy.update_position(DT)
+
+
+def step_store(store):
+    store.update_speed(DT)
+    store.update_position(DT)
+
+
+def largest_difference(scalar, stored):
+    worst = 0
+    for a, b in zip(scalar, stored):
+        worst = max(worst, abs(a.position.x - b.position.x), abs(a.position.y - b.position.y),
+                    abs(a.velocity.x - b.velocity.x), abs(a.velocity.y - b.velocity.y))
+    return worst
+
+
+def kinematics(count):
+    frame = common.make_frame()
+    frame.enemy_store = EnemyStore()
+    scalar = populate(frame, Enemy, count, count)
+    stored = populate(frame, StoredEnemy, count, count)
+
+    for i in range(STEPS):
+        step_scalar(scalar)
+        step_store(frame.enemy_store)
+    difference = largest_difference(scalar, stored)
+
+    scalar_time = common.time_it(lambda: step_scalar(scalar), 20)
+    store_time = common.time_it(lambda: step_store(frame.enemy_store), 20)
+
+    print(f"{count} enemies")
+    common.report("  per enemy with Poses", scalar_time)
+    common.report("  EnemyStore", store_time)
+    print(f"  largest difference after {STEPS} steps: {difference:.2e} px")
+
+
+def full_update(count, vectorized):
+    c.VECTORIZED_ENEMIES = vectorized
+    frame = common.make_frame()
+    frame.player.god_mode()
+    for i in range(count):
+        frame.spawn_goomba()
+    frame.particles.clear()
+    return common.time_it(lambda: frame.update(DT, []), 20)
+
+
+def main():
+    common.init()
+    if not EnemyStore.available():
+        print("numpy isn't installed, so there's no EnemyStore to compare against")
+        return
+    for count in (1000, 10000):
+        kinematics(count)
+
+    count = 1000
+    print(f"Whole GameFrame.update with {count} enemies")
+    common.report("  plain enemies", full_update(count, False))
+    common.report("  enemies in an EnemyStore", full_update(count, True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Gary.draw on the longest line of the sticker monologue: the old way, word wrapping the line and blitting each
+character every frame, against a TextLayout made once per line and revealed with a clipped blit per row.
+
+First checks that the two draw the same pixels for every line of dialog, part way through revealing it and fully
+revealed, at full and half opacity.
+"""
+
+import time
+
+import common  # Before pygame, so the environment is set up first
+
+import pygame
+
+import constants as c
+
+REPEATS = 2000
+
+
+def old_draw_text(gary, surface):
+    """ The text part of Gary.draw as it was. """
+    chars_showing = gary.since_start_line * c.CPS
+    text = gary.current_line()
+    words = text.split() if text else []
+    max_width = 400
+    x0 = 300
+    y0 = surface.get_height() - 120
+    x = x0
+    y = y0
+    drawn = 0
+    for word in words:
+        width = sum([gary.letters[letter].get_width() for letter in word])
+        if x + width > x0 + max_width:
+            x = x0
+            y += 26
+        red = False
+        for letter in word:
+            if letter == "|":
+                red = True
+                continue
+            gary.letters[letter].set_alpha(255 * gary.showing)
+            if not red:
+                surface.blit(gary.letters[letter], (x, y))
+            else:
+                surface.blit(gary.red_letters[letter], (x, y))
+            drawn += 1
+            x += gary.letters[letter].get_width()
+            if drawn >= chars_showing:
+                break
+        if drawn >= chars_showing:
+            break
+        x += gary.letters[" "].get_width()
+        drawn += 1
+
+
+def render(gary, draw_text, surface):
+    surface.fill((40, 60, 80))
+    draw_text(gary, surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def check_identical(gary, surface):
+    lines = [line for group in gary.all_lines for line in group] + list(c.DISCONNECT_LINES)
+    checked = 0
+    for line in lines:
+        gary.lines = [line]
+        for showing in (1, 0.5):
+            gary.showing = showing
+            for characters in (0, 1, 7.5, 20, 45.2, len(line)/2, len(line) + 1):
+                gary.since_start_line = characters/c.CPS
+                assert render(gary, old_draw_text, surface) == render(gary, type(gary).draw_line, surface), \
+                    f"{line!r} differs at {characters} characters, showing {showing}"
+                checked += 1
+    print(f"Identical pixels for {len(lines)} lines, {checked} reveal states")
+
+
+def main():
+    frame = common.make_frame()
+    gary = frame.gary
+    surface = common.screen
+    check_identical(gary, surface)
+
+    monologue = next(group for group in gary.all_lines if any("sticker" in line for line in group))
+    line = max(monologue, key=len)
+    gary.lines = [line]
+    gary.showing = 1
+    gary.layout = None
+    print(f"{len(line)} characters: {line}")
+    for label, characters in (("half revealed", len(line)/2), ("fully revealed", len(line) + 1)):
+        gary.since_start_line = characters/c.CPS
+        print(label)
+        common.report("  per-character blits", common.time_it(lambda: old_draw_text(gary, surface), REPEATS))
+        common.report("  Gary.draw_line with a TextLayout", common.time_it(lambda: gary.draw_line(surface), REPEATS))
+        common.report("  all of Gary.draw", common.time_it(lambda: gary.draw(surface), REPEATS))
+
+    gary.layout = None
+    start = time.perf_counter()
+    gary.draw_line(surface)
+    common.report("Laying out the line, once per line", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+GameFrame.draw_hud: the old way, a blit per ammo digit and per heart every frame, against a Hud that keeps the ammo
+counter and hearts rendered until they change. Timed with the numbers unchanged (most frames), with infinite ammo
+(62 digits), and with the ammo changing every frame (firing flat out), then a few seconds of play with the Profiler
+counting Hud's cache hits.
+
+First checks that both draw the same pixels for a range of ammo and health.
+"""
+
+import common  # Before pygame, so the environment is set up first
+
+import pygame
+
+from image_manager import ImageManager
+from profiler import Profiler
+
+REPEATS = 5000
+
+
+def old_draw_hud(frame, surface):
+    """ GameFrame.draw_hud as it was. """
+    hud = frame.hud
+    surface.blit(hud.back, (0, 0))
+
+    ammo_str = str(frame.player.ammo)
+    if frame.player.infinite_ammo:
+        ammo_str = "99999999999999999999999999999999999999999999999999999999999999"
+    x = 40
+    y = 45
+    for char in ammo_str:
+        char_surf = hud.ammo_chars[char]
+        surface.blit(char_surf, (x, y))
+        x += char_surf.get_width()
+
+    x = 16
+    y = 78
+    for i in range(frame.player.health):
+        heart = ImageManager.load("assets/images/heart.png")
+        surface.blit(heart, (x, y))
+        x += heart.get_width() + 2
+
+
+def render(frame, draw, surface):
+    surface.fill((40, 60, 80))
+    draw(frame, surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def check_identical(frame, surface):
+    player = frame.player
+    checked = 0
+    for infinite in (False, True):
+        player.infinite_ammo = infinite
+        for ammo in (0, 7, 10, 48, 123, 9999):
+            for health in (0, 1, 3, 5):
+                player.ammo = ammo
+                player.health = health
+                assert render(frame, old_draw_hud, surface) == render(frame, type(frame).draw_hud, surface), \
+                    f"differs at ammo {ammo}, health {health}, infinite {infinite}"
+                checked += 1
+    player.infinite_ammo = False
+    print(f"Identical pixels in {checked} HUD states")
+
+
+def main():
+    frame = common.make_frame()
+    surface = common.screen
+    player = frame.player
+    check_identical(frame, surface)
+
+    player.health = 5
+    for label, infinite, changing in (("unchanged, 48 ammo", False, False),
+                                      ("unchanged, infinite ammo", True, False),
+                                      ("ammo changing every frame", False, True)):
+        player.infinite_ammo = infinite
+        player.ammo = 48
+
+        def old():
+            if changing:
+                player.ammo = 48 + (player.ammo + 1) % 10
+            old_draw_hud(frame, surface)
+
+        def new():
+            if changing:
+                player.ammo = 48 + (player.ammo + 1) % 10
+            frame.draw_hud(surface)
+
+        print(label)
+        common.report("  per-character blits", common.time_it(old, REPEATS))
+        common.report("  Hud", common.time_it(new, REPEATS))
+    player.infinite_ammo = False
+
+    # A few seconds of play: firing now and then, taking a hit once
+    Profiler.enabled = True
+    Profiler.counters = {}
+    player.ammo = 48
+    for tick in range(600):
+        if tick % 20 == 0:
+            player.ammo -= 1
+        if tick == 300:
+            player.health -= 1
+        frame.draw_hud(surface)
+    print("Hud cache hit rates over 600 frames of play")
+    for name, (hits, misses) in sorted(Profiler.counters.items()):
+        print(f"  {name:<46}{Profiler.hit_rate(name)*100:>11.1f}% ({hits} hits, {misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Memory and load time of the three music stems: decoded whole into pygame.mixer.Sound objects (the fallback), against
+MusicStems streaming them a chunk at a time. Each run is a fresh process, which loads the stems, starts them and then
+keeps them playing for a few seconds, as GameFrame does.
+"""
+
+import subprocess
+import sys
+import time
+
+import common  # Before pygame, so the environment is set up first
+
+RUNS = 3
+PLAY_SECONDS = 3
+
+
+def resident_bytes():
+    """ The process's resident set size, on Linux. """
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])*1024
+    raise RuntimeError("no VmRSS in /proc/self/status")
+
+
+def child():
+    """ Runs in the subprocess, and prints load seconds, resident bytes added and worst update seconds. """
+    import pygame
+
+    import constants as c
+    from music_stream import MusicStems
+
+    common.init()
+    pygame.mixer.set_num_channels(20)
+    before = resident_bytes()
+    start = time.perf_counter()
+    if sys.argv[2] == "stream":
+        stems = MusicStems(c.MUSIC_STEMS)
+        stems.play()
+        update = stems.update
+    else:
+        for sound in [pygame.mixer.Sound(path) for path in c.MUSIC_STEMS]:
+            sound.play(-1)
+        update = lambda: None
+    loaded = time.perf_counter() - start
+
+    peak = resident_bytes()
+    worst = 0
+    end = time.perf_counter() + PLAY_SECONDS
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        update()
+        worst = max(worst, time.perf_counter() - start)
+        peak = max(peak, resident_bytes())
+        time.sleep(0.01)
+    print(loaded, peak - before, worst)
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        child()
+        return
+    from music_stream import MusicStems
+
+    common.init()
+    if not MusicStems.available():
+        print("MusicStems can't stream here (no libvorbisfile, or the mixer isn't 16 bit)")
+        return
+    for label, mode in (("mixer.Sound, decoded whole", "sound"), ("MusicStems, streamed", "stream")):
+        runs = []
+        for i in range(RUNS):
+            output = subprocess.run([sys.executable, __file__, "--child", mode],
+                                    capture_output=True, text=True, check=True).stdout
+            runs.append([float(value) for value in output.split("\n")[-2].split()])
+        print(label)
+        common.report("  load and start", min(run[0] for run in runs))
+        print(f"  {'resident memory added (MB)':<46}{min(run[1] for run in runs)/2**20:>12.1f}")
+        common.report("  worst update while playing", min(run[2] for run in runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Soak test for the particle system: replays the particle spawns of a god-mode session (full auto sparks, dodge
+rolls and enemy landings) and reports live particles, pooled particles, memory and per-frame cost over time.
+
+Usage: python benchmarks/particle_soak_benchmark.py [minutes] [legacy_minutes]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import common
+from particle import ParticleManager, Poof, SparkParticle
+from primitives import Pose
+
+FPS = 60
+SPARK_PERIOD = 0.15  # Full auto fire rate
+ROLL_PERIOD = 1.0
+LANDING_PERIOD = 0.5
+
+
+class LegacyParticles(list):
+    """ The old behaviour: one flat list that destroyed particles are never removed from. """
+
+    def spawn(self, particle_class, *args, **kwargs):
+        self.append(particle_class(*args, **kwargs))
+
+    def update(self, dt, events):
+        for particle in self[:]:
+            particle.update(dt, events)
+
+
+def soak(particles, minutes, label):
+    dt = 1/FPS
+    since_spark = since_roll = since_landing = 0
+    frames_per_minute = 60*FPS
+    tracemalloc.start()
+    print(label)
+    print(f"  {'minute':>6} {'live':>8} {'recycled':>9} {'ms/frame':>10} {'traced KiB':>12}")
+    for minute in range(1, minutes + 1):
+        start = time.perf_counter()
+        for i in range(frames_per_minute):
+            since_spark += dt
+            since_roll += dt
+            since_landing += dt
+            if since_spark > SPARK_PERIOD:
+                since_spark = 0
+                particles.spawn(SparkParticle, (0, 0), Pose((2, 1)))
+            if since_roll > ROLL_PERIOD:
+                since_roll = 0
+                for j in range(12):
+                    particles.spawn(Poof, (0, 20))
+            if since_landing > LANDING_PERIOD:
+                since_landing = 0
+                for j in range(12):
+                    particles.spawn(Poof, (100, 20))
+            particles.update(dt, [])
+        elapsed = time.perf_counter() - start
+        recycled = 0
+        if isinstance(particles, ParticleManager):
+            recycled = particles.recycled/particles.spawned
+        memory = tracemalloc.get_traced_memory()[0]
+        print(f"  {minute:>6} {len(particles):>8} {recycled:>9.1%} {elapsed/frames_per_minute*1000:>10.4f} {memory/1024:>12.1f}")
+    tracemalloc.stop()
+
+
+def main():
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    legacy_minutes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    common.init()
+    soak(LegacyParticles(), legacy_minutes, "Legacy particle list")
+    soak(ParticleManager(), minutes, "ParticleManager")
+
+
+if __name__ == "__main__":
+    main()
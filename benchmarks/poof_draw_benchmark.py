@@ -0,0 +1,50 @@
+"""
+Draw cost of 300 concurrent poofs, scaling and rotating every frame versus reading from the prebuilt Poof table.
+"""
+
+import random
+
+import common  # Before pygame, so the environment is set up first
+import pygame
+
+import constants as c
+from particle import Poof
+
+POOFS = 300
+
+
+def draw_uncached(poofs, surface):
+    """ The old Poof.draw. """
+    for poof in poofs:
+        x, y = poof.position.x, poof.position.y
+        scale = 2 - 2*poof.through()
+        surf = pygame.transform.scale(poof.poof, (poof.poof.get_width()*scale, poof.poof.get_height()*scale))
+        surf = pygame.transform.rotate(surf, poof.angle)
+        x -= surf.get_width()//2
+        y -= surf.get_height()//2
+        surf.set_alpha(256)
+        surface.blit(surf, (x, y))
+
+
+def draw_cached(poofs, surface):
+    for poof in poofs:
+        poof.draw(surface, (0, 0))
+
+
+def main():
+    screen = common.init()
+    poofs = []
+    for i in range(POOFS):
+        poof = Poof((random.random()*c.WINDOW_WIDTH, random.random()*c.WINDOW_HEIGHT))
+        poof.age = random.random()*poof.duration
+        poofs.append(poof)
+
+    repeats = 50
+    print(f"Drawing {POOFS} poofs")
+    common.report("  scale + rotate + set_alpha per poof", common.time_it(lambda: draw_uncached(poofs, screen), repeats))
+    common.report("  building the Poof table (once per process)", common.time_it(lambda: Poof.build_table(poofs[0].poof)))
+    common.report("  Poof table", common.time_it(lambda: draw_cached(poofs, screen), repeats))
+
+
+if __name__ == "__main__":
+    main()
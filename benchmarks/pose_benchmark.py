@@ -0,0 +1,98 @@
+"""
+Pose operators against their in-place counterparts, then a whole Enemy.update loop. Allocations are measured with
+tracemalloc (peak bytes above the starting point) along with a count of Poses made.
+"""
+
+import tracemalloc
+
+import common  # Before pygame, so the environment is set up first
+
+from primitives import Pose
+
+REPEATS = 100000
+ENEMIES = 200
+TICKS = 50
+
+
+def count_poses(func):
+    """ Returns how many Poses func() makes. """
+    made = [0]
+    original = Pose.__init__
+
+    def counting_init(self, *args, **kwargs):
+        made[0] += 1
+        original(self, *args, **kwargs)
+
+    Pose.__init__ = counting_init
+    try:
+        func()
+    finally:
+        Pose.__init__ = original
+    return made[0]
+
+
+def peak_bytes(func):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+
+def operator_ops(a, b, out):
+    for i in range(REPEATS):
+        a = a + b*0.01
+        d = a - b
+        d.rotate_position(3)
+        d.magnitude()
+
+
+def inplace_ops(a, b, out):
+    for i in range(REPEATS):
+        a.iadd_scaled(b, 0.01)
+        a.sub_into(b, out)
+        out.rotate_inplace(3)
+        out.magnitude_sq()
+
+
+def pose_ops():
+    print(f"{REPEATS} rounds of add-scaled, subtract, rotate and length")
+    for label, ops in (("operators", operator_ops), ("in place", inplace_ops)):
+        run = lambda: ops(Pose((1, 2)), Pose((3, 4)), Pose((0, 0)))
+        seconds = common.time_it(run)
+        made = count_poses(run)
+        common.report(f"  {label}", seconds)
+        print(f"    Poses made: {made}, peak traced memory: {peak_bytes(run)} B")
+
+
+def enemy_updates():
+    frame = common.make_frame()
+    frame.player.god_mode()
+    for i in range(ENEMIES):
+        frame.spawn_goomba()
+    frame.particles.clear()
+    frame.enemy_grid.rebuild(frame.enemies)
+
+    def run():
+        for tick in range(TICKS):
+            for enemy in frame.enemies:
+                enemy.update(0.01, [])
+
+    seconds = common.time_it(run)
+    made = count_poses(run)
+    print(f"Enemy.update for {ENEMIES} enemies, {TICKS} ticks")
+    common.report("  per tick", seconds/TICKS)
+    print(f"    Poses made per enemy per tick: {made/ENEMIES/TICKS:.2f}, "
+          f"peak traced memory: {peak_bytes(run)} B")
+
+
+def main():
+    common.init()
+    pose_ops()
+    enemy_updates()
+
+
+if __name__ == "__main__":
+    main()
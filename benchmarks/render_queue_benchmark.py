@@ -0,0 +1,83 @@
+"""
+Drawing 200 agents and 500 particles: one blit call per draw, in a list sorted by depth every frame (the way
+GameFrame.draw used to), against pushing them to a RenderQueue and flushing it with Surface.blits per layer.
+"""
+
+import math
+import random
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from camera import Camera
+from enemy import Enemy
+from particle import Poof, SparkParticle
+from primitives import Pose
+
+AGENTS = 200
+PARTICLES = 500
+REPEATS = 50
+
+
+def populate(frame):
+    generator = random.Random(0)
+    centre = frame.player.position
+    for i in range(AGENTS - 1):
+        position = (centre.x + generator.uniform(-380, 380), centre.y + generator.uniform(-280, 280))
+        frame.enemies.append(Enemy(frame, position))
+    frame.enemies.sort(key=lambda enemy: enemy.position.y)
+    frame.particles.clear()
+    for i in range(PARTICLES):
+        position = (centre.x + generator.uniform(-400, 400), centre.y + generator.uniform(-300, 300))
+        if i % 5:
+            frame.particles.spawn(Poof, position)
+        else:
+            frame.particles.spawn(SparkParticle, position, Pose((generator.uniform(-1, 1), 1)))
+    for agent in frame.enemies:
+        agent.sprite.update(0.01, [])
+
+
+def draw_direct(frame, surface, offset):
+    agents = [frame.player] + frame.enemies + [frame.phone]
+    agents.sort(key=lambda agent: agent.position.y)
+    frame.particles.draw(surface, offset, c.BACKGROUND)
+    for agent in agents:
+        agent.draw_shadow(surface, offset)
+    for agent in agents:
+        agent.draw(surface, offset)
+    frame.particles.draw(surface, offset, c.FOREGROUND)
+
+
+def queue_frame(frame, size, offset):
+    queue = frame.render_queue
+    queue.extend("particles_back", frame.particles.blits(offset, size, c.BACKGROUND))
+    queue.extend("particles_front", frame.particles.blits(offset, size, c.FOREGROUND))
+    for agent in [frame.player] + frame.enemies + [frame.phone]:
+        depth = agent.position.y
+        if agent is frame.player and frame.player.rolling:
+            depth = math.inf
+        agent.draw_shadow(queue.at("shadows", depth), offset)
+        agent.draw(queue.at("agents", depth), offset)
+
+
+def draw_queued(frame, surface, offset):
+    queue_frame(frame, surface.get_size(), offset)
+    frame.render_queue.flush(surface)
+
+
+def main():
+    surface = common.init()
+    frame = common.make_frame()
+    populate(frame)
+    Camera.snap_to_target()
+    offset = Camera.get_draw_offset().get_position()
+
+    queue_frame(frame, surface.get_size(), offset)
+    print(f"{AGENTS} agents and {PARTICLES} particles ({len(frame.render_queue)} blits), per frame")
+    frame.render_queue.flush(surface)
+    common.report("  blit per draw call", common.time_it(lambda: draw_direct(frame, surface, offset), REPEATS))
+    common.report("  RenderQueue", common.time_it(lambda: draw_queued(frame, surface, offset), REPEATS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Frame cost at several window sizes: drawing the game at the window's resolution, against drawing it at the fixed
+render target size and letting Display scale it up (by whole numbers, and smoothly).
+"""
+
+import common  # Before pygame, so the environment is set up first
+import pygame
+
+import constants as c
+from camera import Camera
+from display import Display
+
+OUTPUT_SIZES = ((800, 600), (1600, 1200), (1920, 1080), (2560, 1440), (3840, 2160))
+FRAMES = 30
+ZOMBIES = 30
+
+
+def make_busy_frame():
+    frame = common.make_frame()
+    frame.player.god_mode()
+    frame.spawn_intensity = 3
+    for i in range(ZOMBIES):
+        frame.spawn_goomba()
+    for i in range(50):
+        frame.update(0.01, [])
+        if i % 5 == 0:
+            frame.player.fire()
+    return frame
+
+
+def native(frame, size):
+    """ Draws straight to a window-sized surface, the way the game did before Display. """
+    surface = pygame.Surface(size).convert()
+    Camera.view_size = size
+    Camera.snap_to_target()
+
+    def draw():
+        frame.draw(surface)
+    return common.time_it(draw, FRAMES)
+
+
+def scaled(frame, size, smooth):
+    """ Returns the time to draw to the render target, and the time to scale it onto the window. """
+    Display.init(smooth=smooth)
+    Display.set_window(pygame.display.set_mode(size))
+    Camera.snap_to_target()
+
+    def draw():
+        frame.draw(Display.render_surface)
+    return common.time_it(draw, FRAMES), common.time_it(Display.present, FRAMES)
+
+
+def main():
+    common.init()
+    frame = make_busy_frame()
+    print(f"Per frame, {c.WINDOW_WIDTH}x{c.WINDOW_HEIGHT} render target")
+    for size in OUTPUT_SIZES:
+        print(f"{size[0]}x{size[1]} window")
+        common.report("  drawn at window size", native(frame, size))
+        for label, smooth in (("whole number scale", False), ("smooth scale", True)):
+            draw, present = scaled(frame, size, smooth)
+            common.report(f"  render target, {label}", draw + present)
+            common.report("    of which drawing", draw)
+
+
+if __name__ == "__main__":
+    main()
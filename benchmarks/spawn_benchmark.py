@@ -0,0 +1,37 @@
+"""
+Cost of a spawn burst (the ten zombies spawned at once at spawn intensity 3), with and without the shared
+Animation cache.
+"""
+
+import common
+from pyracy.sprite_tools import Animation
+
+BURST = 10
+
+
+def burst(frame):
+    frame.spawn_intensity = 3
+    for i in range(BURST):
+        frame.spawn_goomba()
+
+
+def main():
+    frame = common.make_frame()
+    repeats = 20
+
+    Animation.use_cache = False
+    Animation.clear_cache()
+    uncached = common.time_it(lambda: burst(frame), repeats)
+
+    Animation.use_cache = True
+    burst(frame)  # Warm the cache, like the first spawn of a session does
+    cached = common.time_it(lambda: burst(frame), repeats)
+
+    print(f"Spawning {BURST} zombies")
+    common.report("  without animation cache", uncached)
+    common.report("  with animation cache", cached)
+    common.report("  per zombie, with animation cache", cached/BURST, "us")
+
+
+if __name__ == "__main__":
+    main()
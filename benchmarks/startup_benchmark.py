@@ -0,0 +1,86 @@
+"""
+Time from launch to the first frame on screen and to a playable GameFrame: building the GameFrame straight away,
+the way the game used to, against showing a LoadingFrame while Preloader decodes assets on a thread pool. Each run is
+a fresh process, so nothing is already decoded or cached. Prints the per-asset table from the last preloaded run too.
+"""
+
+import subprocess
+import sys
+import time
+
+STARTED = time.perf_counter()  # Before importing pygame, so the times include it
+
+import common  # Before pygame, so the environment is set up first
+
+RUNS = 5
+MILESTONES = ("first frame", "GameFrame ready")
+
+
+def child():
+    """ Runs in the subprocess, and prints the time of each milestone on one line, then the asset table. """
+    import pygame
+
+    import constants as c
+    import frame as f
+    from display import Display
+    from preloader import Preloader
+
+    Preloader.begin(STARTED)
+    common.init()
+    if sys.argv[2] == "serial":
+        game_frame = f.GameFrame(None)
+        game_frame.draw(Display.render_surface)
+        Display.present()
+        ready = Preloader.now()
+        print(ready, ready)
+        return
+
+    clock = pygame.time.Clock()
+    loading_frame = f.LoadingFrame(None)
+    first_frame = None
+    while not loading_frame.done:
+        loading_frame.update(clock.tick(c.FRAMERATE)/1000, [])
+        loading_frame.draw(Display.render_surface)
+        Display.present()
+        if first_frame is None:
+            first_frame = Preloader.now()
+            Preloader.mark("first frame")
+    loading_frame.next_frame()
+    print(first_frame, Preloader.now())
+    while not Preloader.poll():
+        time.sleep(0.001)
+    while Preloader.pending:
+        Preloader.poll()
+        time.sleep(0.001)
+    print(Preloader.report())
+
+
+def best_of(mode):
+    best = None
+    for i in range(RUNS):
+        output = subprocess.run([sys.executable, __file__, "--child", mode],
+                                capture_output=True, text=True, check=True).stdout
+        lines = output.split("\n")
+        start = next(i for i, line in enumerate(lines) if line[:1].isdigit())
+        times = [float(value) for value in lines[start].split()]
+        best = times if best is None else [min(pair) for pair in zip(best, times)]
+    return best, "\n".join(lines[start + 1:]).strip()
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        child()
+        return
+    results = {}
+    for label, mode in (("GameFrame straight away", "serial"), ("LoadingFrame and Preloader", "preloaded")):
+        results[label], table = best_of(mode)
+    for i, milestone in enumerate(MILESTONES):
+        print(milestone)
+        for label, times in results.items():
+            common.report(f"  {label}", times[i])
+    print()
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Core scaling of an AgentWorld's steering and separation, run inline and split over 1, 2, 4 and 8 workers, for
+hordes of a few thousand. Times Steering.run on its own and the whole enemy step, and checks every worker count
+leaves the enemies in exactly the same state.
+"""
+
+import hashlib
+import os
+
+import common  # Before pygame, so the environment is set up first
+
+import constants as c
+from ecs import AgentWorld
+from random_streams import RandomStreams
+
+DT = 0.01
+WARMUP = 20
+TICKS = 30
+COUNTS = (2000, 5000)
+WORKERS = (0, 1, 2, 4, 8)
+
+
+def make_frame(count, workers):
+    c.ENTITY_AGENTS = True
+    c.AI_WORKERS = workers
+    RandomStreams.seed(0)
+    frame = common.make_frame()
+    frame.player.god_mode()
+    for i in range(count):
+        frame.spawn_goomba()
+    frame.particles.clear()  # Each one lands with a puff of poofs
+    for i in range(WARMUP):  # Long enough to start the workers, and for the horde to bunch up
+        frame.update(DT, [])
+    return frame
+
+
+def digest(frame):
+    state = [(enemy.position.x, enemy.position.y, enemy.velocity.x, enemy.velocity.y) for enemy in frame.enemies]
+    return hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+
+
+def main():
+    common.init()
+    if not AgentWorld.available():
+        print("numpy isn't installed, so there's no AgentWorld to run")
+        return
+    print(f"{os.cpu_count()} CPUs; min of {TICKS} ticks, in ms")
+    print(f"{'enemies':>8}{'workers':>9}{'Steering.run':>14}{'enemy step':>12}{'speedup':>9}  state")
+    for count in COUNTS:
+        inline = None
+        digests = set()
+        for workers in WORKERS:
+            frame = make_frame(count, workers)
+            steering = frame.agent_world.steering
+            living = frame.agent_world.query("transform", "motion", "body", "wander", exclude=("dead",))
+            alive = sum(archetype.count for archetype in living)
+            reach = 2*steering.arrays["radius"][:alive].max() + 5
+            run = min(common.time_it(lambda: steering.run(alive, reach, 0)) for i in range(TICKS))
+            step = min(common.time_it(lambda: frame.update_world_agents(DT, [])) for i in range(TICKS))
+            inline = inline or step
+            state = digest(frame)
+            digests.add(state)
+            print(f"{count:>8}{workers or 'inline':>9}{run*1000:>14.3f}{step*1000:>12.3f}{inline/step:>8.2f}x  {state}")
+        assert len(digests) == 1, "worker count changed the result"
+
+
+if __name__ == "__main__":
+    main()
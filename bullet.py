@@ -1,11 +1,12 @@
 import math
-import random
-
-import pygame
 
 from image_manager import ImageManager
 from primitives import Pose
+from rotation_cache import RotationCache
 import constants as c
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("bullets")
 
 
 class Bullet:
@@ -40,18 +41,30 @@ class Bullet:
         unit = self.velocity * (1/(self.velocity.magnitude() + 0.00001))
         side_unit = unit.copy()
         side_unit.rotate_position(90)
-        for enemy in self.frame.enemies:
+        # Only enemies inside the search cone can be picked, so just look at the cells under its bounding box
+        reach = 1201
+        tip = self.position + unit*reach
+        corners = (self.position, tip + side_unit*reach, tip - side_unit*reach)
+        candidates = self.frame.enemy_grid.query_rect(
+            min(corner.x for corner in corners),
+            min(corner.y for corner in corners),
+            max(corner.x for corner in corners),
+            max(corner.y for corner in corners),
+        )
+        diff = Pose((0, 0))
+        for enemy in candidates:
             if enemy.dead:
                 continue
-            dirness = (enemy.position - self.position).dot(unit)
+            enemy.position.sub_into(self.position, diff)
+            dirness = diff.dot(unit)
             if dirness < 0:
                 continue
             if dirness > 1200:
                 continue
-            sideness = abs((enemy.position - self.position).dot(side_unit))
+            sideness = abs(diff.dot(side_unit))
             if sideness > dirness:
                 continue
-            score = dirness / sideness / (enemy.position - self.position).magnitude()
+            score = dirness / sideness / diff.magnitude()
             if score > best_target_score:
                 best_target = enemy
                 best_target_score = score
@@ -62,12 +75,12 @@ class Bullet:
 
 
 
-        self.position += self.velocity*dt
+        self.position.iadd_scaled(self.velocity, dt)
         if self.position.x < -c.ARENA_WIDTH or self.position.y < -c.ARENA_HEIGHT or self.position.x > c.ARENA_WIDTH or self.position.y > c.ARENA_HEIGHT:
             self.destroy()
             if len(self.enemies_hit)==0 and "Green" in self.frame.player.upgrades:
                 if self.refundable:
-                    if random.random() < 0.5:
+                    if rng.random() < 0.5:
                         self.frame.player.ammo += 1
 
         if self.homing:
@@ -106,9 +119,11 @@ class Bullet:
             self.update_target()
 
     def draw(self, surface, offset=(0, 0)):
-        position = self.position + Pose(offset)
-
-        surf = pygame.transform.rotate(Bullet.sprite, self.velocity.get_angle_of_position()*180/math.pi)
-
-        position += Pose((-surf.get_width()//2, -surf.get_height()//2))
-        surface.blit(surf, position.get_position())
\ No newline at end of file
+        surface.blit(*self.blit_args(offset))
+
+    def blit_args(self, offset):
+        """ Returns the (surface, position) to blit for this bullet. """
+        surf = RotationCache.rotate(Bullet.sprite, self.velocity.get_angle_of_position()*180/math.pi)
+        x = self.position.x + offset[0] - surf.get_width()//2
+        y = self.position.y + offset[1] - surf.get_height()//2
+        return surf, (x, y)
@@ -0,0 +1,179 @@
+try:
+    import numpy
+except ImportError:  # The system is optional; GameFrame falls back to plain Bullet objects without it
+    numpy = None
+
+from bullet import Bullet, rng
+from enemy_store import ColumnStore, PoseColumn, ScalarColumn
+
+import constants as c
+
+
+class BulletSystem(ColumnStore):
+    """
+    Bullet state as columns, so movement, leaving the arena, Green refunds and seeking steering run as a handful of
+    vector ops per tick instead of a few Pose allocations per bullet.
+
+    Each bullet keeps its own object, so hit bookkeeping (enemies_hit, pierce, target) works as it does for plain
+    bullets. Seeking bullets that need a new target queue up, and all pick one at once at the start of the next tick.
+    GameFrame calls update() and then collide() in place of its own bullet loop and collide_bullets().
+    """
+
+    pose_columns = ("position", "velocity")
+    scalar_columns = {"radius": "float32", "destroyed": "bool", "homing": "bool", "refundable": "bool"}
+    steer_speed = 500  # Degrees per second, as in Bullet.update
+    search_range = 1200  # As in Bullet.update_target
+    batch_size = 2**20  # Most bullet/enemy pairs scored at once when picking targets
+
+    def __init__(self, capacity=64):
+        super().__init__(capacity)
+        self.start = self.position[:0].copy()  # Where each bullet was at the start of the tick, for collide()
+        self.seeking = {}  # Bullets waiting for a new target, in the order they asked (a dict as an ordered set)
+
+    def update(self, dt, frame):
+        """
+        Bullet.update for every row. Bullets destroyed last tick are dropped first; ones that leave the arena this
+        tick stay until the next, so collide() can still see where every bullet started.
+        """
+        for row in numpy.flatnonzero(self.destroyed[:self.count])[::-1]:
+            self.remove(self.items[row])
+        self.pick_targets(frame)
+        n = self.count
+        position = self.position[:n]
+        self.start = position.copy()
+        position += self.velocity[:n] * dt
+
+        x, y = position[:, 0], position[:, 1]
+        leaving = (x < -c.ARENA_WIDTH) | (y < -c.ARENA_HEIGHT) | (x > c.ARENA_WIDTH) | (y > c.ARENA_HEIGHT)
+        self.destroyed[:n] |= leaving
+        if "Green" in frame.player.upgrades:
+            for row in numpy.flatnonzero(leaving & self.refundable[:n]):
+                if not self.items[row].enemies_hit and rng.random() < 0.5:
+                    frame.player.ammo += 1
+
+        self.steer(dt)
+
+    def steer(self, dt):
+        """ Turns every seeking bullet with a live target towards it, as Bullet.update does one at a time. """
+        items = self.items
+        live = {}  # Maps each target to its position, or None if it's dead
+        rows = []
+        points = []
+        for row in numpy.flatnonzero(self.homing[:self.count]).tolist():
+            target = items[row].target
+            if target is None:
+                continue
+            if target not in live:
+                live[target] = None if target.dead else target.position.get_position()
+            point = live[target]
+            if point is not None:
+                rows.append(row)
+                points.append(point)
+        if not rows:
+            return
+        velocity = self.velocity[rows]
+        unit = velocity / (numpy.hypot(velocity[:, 0], velocity[:, 1]) + 0.00001)[:, None]
+        diff = numpy.array(points, dtype=velocity.dtype) - self.position[rows]
+        dirness = diff[:, 0]*unit[:, 0] + diff[:, 1]*unit[:, 1]
+        sideness = diff[:, 0]*unit[:, 1] - diff[:, 1]*unit[:, 0]  # Along unit turned 90 degrees
+        radians = numpy.where(sideness > 0, 1, -1) * (self.steer_speed*dt*numpy.pi/180)
+        radians[dirness < 0] = 0
+        cos = numpy.cos(radians)
+        sin = numpy.sin(radians)
+        self.velocity[rows] = numpy.stack((velocity[:, 0]*cos + velocity[:, 1]*sin,
+                                           -velocity[:, 0]*sin + velocity[:, 1]*cos), axis=1)
+
+    def collide(self, frame):
+        """
+        GameFrame.collide_bullets for every row, with the sweep for every bullet and enemy pair done at once. Only
+        the hits go back through Python, in the order each bullet reached them, so pierce works the same.
+        """
+        n = self.count
+        enemies = [agent for agent in frame.depth_order if not agent.is_player and not agent.dead]
+        if not n or not enemies:
+            return
+        centres = numpy.array([enemy.position.get_position() for enemy in enemies])
+        radii = numpy.array([enemy.radius for enemy in enemies], dtype=float)
+        start = self.start.astype(float)
+        moved = self.position[:n] - start
+        flying = ~self.destroyed[:n]
+        items = self.items
+        size = max(1, self.batch_size // len(enemies))
+        for first in range(0, n, size):
+            last = min(n, first + size)
+            offset = start[first:last, None, :] - centres[None, :, :]
+            move = moved[first:last, None, :]
+            reach = radii[None, :] + self.radius[first:last, None]
+            outside = (offset**2).sum(axis=2) - reach**2
+            length_sq = (move**2).sum(axis=2)
+            closing = (offset*move).sum(axis=2)
+            discriminant = closing**2 - length_sq*outside
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                t = (-closing - numpy.sqrt(discriminant))/length_sq
+            hit = (outside < 0) | ((length_sq > 0) & (closing < 0) & (discriminant >= 0) & (t <= 1))
+            hit &= flying[first:last, None]
+            t[outside < 0] = 0
+            bullet_rows, enemy_indices = numpy.nonzero(hit)
+            if not len(bullet_rows):
+                continue
+            times = t[bullet_rows, enemy_indices]
+            order = numpy.lexsort((enemy_indices, times, bullet_rows))  # By bullet, then along its path
+            for row, index in zip((bullet_rows[order] + first).tolist(), enemy_indices[order].tolist()):
+                bullet = items[row]
+                enemy = enemies[index]
+                if bullet.can_hit(enemy):
+                    enemy.get_hurt(bullet)
+
+    def pick_targets(self, frame):
+        """
+        Bullet.update_target for every bullet that asked since last tick. Scores each of them against every live
+        enemy in one go, rather than a grid query and a Python loop per bullet.
+        """
+        bullets = [bullet for bullet in self.seeking if bullet.row is not None and not bullet.destroyed]
+        self.seeking.clear()
+        if not bullets:
+            return
+        enemies = [agent for agent in frame.depth_order if not agent.is_player and not agent.dead]
+        if not enemies:
+            return
+        enemy_positions = numpy.array([enemy.position.get_position() for enemy in enemies])
+        size = max(1, self.batch_size // len(enemies))
+        for first in range(0, len(bullets), size):
+            batch = bullets[first:first + size]
+            rows = [bullet.row for bullet in batch]
+            velocity = self.velocity[rows].astype(float)
+            unit = velocity / (numpy.hypot(velocity[:, 0], velocity[:, 1]) + 0.00001)[:, None]
+            diff = enemy_positions[None, :, :] - self.position[rows].astype(float)[:, None, :]
+            dirness = diff[:, :, 0]*unit[:, None, 0] + diff[:, :, 1]*unit[:, None, 1]
+            sideness = numpy.abs(diff[:, :, 0]*unit[:, None, 1] - diff[:, :, 1]*unit[:, None, 0])
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                score = dirness / sideness / numpy.hypot(diff[:, :, 0], diff[:, :, 1])
+            in_cone = (dirness >= 0) & (dirness <= self.search_range) & (sideness <= dirness) & ~numpy.isnan(score)
+            score[~in_cone] = -numpy.inf
+            best = score.argmax(axis=1)  # First of any ties, in depth order, like the grid query
+            any_in_cone = in_cone[numpy.arange(len(batch)), best]
+            for bullet, index, found in zip(batch, best.tolist(), any_in_cone.tolist()):
+                if found:
+                    bullet.target = enemies[index]
+
+
+class StoredBullet(Bullet):
+    """ A Bullet whose movement lives in a row of its frame's BulletSystem. """
+
+    row = None
+    store = None
+
+    position = PoseColumn("position")
+    velocity = PoseColumn("velocity")
+    radius = ScalarColumn("radius")
+    destroyed = ScalarColumn("destroyed")
+    homing = ScalarColumn("homing")
+    refundable = ScalarColumn("refundable")
+
+    def __init__(self, position, direction, frame=None, **kwargs):
+        frame.bullet_system.add(self)
+        super().__init__(position, direction, frame=frame, **kwargs)
+
+    def update_target(self):
+        if self.row is not None:
+            self.store.seeking[self] = None
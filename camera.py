@@ -5,6 +5,7 @@ import math
 class Camera:
     position = None
     target = None
+    view_size = c.WINDOW_SIZE  # Size of the surface being drawn to, so the target ends up in the middle of it
     shake_amt = 0
     shake_direction = (1, 1)
     since_shake = 0
@@ -20,9 +21,10 @@ class Camera:
 
     @classmethod
     def update(cls, dt, events):
-        d = cls.target - cls.position - Pose(c.WINDOW_SIZE) * 0.5
-        speed = d*dt*4
-        cls.position += speed
+        d = cls.target - cls.position
+        d.x -= cls.view_size[0]*0.5
+        d.y -= cls.view_size[1]*0.5
+        cls.position.iadd_scaled(d.imul(dt), 4)
 
         cls.since_shake += dt
         cls.shake_amt *= 0.08**dt
@@ -32,8 +34,10 @@ class Camera:
 
     @classmethod
     def snap_to_target(cls):
-        d = cls.target - cls.position - Pose(c.WINDOW_SIZE) * 0.5
-        cls.position += d
+        d = cls.target - cls.position
+        d.x -= cls.view_size[0]*0.5
+        d.y -= cls.view_size[1]*0.5
+        cls.position.iadd_scaled(d)
 
 
     @classmethod
@@ -48,16 +52,13 @@ class Camera:
     def get_draw_offset(cls):
         off = cls.world_to_screen((0, 0))
         shake_amt = math.cos(cls.since_shake*35)*cls.shake_amt
-        shake_pos = Pose(cls.shake_direction)*shake_amt
-        off += shake_pos
-        return off
+        return off.iadd_scaled(Pose(cls.shake_direction), shake_amt)
 
     @classmethod
     def shake(cls, amt=10, direction=None):
         if direction==None:
             direction = (1, 1)
-        direction = Pose(direction)
-        direction.scale_to(1)
+        direction = Pose(direction).normalize_inplace()
         cls.shake_direction = direction.get_position()
         if amt > cls.shake_amt:
             cls.shake_amt = amt
@@ -6,11 +6,21 @@ DEBUG = False
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 
-WINDOW_SIZE = WINDOW_WIDTH, WINDOW_HEIGHT
+WINDOW_SIZE = WINDOW_WIDTH, WINDOW_HEIGHT  # Size of the render target; the window can be bigger, see Display
+DISPLAY_SCALE = 1  # Window size, as a multiple of WINDOW_SIZE
+SMOOTH_UPSCALE = False  # Scale smoothly to fill the window, rather than by the largest whole number that fits
+ASSET_CACHE_PATH = "assets/atlas.cache"  # Made by asset_cache.py; used at startup if it's there
+MUSIC_STEMS = ("assets/sound/please_hold.ogg", "assets/sound/please_hold_full.ogg", "assets/sound/groove.ogg")
+STREAM_MUSIC = True  # Decode the music stems a chunk at a time as they play, if libvorbisfile can be found
 
 CAPTION = "Holding Out"
 FRAMERATE = 100
 
+FIXED_TIMESTEP = True
+SIMULATION_RATE = 100  # Fixed simulation steps per second
+MAX_STEPS_PER_FRAME = 5
+MAX_SKIPPED_RENDERS = 2
+
 WALKING = 0
 IDLE = 1
 ROLLING = 2
@@ -25,6 +35,12 @@ ARENA_WIDTH = 1400
 ARENA_HEIGHT = 1000
 ARENA_SIZE = 4000
 
+COLLISION_CELL_SIZE = 50
+VECTORIZED_ENEMIES = False  # Keep enemy kinematics in a NumPy EnemyStore, if numpy is installed
+VECTORIZED_BULLETS = False  # Move bullets with a NumPy BulletSystem, if numpy is installed
+ENTITY_AGENTS = False  # Run enemies as entities in a NumPy AgentWorld, if numpy is installed (instead of EnemyStore)
+AI_WORKERS = 0  # Processes (threads on free-threaded Python) to split an AgentWorld's steering over; 0 runs it inline
+
 BACKGROUND = 0
 FOREGROUND = 1
 
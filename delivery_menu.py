@@ -1,11 +1,12 @@
-import random
-
 import pygame
 import constants as c
 from camera import Camera
 from image_manager import ImageManager
 
 from Button import Button
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("delivery")
 
 
 class DeliveryMenu:
@@ -27,7 +28,6 @@ class DeliveryMenu:
 
         self.header = self.big_font.render("DELIVERY", 0, (255, 255, 255))
         self.subheader = self.medium_font.render("Choose two", 0, (255, 255, 255))
-        self.art = ImageManager.load("assets/images/delivery_art.png")
 
 
 
@@ -35,9 +35,9 @@ class DeliveryMenu:
         self.bullet_image = bullet#pygame.transform.scale(bullet, (bullet.get_width()*2, bullet.get_height()*2))
         heart = ImageManager.load("assets/images/heart_icon.png")
         self.heart_image = heart#pygame.transform.scale(heart, (heart.get_width()*2, heart.get_height()*2))
-        self.upgrade_image = ImageManager.load("assets/images/upgrade_icon.png")
         #self.upgrade_image = pygame.transform.scale(upgrade, (upgrade.get_width()*2, upgrade.get_height()*2))
 
+        self.made_buttons = {}  # Maps each upgrade type to its button, made the first time it's offered
         self.starting_buttons = [self.make_delivery_button("Health"), self.make_delivery_button("Ammo")]
         self.upgrade_types = list(c.UPGRADES)
         self.buttons = []
@@ -53,7 +53,7 @@ class DeliveryMenu:
                 for item in used:
                     if item in valid:
                         valid.remove(item)
-                utype = random.choice(valid)
+                utype = rng.choice(valid)
                 self.buttons.append(self.make_delivery_button(utype))
                 used.append(utype)
         self.upgrade_quota = 2
@@ -82,6 +82,15 @@ class DeliveryMenu:
         return self.lowered > 0
 
     def make_delivery_button(self, upgrade):
+        """ Returns the button for upgrade, as new. Each is only drawn once, then reused when offered again. """
+        button = self.made_buttons.get(upgrade)
+        if button is None:
+            button = self.made_buttons[upgrade] = self.build_delivery_button(upgrade)
+        else:
+            button.reset()
+        return button
+
+    def build_delivery_button(self, upgrade):
         if upgrade == "Health":
             header = "Health"
             description = "Fully replenish health"
@@ -94,7 +103,7 @@ class DeliveryMenu:
             header = "Upgrade"
             index = c.UPGRADES.index(upgrade)
             description = f"{upgrade.upper()}: {c.UPGRADE_DESCRIPTIONS[index]}"
-            icon = self.upgrade_image
+            icon = ImageManager.load("assets/images/upgrade_icon.png")
         surf = pygame.Surface((200, 90)).convert_alpha()
         surf.fill((0, 0, 0, 0))
         color = surf.copy()
@@ -168,7 +177,7 @@ class DeliveryMenu:
         surface.blit(self.background, (50, 50+yoff))
         surface.blit(self.header, (c.WINDOW_WIDTH//2 - self.header.get_width()//2, 100 + yoff))
         surface.blit(self.subheader, (c.WINDOW_WIDTH//2 - self.subheader.get_width()//2, 166+yoff))
-        surface.blit(self.art, (100, 235+yoff))
+        surface.blit(ImageManager.load("assets/images/delivery_art.png"), (100, 235+yoff))
 
         self.draw_buttons(surface, (0, yoff))
 
@@ -0,0 +1,64 @@
+from bisect import bisect_left, bisect_right
+
+
+def depth(item):
+    return item.position.y
+
+
+class DepthOrder:
+    """
+    Keeps objects sorted by position.y from one tick to the next, for update order, draw order and queries over a
+    band of y values.
+
+    The list is kept from one tick to the next, and things only move a little each tick, so repair() hands the sort
+    nearly sorted input, which Python's sort gets through in close to one pass. Inserting finds its place with a
+    binary search, and discarded objects are dropped during the next repair.
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.keys = []  # Each object's y as of the last repair (or insert), in the same order as items
+        self.removed = set()
+        for item in items:
+            self.insert(item)
+
+    def insert(self, item):
+        y = item.position.y
+        index = bisect_right(self.keys, y)
+        self.items.insert(index, item)
+        self.keys.insert(index, y)
+
+    def discard(self, item):
+        """ Removes an object. It's skipped straight away, and dropped from the list at the next repair. """
+        self.removed.add(item)
+
+    def repair(self):
+        """ Puts everything back in order of position.y. Objects with equal y keep their previous order. """
+        items = self.items
+        if self.removed:
+            removed = self.removed
+            items[:] = [item for item in items if item not in removed]
+            removed.clear()
+        items.sort(key=depth)
+        self.keys = [item.position.y for item in items]
+
+    def between(self, min_y, max_y):
+        """
+        Returns the objects whose y was between min_y and max_y at the last repair, in order. Anything that has
+        moved since may be slightly out, so callers should still do their own exact test.
+        """
+        found = self.items[bisect_left(self.keys, min_y):bisect_right(self.keys, max_y)]
+        if self.removed:
+            found = [item for item in found if item not in self.removed]
+        return found
+
+    def __iter__(self):
+        if self.removed:
+            return (item for item in self.items if item not in self.removed)
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items) - len(self.removed)
+
+    def __contains__(self, item):
+        return item not in self.removed and item in self.items
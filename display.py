@@ -0,0 +1,89 @@
+import pygame
+
+import constants as c
+from camera import Camera
+
+
+class Display:
+    """
+    Owns the window and the render target the game draws to. The render target stays the same size whatever the
+    window is, so drawing costs the same at any output resolution; present() scales it up to fit the window, by
+    the largest whole number that fits or smoothly, letterboxing whatever is left over.
+    """
+
+    window = None
+    render_surface = None  # What frames draw to. The window itself, when no scaling is needed.
+    offscreen = None  # The render target when it isn't the window
+    render_size = c.WINDOW_SIZE
+    windowed_size = c.WINDOW_SIZE
+    smooth = False
+    fullscreen = False
+    target_rect = None  # Where on the window the render target ends up
+    target = None  # Subsurface of the window at target_rect
+
+    @staticmethod
+    def init(render_size=c.WINDOW_SIZE, scale=c.DISPLAY_SCALE, smooth=c.SMOOTH_UPSCALE):
+        Display.render_size = tuple(render_size)
+        Display.windowed_size = (round(render_size[0]*scale), round(render_size[1]*scale))
+        Display.smooth = smooth
+        Display.fullscreen = False
+        Camera.view_size = Display.render_size
+        Display.set_window(pygame.display.set_mode(Display.windowed_size))
+
+    @staticmethod
+    def set_window(window):
+        Display.window = window
+        window_width, window_height = window.get_size()
+        render_width, render_height = Display.render_size
+        if (window_width, window_height) == Display.render_size:
+            Display.render_surface = window
+            Display.target_rect = window.get_rect()
+            Display.target = window
+            return
+
+        whole_scale = min(window_width//render_width, window_height//render_height)
+        if Display.smooth or whole_scale < 1:
+            scale = min(window_width/render_width, window_height/render_height)
+            size = round(render_width*scale), round(render_height*scale)
+        else:
+            size = render_width*whole_scale, render_height*whole_scale
+        Display.target_rect = pygame.Rect((0, 0), size)
+        Display.target_rect.center = window.get_rect().center
+        Display.target = window.subsurface(Display.target_rect)
+        if Display.offscreen is None or Display.offscreen.get_size() != Display.render_size:
+            Display.offscreen = pygame.Surface(Display.render_size).convert()
+        Display.render_surface = Display.offscreen
+        window.fill((0, 0, 0))
+
+    @staticmethod
+    def toggle_fullscreen():
+        """ Switches between a desktop-sized fullscreen window and the normal one. What's drawn doesn't change. """
+        Display.fullscreen = not Display.fullscreen
+        if Display.fullscreen:
+            window = pygame.display.set_mode(pygame.display.get_desktop_sizes()[0], pygame.FULLSCREEN)
+        else:
+            window = pygame.display.set_mode(Display.windowed_size)
+        Display.set_window(window)
+
+    @staticmethod
+    def present():
+        """ Scales the render target onto the window, if they differ, and flips the display. """
+        surface = Display.render_surface
+        if surface is not Display.window:
+            if Display.target_rect.size == surface.get_size():
+                Display.target.blit(surface, (0, 0))
+            elif Display.smooth:
+                pygame.transform.smoothscale(surface, Display.target_rect.size, Display.target)
+            else:
+                pygame.transform.scale(surface, Display.target_rect.size, Display.target)
+        pygame.display.flip()
+
+    @staticmethod
+    def window_to_render(position):
+        """ Maps a position on the window (like the mouse's) to the render target. """
+        rect = Display.target_rect
+        if rect is None:
+            return position
+        x = (position[0] - rect.x)*Display.render_size[0]//rect.width
+        y = (position[1] - rect.y)*Display.render_size[1]//rect.height
+        return x, y
@@ -0,0 +1,484 @@
+try:
+    import numpy
+except ImportError:  # The world is optional; GameFrame falls back to plain Enemy objects without it
+    numpy = None
+
+from enemy import Enemy, FastEnemy
+from enemy_store import ColumnStore, PoseColumn, ScalarColumn
+from steering import Steering
+
+import constants as c
+
+
+class Archetype(ColumnStore):
+    """
+    Every entity in a World with exactly the same set of components, one dense column per field. Rows stay packed,
+    so a system handles a whole archetype with a few vector ops over the first count rows.
+    """
+
+    pose_dtype = "float64"  # The same precision as Pose, so entities behave like the objects they stand in for
+
+    def __init__(self, components, fields, capacity=64):
+        self.components = components
+        self.pose_columns = tuple(name for name, dtype in fields.items() if dtype == "pose")
+        self.scalar_columns = {name: dtype for name, dtype in fields.items() if dtype != "pose"}
+        super().__init__(capacity)
+
+
+class World:
+    """
+    Entity component storage. An entity is any object with row and store attributes, like the ones ColumnStore
+    hands out; the store is the Archetype for the components it has. PoseColumn and ScalarColumn attributes read and
+    write its row, so classes written for plain attributes work over a World unchanged.
+
+    Components are named groups of fields, each "pose" (two wide) or a NumPy dtype. Field names are shared across
+    components, so two components can't both have a field called position. Components with no fields are tags, which
+    only decide which archetype an entity lives in; see Tag.
+    """
+
+    components = {}  # Maps component name to {field name: "pose" or dtype}
+
+    def __init__(self):
+        self.archetypes = {}  # Maps frozenset of component names to the Archetype for them
+
+    @staticmethod
+    def available():
+        return numpy is not None
+
+    def archetype(self, components):
+        components = frozenset(components)
+        if components not in self.archetypes:
+            fields = {}
+            for name in sorted(components):
+                fields.update(self.components[name])
+            self.archetypes[components] = Archetype(components, fields)
+        return self.archetypes[components]
+
+    def spawn(self, item, components):
+        self.archetype(components).add(item)
+
+    def despawn(self, item):
+        """ Takes an entity out of the world. Like ColumnStore.remove, it keeps a detached copy of its state. """
+        archetype = item.store
+        if archetype is None or item.row is None:
+            return
+        archetype.remove(item)
+        for name in archetype.components:
+            if not self.components[name]:
+                item.detached[name] = True  # So Tag still reads the same
+
+    def set_components(self, item, components):
+        """ Gives an entity a new set of components, carrying over the fields the old and new sets share. """
+        archetype = self.archetype(components)
+        if archetype is item.store:
+            return
+        item.store.remove(item)
+        archetype.add(item)
+        for name, value in item.detached.items():
+            if name in archetype.pose_columns:
+                getattr(archetype, name)[item.row] = value.get_position()
+            elif name in archetype.scalar_columns:
+                getattr(archetype, name)[item.row] = value
+
+    def add_component(self, item, name):
+        self.set_components(item, item.store.components | {name})
+
+    def remove_component(self, item, name):
+        self.set_components(item, item.store.components - {name})
+
+    def query(self, *components, exclude=()):
+        """ Returns every non-empty archetype with all of components and none of exclude. """
+        return [archetype for key, archetype in self.archetypes.items()
+                if archetype.count and key.issuperset(components) and key.isdisjoint(exclude)]
+
+    def __len__(self):
+        return sum(archetype.count for archetype in self.archetypes.values())
+
+
+class Tag:
+    """ Attribute that's True while an entity has a component with no fields. Setting it adds or removes it. """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, item, owner=None):
+        if item is None:
+            return self
+        if item.row is None:
+            return item.detached.get(self.name, False)
+        return self.name in item.store.components
+
+    def __set__(self, item, value):
+        if item.row is None:
+            item.detached[self.name] = bool(value)
+        elif value:
+            item.world.add_component(item, self.name)
+        else:
+            item.world.remove_component(item, self.name)
+
+
+class Clip:
+    """ One animation an EntitySprite can play, and what happens when it finishes, as pyracy's Sprite would do. """
+
+    def __init__(self, animation, frame_rate, following, callback):
+        self.frames = animation.frames
+        self.count = animation.frame_count
+        self.time_scaling = animation.time_scaling
+        self.frame_time = 1.0/frame_rate
+        self.following = following  # Clip to carry on with, or None to stop on the last frame
+        self.callback = callback  # Name of the entity's method to call when it finishes, if any
+
+
+class EntitySprite:
+    """
+    The part of pyracy's Sprite that Enemy uses, over the animation fields of its entity. AgentWorld.animate moves
+    every entity's animation along at once.
+    """
+
+    def __init__(self, item, clips):
+        self.item = item
+        self.clips = clips  # Maps animation name to clip index in the world
+
+    @property
+    def x(self):
+        return self.item.sprite_position.x
+
+    @property
+    def y(self):
+        return self.item.sprite_position.y
+
+    def set_position(self, position):
+        self.item.sprite_position.set_position(position)
+
+    def start_animation(self, name, restart_if_active=True, clear_time=True):
+        item = self.item
+        item.paused = False
+        clip = self.clips[name]
+        if not restart_if_active and clip == item.clip:
+            return
+        if clear_time:
+            item.clip_time = 0
+        item.clip = clip
+
+    def get_image(self):
+        """ The frame the last AgentWorld.animate settled on, as Sprite keeps the image from its last update. """
+        item = self.item
+        return item.world.clips[item.shown_clip].frames[item.shown_frame]
+
+    def draw(self, surface, offset=(0, 0)):
+        image = self.get_image()
+        x, y = self.item.sprite_position.get_position()
+        surface.blit(image, (int(x - image.get_width()/2 + offset[0]), int(y - image.get_height()/2 + offset[1])))
+
+
+class AgentWorld(World):
+    """
+    A World for the enemies, with a system for each part of Enemy.update, run in its order by update(). Systems work
+    on whole archetypes at once; the few entities that need something rarer done this tick (picking a new target,
+    dying, finishing an animation with a callback) get it done by their own Enemy method, as before.
+
+    Enemies see their neighbours as they were at the start of the collision step, rather than partly moved, and
+    each system handles every enemy before the next system starts, so runs differ slightly from the object path.
+    """
+
+    components = {
+        "transform": {"position": "pose"},
+        "motion": {"velocity": "pose", "max_speed": "float64"},
+        "body": {"radius": "float64"},
+        "health": {"health": "float64", "max_health": "float64"},
+        "wander": {"target_position": "pose", "target_velocity": "pose", "last_walk_direction": "pose",
+                   "arrived": "bool", "since_arrived": "float64", "since_start_walking": "float64"},
+        "sprite": {"sprite_position": "pose", "clip_set": "int32", "clip": "int32", "clip_time": "float64",
+                   "paused": "bool", "shown_clip": "int32", "shown_frame": "int32"},
+        "dead": {},
+        "destroyed": {},
+    }
+    enemy_components = ("transform", "motion", "body", "health", "wander", "sprite")
+
+    def __init__(self, workers=0):
+        super().__init__()
+        self.steering = Steering(workers)
+        self.clips = []
+        self.clip_sets = []  # {animation name: clip index} for each class of enemy
+        self.clip_set_indices = {}  # Maps each class to the index of its clip set
+        self.named_clips = {}  # Maps animation name to an array of its clip index in each clip set
+        self.clip_time_scaling = None
+        self.clip_frame_time = None
+        self.clip_count = None
+
+    def clip_set_for(self, enemy_class):
+        """ Returns the index of enemy_class's clip set, adding its animations to the world the first time. """
+        if enemy_class not in self.clip_set_indices:
+            looping, once = enemy_class.animations()
+            indices = {name: len(self.clips) + i for i, name in enumerate(list(looping) + list(once))}
+            for name, animation in list(looping.items()) + list(once.items()):
+                following = name if name in looping else enemy_class.chains.get(name)
+                self.clips.append(Clip(animation, enemy_class.frame_rate,
+                                       None if following is None else indices[following],
+                                       enemy_class.callbacks.get(name)))
+            self.clip_set_indices[enemy_class] = len(self.clip_sets)
+            self.clip_sets.append(indices)
+            self.named_clips = {name: numpy.array([clip_set.get(name, -1) for clip_set in self.clip_sets])
+                                for name in indices}
+            self.clip_time_scaling = numpy.array([clip.time_scaling for clip in self.clips], dtype=float)
+            self.clip_frame_time = numpy.array([clip.frame_time for clip in self.clips], dtype=float)
+            self.clip_count = numpy.array([clip.count for clip in self.clips])
+        return self.clip_set_indices[enemy_class]
+
+    def update(self, dt, frame):
+        """ Enemy.update for every enemy. Returns the enemies that were cleaned up, and have left the world. """
+        self.animate(dt)
+        self.damage()
+        living = self.wander(dt)
+        self.limit_speed(dt)
+        self.collide(dt, frame, living)
+        self.integrate(dt)
+        return self.cleanup()
+
+    def animate(self, dt):
+        """ Sprite.set_position and Sprite.update. Finished animations chain and run their callbacks one by one. """
+        finished = []
+        for archetype in self.query("transform", "sprite"):
+            n = archetype.count
+            archetype.sprite_position[:n] = archetype.position[:n]
+            clip = archetype.clip[:n]
+            clip_time = archetype.clip_time[:n]
+            clip_time += numpy.where(archetype.paused[:n], 0, dt*self.clip_time_scaling[clip])
+            frame = (clip_time/self.clip_frame_time[clip]).astype(numpy.int32)
+            archetype.shown_clip[:n] = clip
+            archetype.shown_frame[:n] = frame
+            finished += [archetype.items[row] for row in numpy.flatnonzero(frame >= self.clip_count[clip])]
+        for item in finished:
+            self.finish_clip(item)
+
+    def finish_clip(self, item):
+        """ What Sprite.get_image does when an animation runs out, down to where it leaves the time. """
+        while True:
+            clip = self.clips[item.clip]
+            frame = int(item.clip_time/clip.frame_time)
+            if frame < clip.count:
+                item.shown_clip = item.clip
+                item.shown_frame = frame
+                return
+            if clip.callback is not None:
+                getattr(item, clip.callback)()
+            if clip.following is None:
+                item.paused = True
+                item.clip_time = clip.frame_time*(clip.count - 0.5)
+                item.shown_clip = item.clip
+                item.shown_frame = clip.count - 1
+                return
+            item.paused = False
+            item.clip = clip.following
+            item.clip_time -= clip.frame_time*clip.count
+
+    def damage(self):
+        """ Enemies whose health has run out die. """
+        dying = []
+        for archetype in self.query("health", exclude=("dead",)):
+            dying += [archetype.items[row] for row in numpy.flatnonzero(archetype.health[:archetype.count] < 0)]
+        for item in dying:
+            item.die()
+
+    def wander(self, dt):
+        """
+        Enemy.update_target_motion, then the wait before heading somewhere new. Steering works out how the living
+        enemies push each other apart at the same time, for collide(), since nothing moves in between. Returns the
+        archetypes of the living enemies, in the order they went into steering's arrays.
+        """
+        living = self.query("transform", "motion", "body", "wander", exclude=("dead",))
+        count = sum(archetype.count for archetype in living)
+        if count:
+            arrays = self.steering.reserve(count)
+            for archetype, start, end in self.spans(living):
+                for name in Steering.inputs:
+                    arrays[name][start:end] = getattr(archetype, name)[:archetype.count]
+            self.steering.run(count, 2*arrays["radius"][:count].max() + 5, dt)
+            for archetype, start, end in self.spans(living):
+                far = numpy.flatnonzero(arrays["far"][start:end])
+                archetype.target_velocity[far] = arrays["target_velocity"][start + far]
+                archetype.velocity[:archetype.count] = arrays["velocity"][start:end]
+                archetype.since_start_walking[:archetype.count] = arrays["since_start_walking"][start:end]
+                self.arrive(archetype, numpy.flatnonzero(arrays["stopping"][start:end]))
+
+        leaving = []
+        for archetype in self.query("wander", exclude=("dead",)):
+            n = archetype.count
+            arrived = archetype.arrived[:n]
+            since_arrived = archetype.since_arrived[:n]
+            since_arrived[arrived] -= dt
+            leaving += [archetype.items[row] for row in numpy.flatnonzero(arrived & (since_arrived <= 0))]
+        for item in leaving:
+            item.set_target_position()
+        return living
+
+    @staticmethod
+    def spans(archetypes):
+        """ Yields each archetype with the range of rows it takes up when they're all put together in order. """
+        start = 0
+        for archetype in archetypes:
+            yield archetype, start, start + archetype.count
+            start += archetype.count
+
+    def arrive(self, archetype, rows):
+        """ Enemy.arrive_at_target for some rows of an archetype at once. """
+        if not len(rows):
+            return
+        archetype.target_position[rows] = archetype.position[rows]
+        archetype.velocity[rows] = 0
+        archetype.arrived[rows] = True
+        archetype.since_arrived[rows] = [archetype.items[row].wait_time() for row in rows]
+        clip_set = archetype.clip_set[rows]
+        idle = numpy.where(archetype.last_walk_direction[rows, 0] > 0, self.named_clips["IdleRight"][clip_set],
+                           self.named_clips["IdleLeft"][clip_set])
+        self.start_clips(archetype, rows, idle, restart_if_active=False)
+
+    def start_clips(self, archetype, rows, clips, restart_if_active=True):
+        """ EntitySprite.start_animation for some rows of an archetype at once. """
+        archetype.paused[rows] = False
+        if not restart_if_active:
+            changing = archetype.clip[rows] != clips
+            rows = rows[changing]
+            clips = clips[changing]
+        archetype.clip_time[rows] = 0
+        archetype.clip[rows] = clips
+
+    def limit_speed(self, dt):
+        """ Enemy.update_speed: damps stopped and dead enemies, then caps everyone at max_speed. """
+        for archetype in self.query("motion"):
+            n = archetype.count
+            velocity = archetype.velocity[:n]
+            if "dead" in archetype.components:
+                velocity *= 0.01**dt
+            elif "wander" in archetype.components:
+                velocity[archetype.arrived[:n]] *= 0.01**dt
+            speed = numpy.sqrt(velocity[:, 0]*velocity[:, 0] + velocity[:, 1]*velocity[:, 1])
+            max_speed = archetype.max_speed[:n]
+            too_fast = speed > max_speed
+            velocity[too_fast] *= (max_speed[too_fast]/speed[too_fast])[:, None]
+
+    def collide(self, dt, frame, living):
+        """
+        Enemy.update_collisions: applies what wander() worked out the living enemies do to each other, then checks
+        every one against the player and the phone.
+        """
+        if not living:
+            return
+        position = numpy.concatenate([archetype.position[:archetype.count] for archetype in living])
+        velocity = numpy.concatenate([archetype.velocity[:archetype.count] for archetype in living])
+        radius = numpy.concatenate([archetype.radius[:archetype.count] for archetype in living])
+        velocity += self.steering.arrays["nudge"][:len(position)]
+        push = self.steering.arrays["push"][:len(position)].copy()
+
+        for other in (frame.player, frame.phone):
+            offset = position - other.position.get_position()
+            in_box = (numpy.abs(offset) <= 50).all(axis=1)
+            distance = numpy.sqrt(offset[:, 0]*offset[:, 0] + offset[:, 1]*offset[:, 1])
+            reach = radius + other.radius
+            touching = in_box & (distance < reach)
+            if other.is_player:
+                if not other.rolling:
+                    rows = numpy.flatnonzero(touching)
+                    if len(rows):
+                        items = [item for archetype in living for item in archetype.items[:archetype.count]]
+                        for row in rows:
+                            other.get_hurt(other.position - items[row].position)
+                else:
+                    touching[:] = False
+            else:
+                near = in_box & (distance > reach) & (distance <= reach + 20)  # Skipping any exactly touching it
+                fact = 1/(distance[near] - reach[near])
+                nudge = offset[near]*(20*dt)*fact[:, None]
+                velocity[near] += nudge
+                other.velocity.x -= nudge[:, 0].sum()
+                other.velocity.y -= nudge[:, 1].sum()
+            rows = numpy.flatnonzero(touching)
+            apart = distance[rows]
+            unit = numpy.zeros((len(rows), 2))
+            unit[:, 0] = 1
+            moving = apart > 0
+            unit[moving] = offset[rows][moving]/apart[moving, None]
+            push[rows] += unit*((reach[rows] - apart)*(100*dt))[:, None]
+
+        for archetype, start, end in self.spans(living):
+            archetype.velocity[:archetype.count] = velocity[start:end]
+            archetype.position[:archetype.count] += push[start:end]
+
+    def integrate(self, dt):
+        """ Enemy.update_position: integrates velocity and keeps everyone in the arena. """
+        for archetype in self.query("transform", "motion", "body"):
+            n = archetype.count
+            position = archetype.position[:n]
+            position += archetype.velocity[:n]*dt
+            radius = archetype.radius[:n]
+            numpy.clip(position[:, 0], -c.ARENA_WIDTH//2 + radius, c.ARENA_WIDTH//2 - radius, out=position[:, 0])
+            numpy.clip(position[:, 1], -c.ARENA_HEIGHT//2, c.ARENA_HEIGHT//2 - radius*2, out=position[:, 1])
+
+    def cells(self, items, cell_size):
+        """ The SpatialHash cell of each of items, worked out all at once. """
+        rows = numpy.fromiter((item.row for item in items), int, len(items))
+        stores = [item.store for item in items]
+        position = numpy.empty((len(items), 2))
+        for archetype in set(stores):
+            mine = numpy.fromiter((store is archetype for store in stores), bool, len(items))
+            position[mine] = archetype.position[rows[mine]]
+        return list(map(tuple, numpy.floor_divide(position, cell_size).astype(int).tolist()))
+
+    def cleanup(self):
+        """ Takes destroyed entities out of the world, and returns them. """
+        destroyed = [item for archetype in self.query("destroyed") for item in archetype.items]
+        for item in destroyed:
+            self.despawn(item)
+        return destroyed
+
+
+class WorldEnemyMixin:
+    """
+    Makes an enemy an entity in its frame's AgentWorld, with its state in the world's columns. The frame runs the
+    world's systems in place of calling update on each enemy.
+    """
+
+    row = None
+    store = None
+
+    position = PoseColumn("position")
+    velocity = PoseColumn("velocity")
+    max_speed = ScalarColumn("max_speed")
+    radius = ScalarColumn("radius")
+    health = ScalarColumn("health")
+    max_health = ScalarColumn("max_health")
+    target_position = PoseColumn("target_position")
+    target_velocity = PoseColumn("target_velocity")
+    last_walk_direction = PoseColumn("last_walk_direction")
+    arrived = ScalarColumn("arrived")
+    since_arrived = ScalarColumn("since_arrived")
+    since_start_walking = ScalarColumn("since_start_walking")
+    sprite_position = PoseColumn("sprite_position")
+    clip_set = ScalarColumn("clip_set")
+    clip = ScalarColumn("clip")
+    clip_time = ScalarColumn("clip_time")
+    paused = ScalarColumn("paused")
+    shown_clip = ScalarColumn("shown_clip")
+    shown_frame = ScalarColumn("shown_frame")
+    dead = Tag("dead")
+    destroyed = Tag("destroyed")
+
+    def __init__(self, frame, position=(0, 0)):
+        self.world = frame.agent_world
+        self.world.spawn(self, AgentWorld.enemy_components)
+        super().__init__(frame, position)
+
+    def make_sprite(self):
+        self.clip_set = self.world.clip_set_for(type(self))
+        sprite = EntitySprite(self, self.world.clip_sets[self.clip_set])
+        sprite.start_animation("IdleRight")
+        self.shown_clip = self.clip
+        return sprite
+
+
+class WorldEnemy(WorldEnemyMixin, Enemy):
+    pass
+
+
+class WorldFastEnemy(WorldEnemyMixin, FastEnemy):
+    pass
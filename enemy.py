@@ -1,5 +1,3 @@
-import random
-
 import pygame
 
 from particle import Poof
@@ -8,9 +6,21 @@ from pyracy.sprite_tools import Sprite, Animation
 
 import constants as c
 from sound_manager import SoundManager
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("enemies")
 
 
 class Enemy:
+    hit_sounds = None
+    shadows = {}  # Maps radius to a shadow surface shared by every enemy that size
+    sheet = "zombie"  # Prefix of the sprite sheets in assets/images
+    walk_speed = 80
+    lands = True  # Whether it kicks up poofs when it spawns
+    frame_rate = 6
+    chains = {"TakeDamageRight": "IdleRight", "TakeDamageLeft": "IdleLeft", "Dead": "DeadLong"}
+    callbacks = {"TakeDamageRight": "arrive_at_target", "TakeDamageLeft": "arrive_at_target", "DeadLong": "cleanup"}
+    scratch = Pose((0, 0))  # Reused by update_target_motion, since enemies update one at a time
 
     def __init__(self, frame, position=(0, 0)):
         self.frame = frame
@@ -19,7 +29,6 @@ class Enemy:
         self.position = Pose(position)
         self.velocity = Pose((0, 0))
         self.target_velocity = Pose((0, 0))
-        self.sprite = Sprite(6, (0, 0))
 
         self.last_walk_direction = Pose((1, 0))
 
@@ -35,121 +44,74 @@ class Enemy:
         self.destroyed = False
 
         self.arrived = True
-        self.since_arrived = random.random()
-
-        self.sounds = [SoundManager.load(f"assets/sound/zombie_hit_{n}.ogg") for n in range(1, 8)]
-        for sound in self.sounds:
-            sound.set_volume(0.4)
-
-        walk_right = Animation.from_path(
-            "assets/images/zombie_walk_right.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            scale=2.0,
-        )
-        walk_left = Animation.from_path(
-            "assets/images/zombie_walk_right.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            reverse_x=True,
-            scale=2.0,
-        )
-        idle_right = Animation.from_path(
-            "assets/images/zombie_forward_idle.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            scale=2.0,
-        )
-        idle_left = Animation.from_path(
-            "assets/images/zombie_forward_idle.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            reverse_x=True,
-            scale=2.0,
-        )
-        walk_back_right = Animation.from_path(
-            "assets/images/walk_right_back.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            scale=2.0,
-
-        )
-        walk_back_left = Animation.from_path(
-            "assets/images/walk_right_back.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            reverse_x=True,
-            scale=2.0,
-        )
-        dead = Animation.from_path(
-            "assets/images/zombie_death.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            scale=2.0,
-            time_scaling=2.0,
-        )
-        dead_long = Animation.from_path(
-            "assets/images/zombie_death_long.png",
-            sheet_size=(1, 1),
-            frame_count=1,
-            scale=2.0,
-            time_scaling=0.01,
-        )
-        take_damage_right = Animation.from_path(
-            "assets/images/zombie_take_damage.png",
-            sheet_size=(2, 1),
-            frame_count=2,
-            scale=2.0,
-            time_scaling = 2.0,
-        )
-        take_damage_left = Animation.from_path(
-            "assets/images/zombie_take_damage.png",
-            sheet_size=(2, 1),
-            frame_count=2,
-            reverse_x=True,
-            scale=2.0,
-            time_scaling = 2.0,
-        )
-
-        self.sprite.add_animation(
-            {
-                "WalkRight": walk_right,
-                "WalkLeft": walk_left,
-                "IdleRight": idle_right,
-                "IdleLeft": idle_left,
-                "WalkBackRight": walk_back_right,
-                "WalkBackLeft": walk_back_left,
-            },
-            loop=True
-        )
-        self.sprite.add_animation(
-            {
-                "Dead": dead,
-                "TakeDamageRight": take_damage_right,
-                "TakeDamageLeft": take_damage_left,
-                "DeadLong": dead_long,
-            },
-            loop=False
-        )
-
-        self.sprite.start_animation("IdleRight")
-        self.sprite.add_callback("TakeDamageRight",self.arrive_at_target)
-        self.sprite.add_callback("TakeDamageLeft",self.arrive_at_target)
-        self.sprite.add_callback("DeadLong",self.cleanup)
-        self.sprite.chain_animation("TakeDamageRight","IdleRight")
-        self.sprite.chain_animation("TakeDamageLeft","IdleLeft")
-        self.sprite.chain_animation("Dead","DeadLong")
-
-        self.shadow = pygame.Surface((self.radius*3, self.radius*3//2))
-        self.shadow.fill((255, 255, 0))
-        self.shadow.set_colorkey((255, 255, 0))
-        pygame.draw.ellipse(self.shadow, (0, 0, 0), self.shadow.get_rect())
-        self.shadow.set_alpha(60)
-
-        self.max_speed = 80
+        self.since_arrived = rng.random()
+
+        self.sounds = Enemy.get_hit_sounds()
+
+        self.sprite = self.make_sprite()
+
+        self.shadow = Enemy.get_shadow(self.radius)
+
+        self.max_speed = self.walk_speed
         self.since_start_walking = 10
 
-        self.land()
+        if self.lands:
+            self.land()
+
+    def make_sprite(self):
+        sprite = Sprite(self.frame_rate, (0, 0))
+        looping, once = self.animations()
+        sprite.add_animation(looping, loop=True)
+        sprite.add_animation(once, loop=False)
+
+        sprite.start_animation("IdleRight")
+        for animation, method in self.callbacks.items():
+            sprite.add_callback(animation, getattr(self, method))
+        for animation, following in self.chains.items():
+            sprite.chain_animation(animation, following)
+        return sprite
+
+    @classmethod
+    def animations(cls):
+        """ Returns the animations that loop and the ones that play once, as dicts of name to Animation. """
+        def sheet(name, frames, reverse_x=False, **kwargs):
+            return Animation.from_path(f"assets/images/{name}.png", sheet_size=(frames, 1), frame_count=frames,
+                                       reverse_x=reverse_x, scale=2.0, **kwargs)
+
+        looping = {
+            "WalkRight": sheet(f"{cls.sheet}_walk_right", 6),
+            "WalkLeft": sheet(f"{cls.sheet}_walk_right", 6, reverse_x=True),
+            "IdleRight": sheet(f"{cls.sheet}_forward_idle", 8),
+            "IdleLeft": sheet(f"{cls.sheet}_forward_idle", 8, reverse_x=True),
+            "WalkBackRight": sheet("walk_right_back", 6),
+            "WalkBackLeft": sheet("walk_right_back", 6, reverse_x=True),
+        }
+        once = {
+            "Dead": sheet(f"{cls.sheet}_death", 8, time_scaling=2.0),
+            "DeadLong": sheet(f"{cls.sheet}_death_long", 1, time_scaling=0.01),
+            "TakeDamageRight": sheet(f"{cls.sheet}_take_damage", 2, time_scaling=2.0),
+            "TakeDamageLeft": sheet(f"{cls.sheet}_take_damage", 2, reverse_x=True, time_scaling=2.0),
+        }
+        return looping, once
+
+    @staticmethod
+    def get_hit_sounds():
+        if Enemy.hit_sounds is None:
+            Enemy.hit_sounds = [SoundManager.load(f"assets/sound/zombie_hit_{n}.ogg") for n in range(1, 8)]
+            for sound in Enemy.hit_sounds:
+                sound.set_volume(0.4)
+        return Enemy.hit_sounds
+
+    @staticmethod
+    def get_shadow(radius):
+        if radius not in Enemy.shadows:
+            shadow = pygame.Surface((radius*3, radius*3//2))
+            shadow.fill((255, 255, 0))
+            shadow.set_colorkey((255, 255, 0))
+            pygame.draw.ellipse(shadow, (0, 0, 0), shadow.get_rect())
+            shadow.set_alpha(60, pygame.RLEACCEL)  # Run-length encoding makes colorkey blits far cheaper
+            Enemy.shadows[radius] = shadow
+        return Enemy.shadows[radius]
 
     def cleanup(self):
         self.destroyed = True
@@ -161,8 +123,8 @@ class Enemy:
         start = self.position.copy()
         direction = self.player.position - self.position
         spread = self.spread()
-        direction.rotate_position(random.random()*spread - spread/2)
-        direction.scale_to(70 + 50*random.random())
+        direction.rotate_position(rng.random()*spread - spread/2)
+        direction.scale_to(70 + 50*rng.random())
         return start + direction
 
     def set_target_position(self):
@@ -184,7 +146,7 @@ class Enemy:
         self.sprite.draw(surface, offset)
 
     def wait_time(self):
-        return 1 + random.random()
+        return 1 + rng.random()
 
     def arrive_at_target(self):
         self.target_position = self.position.copy()
@@ -202,9 +164,9 @@ class Enemy:
             if target_direction.magnitude() > 20:
                 target_direction.scale_to(self.max_speed)
                 self.target_velocity = target_direction
-                dv = self.target_velocity - self.velocity
                 if not self.arrived:
-                    self.velocity += dv * 5
+                    dv = self.target_velocity.sub_into(self.velocity, Enemy.scratch)
+                    self.velocity.iadd_scaled(dv, 5)
                 self.since_start_walking += dt
                 if self.since_start_walking > 4:
                     self.arrive_at_target()
@@ -212,6 +174,13 @@ class Enemy:
                 self.arrive_at_target()
 
     def update(self, dt, events):
+        self.update_behaviour(dt, events)
+        self.update_speed(dt)
+        self.update_collisions(dt)
+        self.update_position(dt)
+
+    def update_behaviour(self, dt, events):
+        """ Animation, death and steering; everything before the kinematic steps. """
         self.sprite.set_position(self.position.get_position())
         self.sprite.update(dt, events)
 
@@ -227,58 +196,59 @@ class Enemy:
             if self.since_arrived <= 0:
                 self.set_target_position()
 
+    def update_speed(self, dt):
+        """ Damps velocity once stopped or dead, then caps it at max_speed. Mirrored by EnemyStore.update_speed. """
         if self.arrived or self.dead:
-            self.velocity *= 0.01**dt
+            self.velocity.imul(0.01**dt)
 
         if self.velocity.magnitude() > self.max_speed:
             self.velocity.scale_to(self.max_speed)
 
+    def update_collisions(self, dt):
         if not self.dead:
             min_y = self.position.y - 50
             max_y = self.position.y + 50
             min_x = self.position.x - 50
             max_x = self.position.x + 50
-            for item in self.frame.enemies:
+            diff = Pose((0, 0))  # Reused for every pair below
+            for item in self.frame.enemy_grid.query(self.position.x, self.position.y, 50):
                 if item.dead:
                     continue
                 if item.position.y > max_y:
-                    break
+                    continue
                 if item.position.y < min_y or item.position.x < min_x or item.position.x > max_x:
                     continue
-                diff = self.position - item.position
+                self.position.sub_into(item.position, diff)
                 dist = diff.magnitude()
                 if dist < self.radius + item.radius:
                     self.collide_with_other(item, dt)
                 elif dist < self.radius + item.radius + 5:
-                    self.velocity += diff*dt*10
-                    item.velocity += diff*-dt*10
+                    diff.imul(dt)
+                    self.velocity.iadd_scaled(diff, 10)
+                    item.velocity.iadd_scaled(diff, -10)
             for item in [self.frame.player, self.frame.phone]:
                 if item.position.y > max_y:
                     continue
                 if item.position.y < min_y or item.position.x < min_x or item.position.x > max_x:
                     continue
-                diff = self.position - item.position
+                self.position.sub_into(item.position, diff)
                 dist = diff.magnitude()
                 if dist < self.radius + item.radius:
                     self.collide_with_other(item, dt)
                 elif dist <= self.radius + item.radius + 20:
                     if item.is_player:
                         continue
-                    fact = 1/(dist - self.radius - item.radius)
-                    self.velocity += diff*dt*20*(fact)
-                    item.velocity += diff*-dt*20*(fact)
-            for bullet in self.frame.bullets:
-                if bullet.position.y > max_y:
-                    continue
-                if bullet.position.y < min_y or bullet.position.x < min_x or bullet.position.x > max_x:
-                    continue
-                if not bullet.can_hit(self):
-                    continue
-                diff = bullet.position - self.position
-                if diff.magnitude() < self.radius + bullet.radius:
-                    self.get_hurt(bullet)
+                    gap = dist - self.radius - item.radius
+                    if gap <= 0:  # Exactly touching, where a fixed step's push can leave it
+                        continue
+                    fact = 1/gap
+                    diff.imul(dt).imul(20)
+                    self.velocity.iadd_scaled(diff, fact)
+                    item.velocity.iadd_scaled(diff, -fact)
 
-        self.position += self.velocity*dt
+    def update_position(self, dt):
+        """ Integrates velocity and keeps the enemy in the arena. Mirrored by EnemyStore.update_position. """
+        self.position.iadd_scaled(self.velocity, dt)
 
         if self.position.x < -c.ARENA_WIDTH//2 + self.radius:
             self.position.x = -c.ARENA_WIDTH//2 + self.radius
@@ -299,8 +269,8 @@ class Enemy:
             self.sprite.start_animation("TakeDamageLeft")
 
         bullet.reduce_durability()
-        self.velocity += bullet.velocity*0.25
-        random.choice(self.sounds).play()
+        self.velocity.iadd_scaled(bullet.velocity, 0.25)
+        rng.choice(self.sounds).play()
 
     def collide_with_other(self, other, dt):
         if other is self:
@@ -311,12 +281,11 @@ class Enemy:
                 return
             other.get_hurt(other.position - self.position)
 
-        diff = self.position - other.position
-        if diff.magnitude() < self.radius + other.radius:
-            delta = diff.copy()
-            delta.scale_to(self.radius + other.radius - diff.magnitude())
-            diff.scale_to(self.radius + other.radius)
-            self.position += delta * dt * 100
+        delta = self.position - other.position
+        distance = delta.magnitude()
+        if distance < self.radius + other.radius:
+            delta.scale_to(self.radius + other.radius - distance)
+            self.position.iadd_scaled(delta.imul(dt), 100)
 
 
     def draw_shadow(self, surface, offset=(0, 0)):
@@ -326,149 +295,15 @@ class Enemy:
     def land(self):
         for i in range(12):
             pos = (self.position + Pose((0, 20))).get_position()
-            self.frame.particles.append(Poof(pos))
+            self.frame.particles.spawn(Poof, pos)
 
 class FastEnemy(Enemy):
-    def __init__(self, frame, position=(0, 0)):
-        self.frame = frame
-        self.player = self.frame.player
-
-        self.position = Pose(position)
-        self.velocity = Pose((0, 0))
-        self.target_velocity = Pose((0, 0))
-        self.sprite = Sprite(6, (0, 0))
-
-        self.last_walk_direction = Pose((1, 0))
-
-        self.is_player = False
-
-        self.dead = False
-
-        self.health = 100
-        self.max_health = 100
-        self.radius = self.player.radius
-
-        self.target_position = self.position.copy()
-        self.destroyed = False
-
-        self.arrived = True
-        self.since_arrived = random.random()
-
-        self.sounds = [SoundManager.load(f"assets/sound/zombie_hit_{n}.ogg") for n in range(1, 8)]
-        for sound in self.sounds:
-            sound.set_volume(0.4)
-
-        walk_right = Animation.from_path(
-            "assets/images/zombie_2_walk_right.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            scale=2.0,
-        )
-        walk_left = Animation.from_path(
-            "assets/images/zombie_2_walk_right.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            reverse_x=True,
-            scale=2.0,
-        )
-        idle_right = Animation.from_path(
-            "assets/images/zombie_2_forward_idle.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            scale=2.0,
-        )
-        idle_left = Animation.from_path(
-            "assets/images/zombie_2_forward_idle.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            reverse_x=True,
-            scale=2.0,
-        )
-        walk_back_right = Animation.from_path(
-            "assets/images/walk_right_back.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            scale=2.0,
-
-        )
-        walk_back_left = Animation.from_path(
-            "assets/images/walk_right_back.png",
-            sheet_size=(6, 1),
-            frame_count=6,
-            reverse_x=True,
-            scale=2.0,
-        )
-        dead = Animation.from_path(
-            "assets/images/zombie_2_death.png",
-            sheet_size=(8, 1),
-            frame_count=8,
-            scale=2.0,
-            time_scaling=2.0,
-        )
-        dead_long = Animation.from_path(
-            "assets/images/zombie_2_death_long.png",
-            sheet_size=(1, 1),
-            frame_count=1,
-            scale=2.0,
-            time_scaling=0.01,
-        )
-        take_damage_right = Animation.from_path(
-            "assets/images/zombie_2_take_damage.png",
-            sheet_size=(2, 1),
-            frame_count=2,
-            scale=2.0,
-            time_scaling = 2.0,
-        )
-        take_damage_left = Animation.from_path(
-            "assets/images/zombie_2_take_damage.png",
-            sheet_size=(2, 1),
-            frame_count=2,
-            reverse_x=True,
-            scale=2.0,
-            time_scaling = 2.0,
-        )
-
-        self.sprite.add_animation(
-            {
-                "WalkRight": walk_right,
-                "WalkLeft": walk_left,
-                "IdleRight": idle_right,
-                "IdleLeft": idle_left,
-                "WalkBackRight": walk_back_right,
-                "WalkBackLeft": walk_back_left,
-            },
-            loop=True
-        )
-        self.sprite.add_animation(
-            {
-                "Dead": dead,
-                "TakeDamageRight": take_damage_right,
-                "TakeDamageLeft": take_damage_left,
-                "DeadLong": dead_long,
-            },
-            loop=False
-        )
-
-        self.sprite.start_animation("IdleRight")
-        self.sprite.add_callback("TakeDamageRight",self.arrive_at_target)
-        self.sprite.add_callback("TakeDamageLeft",self.arrive_at_target)
-        self.sprite.add_callback("DeadLong",self.cleanup)
-        self.sprite.chain_animation("TakeDamageRight","IdleRight")
-        self.sprite.chain_animation("TakeDamageLeft","IdleLeft")
-        self.sprite.chain_animation("Dead","DeadLong")
-
-        self.shadow = pygame.Surface((self.radius*3, self.radius*3//2))
-        self.shadow.fill((255, 255, 0))
-        self.shadow.set_colorkey((255, 255, 0))
-        pygame.draw.ellipse(self.shadow, (0, 0, 0), self.shadow.get_rect())
-        self.shadow.set_alpha(60)
-
-        self.max_speed = 80
-        self.since_start_walking = 10
-        self.max_speed = 120
+    sheet = "zombie_2"
+    walk_speed = 120
+    lands = False
 
     def wait_time(self):
         return 0.5
 
     def spread(self):
-        return 0
\ No newline at end of file
+        return 0
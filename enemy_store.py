@@ -0,0 +1,221 @@
+try:
+    import numpy
+except ImportError:  # The store is optional; GameFrame falls back to plain Enemy objects without it
+    numpy = None
+
+from enemy import Enemy, FastEnemy
+from primitives import Pose
+
+import constants as c
+
+
+class ColumnStore:
+    """
+    Structure-of-arrays storage: each stored object owns one row of every column, and reads and writes its state
+    through PoseColumn and ScalarColumn attributes, so the store can update every row at once.
+
+    Rows stay packed: removing an object moves the last row into the gap.
+    """
+
+    pose_columns = ()
+    scalar_columns = {}  # Maps column name to dtype
+    pose_dtype = "float32"
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0
+        self.items = []  # Row index to object
+        for name in self.pose_columns:
+            setattr(self, name, numpy.zeros((capacity, 2), dtype=self.pose_dtype))
+        for name, dtype in self.scalar_columns.items():
+            setattr(self, name, numpy.zeros(capacity, dtype=dtype))
+
+    @staticmethod
+    def available():
+        return numpy is not None
+
+    def grow(self):
+        self.capacity *= 2
+        for name in self.pose_columns + tuple(self.scalar_columns):
+            old = getattr(self, name)
+            new = numpy.zeros((self.capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        for item in self.items:
+            for name, view in item.views.items():
+                view.array = getattr(self, name)
+
+    def add(self, item):
+        if self.count == self.capacity:
+            self.grow()
+        item.store = self
+        item.row = self.count
+        item.views = {name: PoseView(self, name, item) for name in self.pose_columns}
+        self.items.append(item)
+        self.count += 1
+
+    def remove(self, item):
+        """
+        Releases an object's row. The object keeps a detached copy of its state, so anything still holding on to
+        it (like a seeking bullet) can read it safely.
+        """
+        if item.store is not self or item.row is None:
+            return
+        detached = {name: Pose(item.views[name].get_position()) for name in self.pose_columns}
+        for name in self.scalar_columns:
+            detached[name] = getattr(self, name)[item.row].item()
+        row = item.row
+        last = self.count - 1
+        if row != last:
+            for name in self.pose_columns + tuple(self.scalar_columns):
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self.items[last]
+            moved.row = row
+            self.items[row] = moved
+        self.items.pop()
+        self.count -= 1
+        item.row = None
+        item.detached = detached
+
+    def clear(self):
+        for item in self.items[:]:
+            self.remove(item)
+
+    def __len__(self):
+        return self.count
+
+
+class EnemyStore(ColumnStore):
+    """
+    Enemy kinematics as columns, so damping, speed capping, integration and arena clamping run as a handful of
+    vector ops per tick instead of a few Pose allocations per enemy.
+    """
+
+    pose_columns = ("position", "velocity", "target_position", "target_velocity")
+    scalar_columns = {"radius": "float32", "health": "float32", "max_speed": "float32",
+                      "dead": "bool", "arrived": "bool"}
+
+    def update_speed(self, dt):
+        """ Enemy.update_speed for every row. """
+        n = self.count
+        velocity = self.velocity[:n]
+        slowing = self.arrived[:n] | self.dead[:n]
+        velocity[slowing] *= 0.01**dt
+        speed = numpy.hypot(velocity[:, 0], velocity[:, 1])
+        max_speed = self.max_speed[:n]
+        too_fast = speed > max_speed
+        velocity[too_fast] *= (max_speed[too_fast] / speed[too_fast])[:, None]
+
+    def update_position(self, dt):
+        """ Enemy.update_position for every row. """
+        n = self.count
+        position = self.position[:n]
+        position += self.velocity[:n] * dt
+        radius = self.radius[:n]
+        numpy.clip(position[:, 0], -c.ARENA_WIDTH//2 + radius, c.ARENA_WIDTH//2 - radius, out=position[:, 0])
+        numpy.clip(position[:, 1], -c.ARENA_HEIGHT//2, c.ARENA_HEIGHT//2 - radius*2, out=position[:, 1])
+
+
+class PoseView(Pose):
+    """ A Pose whose x and y live in its owner's row of one of a store's columns (EnemyStore or BulletSystem). """
+
+    def __init__(self, store, column, owner):
+        self.array = getattr(store, column)  # Swapped for the new array when the store grows
+        self.owner = owner
+        self.angle = 0
+
+    @property
+    def x(self):
+        return self.array.item(self.owner.row, 0)
+
+    @x.setter
+    def x(self, value):
+        self.array[self.owner.row, 0] = value
+
+    @property
+    def y(self):
+        return self.array.item(self.owner.row, 1)
+
+    @y.setter
+    def y(self, value):
+        self.array[self.owner.row, 1] = value
+
+    def get_position(self):
+        row = self.owner.row
+        return self.array.item(row, 0), self.array.item(row, 1)
+
+    def set_position(self, position):
+        self.array[self.owner.row] = position
+
+
+class PoseColumn:
+    """ Attribute backed by a two-wide store column. Assigning a Pose copies it into the row. """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, item, owner=None):
+        if item is None:
+            return self
+        if item.row is None:
+            return item.detached[self.name]
+        return item.views[self.name]
+
+    def __set__(self, item, pose):
+        if item.row is None:
+            item.detached[self.name] = pose
+        else:
+            item.views[self.name].array[item.row] = pose.get_position()
+
+
+class ScalarColumn:
+    """ Attribute backed by a one-wide store column. """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, item, owner=None):
+        if item is None:
+            return self
+        if item.row is None:
+            return item.detached[self.name]
+        return getattr(item.store, self.name).item(item.row)
+
+    def __set__(self, item, value):
+        if item.row is None:
+            item.detached[self.name] = value
+        else:
+            getattr(item.store, self.name)[item.row] = value
+
+
+class StoredEnemyMixin:
+    """
+    Makes an enemy a thin view over a row of its frame's EnemyStore. The frame runs the kinematic steps for the
+    whole store at once, between update_behaviour and update_collisions for every enemy.
+    """
+
+    row = None
+    store = None
+
+    position = PoseColumn("position")
+    velocity = PoseColumn("velocity")
+    target_position = PoseColumn("target_position")
+    target_velocity = PoseColumn("target_velocity")
+    radius = ScalarColumn("radius")
+    health = ScalarColumn("health")
+    max_speed = ScalarColumn("max_speed")
+    dead = ScalarColumn("dead")
+    arrived = ScalarColumn("arrived")
+
+    def __init__(self, frame, position=(0, 0)):
+        frame.enemy_store.add(self)
+        super().__init__(frame, position)
+
+
+class StoredEnemy(StoredEnemyMixin, Enemy):
+    pass
+
+
+class StoredFastEnemy(StoredEnemyMixin, FastEnemy):
+    pass
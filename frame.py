@@ -1,18 +1,35 @@
+import math
 import time
 
 import pygame
 
 from background import Background
+from bullet import Bullet
+from bullet_system import BulletSystem, StoredBullet
 from camera import Camera
 from delivery_menu import DeliveryMenu
+from depth_order import DepthOrder
+from ecs import AgentWorld, WorldEnemy, WorldFastEnemy
 from enemy import Enemy, FastEnemy
+from enemy_store import EnemyStore, StoredEnemy, StoredFastEnemy
 from gary import Gary
+from hud import Hud
 from image_manager import ImageManager
+from music_stream import MusicStems
+from particle import ParticleManager
 from phone import Phone
 from player import Player
-import random
+from preloader import Preloader
 import constants as c
 from primitives import Pose
+from profiler import Profiler
+from render_queue import RenderQueue
+from sound_manager import SoundManager
+from spatial_hash import SpatialHash
+from random_streams import RandomStreams
+from sweep import segment_circle_contact
+
+rng = RandomStreams.get("spawning")
 
 
 class Frame:
@@ -29,6 +46,14 @@ class Frame:
     def draw(self, surface, offset=(0, 0)):
         surface.fill((0, 0, 0))
 
+    def save_positions(self):
+        """ Remembers where things are before a fixed step, for draw_interpolated. """
+        pass
+
+    def draw_interpolated(self, surface, alpha, offset=(0, 0)):
+        """ Draws things alpha of the way from their saved positions to their current ones. """
+        self.draw(surface, offset)
+
     def next_frame(self):
         return Frame(self.game)
 
@@ -39,15 +64,31 @@ class GameFrame(Frame):
         pygame.mixer.set_num_channels(20)
         self.player = Player(self)
         self.bullets = []
-        self.particles = []
-        self.enemies = [Enemy(self, position=(random.random()*c.WINDOW_WIDTH, random.random()*c.WINDOW_HEIGHT)) for i in range(0)]
+        self.particles = ParticleManager()
+        self.enemy_grid = SpatialHash(c.COLLISION_CELL_SIZE)
+        self.agent_world = AgentWorld(c.AI_WORKERS) if c.ENTITY_AGENTS and AgentWorld.available() else None
+        self.enemy_store = None
+        if self.agent_world is None and c.VECTORIZED_ENEMIES and EnemyStore.available():
+            self.enemy_store = EnemyStore()
+        self.bullet_system = BulletSystem() if c.VECTORIZED_BULLETS and BulletSystem.available() else None
+        self.bullet_class = Bullet if self.bullet_system is None else StoredBullet  # What the player fires
+        self.enemies = [Enemy(self, position=(rng.random()*c.WINDOW_WIDTH, rng.random()*c.WINDOW_HEIGHT)) for i in range(0)]
+        self.depth_order = DepthOrder([self.player] + self.enemies)  # Player and enemies, by position.y
         Camera.init(self.player.position.get_position())
         self.vignette = ImageManager.load("assets/images/vignette.png")
         self.background = Background()
         self.phone = Phone(self, (128,0))
         Camera.snap_to_target()
         self.gary = Gary(self)
-        self.hud = ImageManager.load("assets/images/hud.png")
+        self.hud = Hud()
+        self.render_queue = RenderQueue(c.WINDOW_SIZE, (
+            ("particles_back", False),
+            ("shadows", True),
+            ("agents", True),
+            ("particles_front", False),
+            ("bullets", False),
+        ))
+        self.vignette_mask = None  # Opaque version of the vignette for a multiply blit, sized to the draw surface
 
         self.zombies_killed = 0
         self.bullets_fired = 0
@@ -59,52 +100,130 @@ class GameFrame(Frame):
         self.black_target_alpha = 0
         self.game_over = False
 
-        self.game_over_text_surf = ImageManager.load("assets/images/game_over.png")
         self.game_over_full_surf = None
         self.game_over_alpha = 0
         self.game_over_target_alpha = 0
 
         self.spawn_intensity = 0
+        self.previous_camera_position = None
 
         self.since_goomba = 0
 
         self.delivery = DeliveryMenu(self)
 
-        self.music = pygame.mixer.Sound("assets/sound/please_hold.ogg")
+        self.music_stems = MusicStems(c.MUSIC_STEMS) if c.STREAM_MUSIC and MusicStems.available() else None
+        if self.music_stems is not None:
+            self.music, self.full_music, self.groove = self.music_stems.stems
+        else:
+            self.music, self.full_music, self.groove = (SoundManager.load(path) for path in c.MUSIC_STEMS)
         self.music.set_volume(0)
-        self.music.play(-1)
         self.music_volume = 0
-        self.full_music = pygame.mixer.Sound("assets/sound/please_hold_full.ogg")
-        self.full_music.play(-1)
         self.full_music.set_volume(0)
         self.target_music_volume = 0
-        self.groove = pygame.mixer.Sound("assets/sound/groove.ogg")
         self.groove.set_volume(0.07)
-        self.groove.play(-1)
-
-        self.ammo_font = pygame.font.Font("assets/fonts/RPGSystem.ttf", 30)
-        self.ammo_chars = {char:self.ammo_font.render(char, 0, (255, 255, 255)) for char in "1234567890.-,∞"}
+        if self.music_stems is not None:
+            self.music_stems.play()
+        else:
+            for track in (self.music, self.full_music, self.groove):
+                track.play(-1)
 
     def spawn_goomba(self, elite_chance=0.12):
         elite = False
         if self.spawn_intensity >= 2:
-            elite = random.random()<elite_chance
+            elite = rng.random()<elite_chance
         okay = False
         while not okay:
-            x = random.random()*c.ARENA_WIDTH - c.ARENA_WIDTH//2
-            y = random.random()*c.ARENA_HEIGHT - c.ARENA_HEIGHT//2
+            x = rng.random()*c.ARENA_WIDTH - c.ARENA_WIDTH//2
+            y = rng.random()*c.ARENA_HEIGHT - c.ARENA_HEIGHT//2
             pos = Pose((x, y))
             diff = pos - self.player.position
             if diff.magnitude() > 256:
                 okay = True
-        if not elite:
-            new_enemy = Enemy(self, pos.get_position())
+        if self.agent_world is not None:
+            enemy_class = WorldFastEnemy if elite else WorldEnemy
+        elif self.enemy_store is not None:
+            enemy_class = StoredFastEnemy if elite else StoredEnemy
         else:
-            new_enemy = FastEnemy(self, pos.get_position())
+            enemy_class = FastEnemy if elite else Enemy
+        new_enemy = enemy_class(self, pos.get_position())
         self.enemies.append(new_enemy)
-        self.enemies.sort(key=lambda each: each.position.y)
+        self.depth_order.insert(new_enemy)
+        self.enemy_grid.insert(new_enemy)  # So seeking bullets can find it before the agents stage rebuilds the grid
         self.since_goomba = 0
 
+    def update_stored_agents(self, agents, dt, events):
+        """
+        Enemy.update in phases, so the kinematic steps run once for the whole EnemyStore. Each phase still walks
+        the agents in depth order, but an enemy now sees its neighbours before they move this tick, rather than
+        after, so runs differ slightly from the scalar path.
+        """
+        for agent in agents:
+            if agent.is_player:
+                agent.update(dt, events)
+            else:
+                agent.update_behaviour(dt, events)
+        self.enemy_store.update_speed(dt)
+        for agent in agents:
+            if not agent.is_player:
+                agent.update_collisions(dt)
+                self.enemy_grid.move(agent)
+        self.enemy_store.update_position(dt)
+        for agent in agents:
+            if agent.is_player:
+                continue
+            if agent.destroyed:
+                self.enemies.remove(agent)
+                self.enemy_grid.remove(agent)
+                self.enemy_store.remove(agent)
+                self.depth_order.discard(agent)
+            else:
+                self.enemy_grid.move(agent)
+
+    def update_world_agents(self, dt, events):
+        """
+        Enemy.update as the AgentWorld's systems, which handle every enemy at once. The player still updates on
+        its own, before the enemies rather than in depth order among them.
+        """
+        self.player.update(dt, events)
+        for enemy in self.agent_world.update(dt, self):
+            self.enemies.remove(enemy)
+            self.depth_order.discard(enemy)
+        enemies = [agent for agent in self.depth_order if not agent.is_player]
+        self.enemy_grid.rebuild_at(enemies, self.agent_world.cells(enemies, self.enemy_grid.cell_size))
+
+    def add_bullet(self, bullet):
+        self.bullets.append(bullet)
+
+    def collide_bullets(self, paths):
+        """
+        Sweeps each bullet along the path it took this tick, and hurts the enemies it passed through in the order
+        it reached them, until its pierce runs out. Checking the whole path means fast bullets can't skip over an
+        enemy between ticks. Enemies haven't moved yet this tick, so depth_order narrows them down by y exactly.
+
+        paths: sequence of (bullet, x, y), where (x, y) is where the bullet was at the start of the tick
+        """
+        if not paths or not self.enemies:
+            return
+        enemy_radius = max(enemy.radius for enemy in self.enemies)
+        for bullet, x, y in paths:
+            end_x, end_y = bullet.position.x, bullet.position.y
+            reach = bullet.radius + enemy_radius
+            min_x, max_x = min(x, end_x) - reach, max(x, end_x) + reach
+            dx, dy = end_x - x, end_y - y
+            hits = []
+            for enemy in self.depth_order.between(min(y, end_y) - reach, max(y, end_y) + reach):
+                if enemy.is_player or enemy.dead or not min_x <= enemy.position.x <= max_x:
+                    continue
+                t = segment_circle_contact(x, y, dx, dy, enemy.position.x, enemy.position.y,
+                                           bullet.radius + enemy.radius)
+                if t is not None:
+                    hits.append((t, len(hits), enemy))
+            hits.sort()
+            for t, i, enemy in hits:
+                if not bullet.can_hit(enemy):
+                    continue
+                enemy.get_hurt(bullet)
+
     def update_enemy_spawning(self, dt, events):
         self.since_goomba += dt
         if self.game_over:
@@ -142,7 +261,8 @@ class GameFrame(Frame):
         surf = pygame.Surface(c.WINDOW_SIZE)
         surf.fill((255, 255, 0))
         surf.set_colorkey((255, 255, 0))
-        surf.blit(self.game_over_text_surf, (surf.get_width()//2 - self.game_over_text_surf.get_width()//2, 235),special_flags=pygame.BLEND_ADD)
+        text_surf = ImageManager.load("assets/images/game_over.png")
+        surf.blit(text_surf, (surf.get_width()//2 - text_surf.get_width()//2, 235),special_flags=pygame.BLEND_ADD)
 
         zombies_text = self.gary.dialog_font.render(f"Zombies killed: {self.zombies_killed}",0,(255, 255, 255))
         surf.blit(zombies_text, (surf.get_width()//2 - zombies_text.get_width()//2, 300))
@@ -153,27 +273,65 @@ class GameFrame(Frame):
         return surf
 
     def update(self, dt, events):
+        start = Profiler.start()
         self.delivery.update(dt, events)
+        Profiler.stop("update.delivery", start)
         Camera.set_target(self.player.camera_target())
         Camera.update(dt, events)
+        start = Profiler.start()
         self.gary.update(dt, events)
+        Profiler.stop("update.gary", start)
         if self.delivery.blocking():
             dt = 0.00001
 
+        start = Profiler.start()
         self.update_enemy_spawning(dt, events)
-        agents = [self.player] + self.enemies
-        agents.sort(key=lambda agent: agent.position.y)
-        for bullet in self.bullets[:]:
-            bullet.update(dt, events)
-            if bullet.destroyed:
-                self.bullets.remove(bullet)
-        for agent in agents[:]:
-            agent.update(dt, events)
-            if agent.destroyed:
-                self.enemies.remove(agent)
-        for particle in self.particles[:]:
-            particle.update(dt, events)
+        Profiler.stop("update.spawning", start)
+        agents = self.depth_order.items  # Put in order at the end of last tick; nothing moves until the agents do
+        start = Profiler.start()
+        if self.bullet_system is not None:
+            self.bullet_system.update(dt, self)
+            self.bullets = self.bullet_system.items[:]
+        else:
+            paths = []  # (bullet, x, y) where each surviving bullet started the tick
+            for bullet in self.bullets[:]:
+                x, y = bullet.position.x, bullet.position.y
+                bullet.update(dt, events)
+                if bullet.destroyed:
+                    self.bullets.remove(bullet)
+                else:
+                    paths.append((bullet, x, y))
+        Profiler.stop("update.bullets", start)
+        start = Profiler.start()
+        if self.bullet_system is not None:
+            self.bullet_system.collide(self)
+        else:
+            self.collide_bullets(paths)
+        Profiler.stop("update.projectiles", start)
+        start = Profiler.start()
+        if self.agent_world is not None:
+            self.update_world_agents(dt, events)
+        elif self.enemy_store is not None:
+            self.enemy_grid.rebuild(agent for agent in agents if not agent.is_player)
+            self.update_stored_agents(agents, dt, events)
+        else:
+            self.enemy_grid.rebuild(agent for agent in agents if not agent.is_player)
+            for agent in agents:
+                agent.update(dt, events)
+                if agent.destroyed:
+                    self.enemies.remove(agent)
+                    self.enemy_grid.remove(agent)
+                    self.depth_order.discard(agent)
+                elif not agent.is_player:
+                    self.enemy_grid.move(agent)
+        self.depth_order.repair()
+        Profiler.stop("update.agents", start)
+        start = Profiler.start()
+        self.particles.update(dt, events)
+        Profiler.stop("update.particles", start)
+        start = Profiler.start()
         self.phone.update(dt, events)
+        Profiler.stop("update.phone", start)
 
         if self.black_alpha <= self.black_target_alpha:
             self.black_alpha += 250*dt
@@ -205,8 +363,7 @@ class GameFrame(Frame):
 
         self.background.update(dt, events)
 
-
-
+        start = Profiler.start()
         if self.music_volume < self.target_music_volume:
             self.music_volume += dt*4
             if self.music_volume > self.target_music_volume:
@@ -219,6 +376,48 @@ class GameFrame(Frame):
         full_music_target = max(self.delivery.lowered, self.gary.showing)
         self.full_music.set_volume(0.7*min(1 - self.music_volume, full_music_target))
         self.groove.set_volume(max(0, (1 - self.music_volume - full_music_target)*0.07))
+        if self.music_stems is not None:
+            self.music_stems.update()
+        Profiler.stop("update.audio", start)
+
+    def interpolated_objects(self):
+        return [self.player] + self.enemies + self.bullets + list(self.particles)
+
+    def save_positions(self):
+        for item in self.interpolated_objects():
+            item.previous_position = item.position.x, item.position.y
+        self.previous_camera_position = Camera.position.x, Camera.position.y
+
+    def draw_interpolated(self, surface, alpha, offset=(0, 0)):
+        if alpha >= 1 or self.previous_camera_position is None:
+            self.draw(surface, offset)
+            return
+
+        moved = []
+        for item in self.interpolated_objects():
+            if getattr(item, "previous_position", None) is None:
+                continue
+            x, y = item.position.x, item.position.y
+            previous_x, previous_y = item.previous_position
+            item.position.x = previous_x + (x - previous_x)*alpha
+            item.position.y = previous_y + (y - previous_y)*alpha
+            moved.append((item, x, y))
+        agents = [self.player] + self.enemies
+        sprite_positions = [(agent.sprite.x, agent.sprite.y) for agent in agents]
+        for agent in agents:
+            agent.sprite.set_position(agent.position.get_position())
+        camera_x, camera_y = Camera.position.x, Camera.position.y
+        previous_x, previous_y = self.previous_camera_position
+        Camera.position.x = previous_x + (camera_x - previous_x)*alpha
+        Camera.position.y = previous_y + (camera_y - previous_y)*alpha
+
+        self.draw(surface, offset)
+
+        Camera.position.x, Camera.position.y = camera_x, camera_y
+        for item, x, y in moved:
+            item.position.x, item.position.y = x, y
+        for agent, sprite_position in zip(agents, sprite_positions):
+            agent.sprite.set_position(sprite_position)
 
     def get_delivery(self):
         if not self.delivery.blocking():
@@ -228,34 +427,48 @@ class GameFrame(Frame):
         #surface.fill((0, 0, 0))
 
 
-        agents = [self.player] + self.enemies + [self.phone]
-        agents.sort(key=lambda agent: agent.position.y)
-
         offset = (Pose(offset) + Camera.get_draw_offset()).get_position()
+        size = surface.get_size()
+        queue = self.render_queue
+        queue.size = size
 
+        start = Profiler.start()
         self.background.draw(surface, offset)
-        for particle in self.particles:
-            if particle.layer == c.BACKGROUND:
-                particle.draw(surface, offset)
-        if self.player.rolling:
-            agents.remove(self.player)
-            agents.append(self.player)
-        for agent in agents:
-            agent.draw_shadow(surface, offset)
-        for agent in agents:
-            agent.draw(surface, offset)
-        for particle in self.particles:
-            if particle.layer == c.FOREGROUND:
-                particle.draw(surface, offset)
-        for bullet in self.bullets:
-            bullet.draw(surface, offset)
-        surface.blit(self.vignette, (0, 0))
+        Profiler.stop("draw.background", start)
+        start = Profiler.start()
+        queue.extend("particles_back", self.particles.blits(offset, size, c.BACKGROUND))
+        queue.extend("particles_front", self.particles.blits(offset, size, c.FOREGROUND))
+        Profiler.stop("draw.particles", start)
+        start = Profiler.start()
+        # Agents are queued in depth order already, so the queue's sort is a single pass
+        for agent in list(self.depth_order) + [self.phone]:
+            depth = agent.position.y
+            if agent is self.player and self.player.rolling:
+                depth = math.inf  # Rolling puts the player in front of everything
+            agent.draw_shadow(queue.at("shadows", depth), offset)
+            agent.draw(queue.at("agents", depth), offset)
+        Profiler.stop("draw.agents", start)
+        start = Profiler.start()
+        queue.extend("bullets", [bullet.blit_args(offset) for bullet in self.bullets])
+        Profiler.stop("draw.bullets", start)
+        start = Profiler.start()
+        queue.flush(surface)
+        Profiler.stop("draw.queue", start)
+        start = Profiler.start()
+        surface.blit(self.get_vignette_mask(surface.get_size()), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        Profiler.stop("draw.vignette", start)
+        start = Profiler.start()
         if self.gary.showing > 0:
             self.gary.draw(surface, offset)
+        Profiler.stop("draw.gary", start)
 
+        start = Profiler.start()
         self.draw_hud(surface, offset)
+        Profiler.stop("draw.hud", start)
 
+        start = Profiler.start()
         self.delivery.draw(surface, offset)
+        Profiler.stop("draw.delivery", start)
 
         if self.black_alpha > 0:
             self.black.set_alpha(self.black_alpha)
@@ -270,22 +483,50 @@ class GameFrame(Frame):
                     y = surface.get_height() - surf.get_height() - 25
                     surface.blit(surf, (x, y))
 
+    def get_vignette_mask(self, size):
+        """
+        The vignette is black with varying alpha, so blending it over white gives a grey mask that darkens the
+        screen the same way under BLEND_RGB_MULT, at about a third of the cost of a full screen alpha blit.
+        """
+        if self.vignette_mask is None or self.vignette_mask.get_size() != size:
+            vignette = self.vignette
+            if vignette.get_size() != size:
+                vignette = pygame.transform.smoothscale(vignette, size)
+            self.vignette_mask = pygame.Surface(size).convert()
+            self.vignette_mask.fill((255, 255, 255))
+            self.vignette_mask.blit(vignette, (0, 0))
+        return self.vignette_mask
+
     def draw_hud(self, surface, offset=(0, 0)):
-        surface.blit(self.hud, (0 ,0))
-
-        ammo_str = str(self.player.ammo)
-        if self.player.infinite_ammo:
-            ammo_str="99999999999999999999999999999999999999999999999999999999999999"
-        x = 40
-        y = 45
-        for char in ammo_str:
-            char_surf = self.ammo_chars[char]
-            surface.blit(char_surf, (x, y))
-            x += char_surf.get_width()
-
-        x = 16
-        y = 78
-        for i in range(self.player.health):
-            heart = ImageManager.load("assets/images/heart.png")
-            surface.blit(heart, (x, y))
-            x += heart.get_width() + 2
+        self.hud.draw(surface, self.player)
+
+
+class LoadingFrame(Frame):
+    """
+    Shown at launch while Preloader decodes what GameFrame needs, then hands over to a GameFrame.
+    """
+
+    def __init__(self, game):
+        super().__init__(game)
+        font = pygame.font.Font("assets/fonts/RPGSystem.ttf", 30)
+        self.text = font.render("Loading", 0, (255, 255, 255))
+        Preloader.start()
+
+    def update(self, dt, events):
+        if Preloader.poll():
+            self.done = True
+
+    def draw(self, surface, offset=(0, 0)):
+        surface.fill((0, 0, 0))
+        x = surface.get_width()//2 - self.text.get_width()//2
+        y = surface.get_height()//2 - self.text.get_height()
+        surface.blit(self.text, (x, y))
+        width = self.text.get_width()
+        y += self.text.get_height() + 8
+        pygame.draw.rect(surface, (80, 80, 80), (x, y, width, 4))
+        pygame.draw.rect(surface, (255, 255, 255), (x, y, int(width*Preloader.progress()), 4))
+
+    def next_frame(self):
+        frame = GameFrame(self.game)
+        Preloader.mark("GameFrame ready")
+        return frame
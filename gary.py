@@ -1,4 +1,3 @@
-import random
 import time
 
 import pygame
@@ -6,6 +5,10 @@ import pygame
 from image_manager import ImageManager
 import constants as c
 from sound_manager import SoundManager
+from text_layout import TextLayout
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("dialog")
 
 
 class Gary:
@@ -21,6 +24,8 @@ class Gary:
         self.red_letters = {letter: self.dialog_font.render(letter, 1, (0, 255, 120)) for letter in
                         "1234567890ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'.,?!|- ()"}
 
+        self.layout = None  # TextLayout of the current line
+
         self.back = pygame.Surface((c.WINDOW_WIDTH, 150))
         self.back.fill((0, 0, 0))
         self.back.set_alpha(0)
@@ -149,57 +154,36 @@ class Gary:
     def restart_line(self):
         self.since_start_line = 0
         if not self.lines or self.lines[0] not in c.DISCONNECT_LINES:
-            self.lines = [random.choice(c.DISCONNECT_LINES)] + (self.lines if self.lines else [])
+            self.lines = [rng.choice(c.DISCONNECT_LINES)] + (self.lines if self.lines else [])
 
     def draw(self, surface, offset=(0, 0)):
 
         self.back.set_alpha(self.showing*160)
-        surface.blit(self.back, (0, c.WINDOW_HEIGHT - self.back.get_height()))
+        surface.blit(self.back, (0, surface.get_height() - self.back.get_height()))
 
-        cps = c.CPS
-        chars_showing = self.since_start_line * cps
-        text = self.current_line()
-        words = text.split() if text else []
-        max_width = 400
-        x0 = 300
-        y0 = 480
-        x = x0
-        y = y0
-        drawn = 0
-        for word in words:
-            width = sum([self.letters[letter].get_width() for letter in word])
-            if x + width > x0 + max_width:
-                x = x0
-                y += 26
-            red = False
-            for letter in word:
-                if letter == "|":
-                    red = True
-                    continue
-                self.letters[letter].set_alpha(255 * self.showing)
-                if not red:
-                    surface.blit(self.letters[letter], (x, y))
-                else:
-                    surface.blit(self.red_letters[letter], (x, y))
-                drawn += 1
-                x += self.letters[letter].get_width()
-                if drawn >= chars_showing:
-                    break
-            if drawn >= chars_showing:
-                break
-            x += self.letters[" "].get_width()
-            drawn += 1
+        self.draw_line(surface)
 
         surf = self.spacebar
-        x = c.WINDOW_WIDTH - surf.get_width() - 25
-        y = c.WINDOW_HEIGHT - surf.get_height() - 25
+        x = surface.get_width() - surf.get_width() - 25
+        y = surface.get_height() - surf.get_height() - 25
         if self.ready_for_next_line() and time.time()%1 < 0.75:
             surface.blit(surf, (x, y))
 
         x = -self.gary_surf.get_width() + self.gary_surf.get_width()*self.showing**0.5
-        y = c.WINDOW_HEIGHT - self.gary_surf.get_height()
+        y = surface.get_height() - self.gary_surf.get_height()
         surface.blit(self.gary_surf, (x, y))
 
+    def draw_line(self, surface):
+        """ Draws as much of the current line as has been revealed, laying it out the first time. """
+        cps = c.CPS
+        chars_showing = self.since_start_line * cps
+        text = self.current_line()
+        if not text:
+            return
+        if self.layout is None or self.layout.text != text:
+            self.layout = TextLayout(text, self.letters, self.red_letters, 400, 26)
+        self.layout.draw(surface, (300, surface.get_height() - 120), chars_showing, 255 * self.showing)
+
     def current_line(self):
         if not self.lines:
             return None
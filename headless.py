@@ -0,0 +1,158 @@
+"""
+Runs the game simulation with no window, no audio and scripted input, as fast as the CPU allows. Nothing is drawn
+and nothing sleeps, so this is for soak tests and benchmarks rather than playing.
+
+Usage: python headless.py [--seed N] [--duration SECONDS] [--script FILE] [--god-mode] [--spawn-intensity N]
+                           [--profile-csv FILE]
+
+A script is a JSON list of entries, applied once the simulation reaches their time (in seconds). Every field other
+than time is optional, and held keys and mouse state persist until a later entry changes them:
+
+    [
+        {"time": 0, "keys": ["w", "d"], "mouse_pos": [600, 300], "mouse_pressed": [1, 0, 0]},
+        {"time": 2.5, "keys": [], "press": ["space"]},
+        {"time": 4, "click": [400, 320]}
+    ]
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+import constants as c
+from display import Display
+from image_manager import ImageManager
+from input_manager import InputManager, ScriptedInput
+from profiler import Profiler
+from random_streams import RandomStreams
+from sound_manager import SoundManager
+
+
+class InputScript:
+    """
+    A list of timed input changes, fed into a ScriptedInput as the simulation clock passes them.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = sorted(entries, key=lambda entry: entry["time"])
+        self.next_entry = 0
+
+    @staticmethod
+    def load(path):
+        with open(path) as file:
+            return InputScript(json.load(file))
+
+    def advance(self, now, scripted_input):
+        """
+        Applies every entry up to time now to scripted_input, and returns the pygame events they produce.
+        """
+        events = []
+        while self.next_entry < len(self.entries) and self.entries[self.next_entry]["time"] <= now:
+            entry = self.entries[self.next_entry]
+            self.next_entry += 1
+            keys = entry.get("keys")
+            if keys is not None:
+                keys = [pygame.key.key_code(name) for name in keys]
+            scripted_input.set_state(entry.get("mouse_pos"), entry.get("mouse_pressed"), keys)
+            for name in entry.get("press", ()):
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.key.key_code(name)))
+            if "click" in entry:
+                pos = tuple(entry["click"])
+                scripted_input.set_state(mouse_pos=pos)
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=pos))
+        return events
+
+
+def init():
+    """
+    Starts pygame with dummy video and audio drivers. Surfaces still work, they just never reach a screen.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    pygame.mixer.set_num_channels(12)
+    SoundManager.init()
+    ImageManager.init()
+    Display.init()
+
+
+def run(seed=0, duration=60, script=None, god_mode=False, spawn_intensity=None, dt=None):
+    """
+    Simulates duration seconds of game time with fixed steps of dt, and returns a dictionary of results.
+    """
+    import frame as f
+
+    if not pygame.get_init():
+        init()
+    dt = dt if dt is not None else 1/c.SIMULATION_RATE
+    script = script if script is not None else InputScript()
+    scripted_input = ScriptedInput()
+    InputManager.set_provider(scripted_input)
+    RandomStreams.seed(seed)
+
+    frame = f.GameFrame(None)
+    frame.load()
+    if god_mode:
+        frame.player.god_mode()
+    if spawn_intensity is not None:
+        frame.spawn_intensity = spawn_intensity
+
+    total_ticks = round(duration/dt)
+    ticks = 0
+    now = 0
+    most_enemies = 0
+    start = time.perf_counter()
+    while ticks < total_ticks:
+        events = script.advance(now, scripted_input)
+        frame.update(dt, events)
+        Profiler.end_frame()
+        ticks += 1
+        now = ticks*dt
+        most_enemies = max(most_enemies, len(frame.enemies))
+        if frame.done:
+            frame = frame.next_frame()
+            frame.load()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": ticks,
+        "simulated_seconds": now,
+        "wall_seconds": elapsed,
+        "ticks_per_second": ticks/elapsed if elapsed else 0,
+        "zombies_killed": frame.zombies_killed,
+        "bullets_fired": frame.bullets_fired,
+        "most_enemies": most_enemies,
+        "frame": frame,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game simulation headless, as fast as possible.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=60, help="simulated seconds to run")
+    parser.add_argument("--script", help="JSON input script to play back")
+    parser.add_argument("--god-mode", action="store_true", help="start with every upgrade and infinite ammo")
+    parser.add_argument("--spawn-intensity", type=float, help="start at this spawn intensity")
+    parser.add_argument("--profile-csv", help="write per-tick stage timings to a CSV file")
+    args = parser.parse_args()
+
+    script = InputScript.load(args.script) if args.script else None
+    if args.profile_csv:
+        Profiler.open_csv(args.profile_csv)
+    try:
+        results = run(args.seed, args.duration, script, args.god_mode, args.spawn_intensity)
+    finally:
+        Profiler.close_csv()
+    print(f"{results['ticks']} ticks ({results['simulated_seconds']:.1f}s simulated) "
+          f"in {results['wall_seconds']:.2f}s: {results['ticks_per_second']:.0f} ticks/sec")
+    print(f"{results['zombies_killed']} zombies killed, {results['bullets_fired']} bullets fired, "
+          f"at most {results['most_enemies']} enemies")
+
+
+if __name__ == "__main__":
+    main()
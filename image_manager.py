@@ -38,6 +38,14 @@ class ImageManager:
         ImageManager.check_initialized()
         ImageManager.sounds = {}
 
+    @staticmethod
+    def has(path):
+        """
+        Whether path is already loaded, so load(path) won't have to read the file.
+        """
+        ImageManager.check_initialized()
+        return path in ImageManager.sounds
+
     @staticmethod
     def load(path):
         """
@@ -52,6 +60,14 @@ class ImageManager:
         ImageManager.sounds[path] = sound
         return sound
 
+    @staticmethod
+    def put(path, surface):
+        """
+        Caches an already loaded surface, so load(path) returns it instead of reading the file.
+        """
+        ImageManager.check_initialized()
+        ImageManager.sounds[path] = surface
+
     @staticmethod
     def load_copy(path):
         return ImageManager.load(path).copy()
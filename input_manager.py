@@ -0,0 +1,94 @@
+import pygame
+
+from display import Display
+
+
+class PygameInput:
+    """
+    Reads input straight from pygame. This is what the game uses normally.
+
+    pygame only updates the mouse position when events are pumped, so it's read once a frame and shared, rather
+    than converted to render coordinates every time a button or the player asks.
+    """
+
+    mouse_pos = None
+
+    @staticmethod
+    def refresh():
+        """ Forgets the mouse position, so it's read again. Call once a frame, after pumping events. """
+        PygameInput.mouse_pos = None
+
+    def get_mouse_pos(self):
+        if PygameInput.mouse_pos is None:
+            PygameInput.mouse_pos = Display.window_to_render(pygame.mouse.get_pos())
+        return PygameInput.mouse_pos
+
+    def get_mouse_pressed(self):
+        return pygame.mouse.get_pressed()
+
+    def get_keys_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class KeysPressed:
+    """
+    Stands in for the result of pygame.key.get_pressed(), for a given set of held keys.
+    """
+
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class ScriptedInput:
+    """
+    Input whose state is set by code rather than read from devices, e.g. for headless runs and replays.
+    """
+
+    def __init__(self):
+        self.mouse_pos = (0, 0)
+        self.mouse_pressed = (False, False, False)
+        self.keys_pressed = KeysPressed()
+
+    def set_state(self, mouse_pos=None, mouse_pressed=None, keys=None):
+        if mouse_pos is not None:
+            self.mouse_pos = tuple(mouse_pos)
+        if mouse_pressed is not None:
+            self.mouse_pressed = tuple(bool(button) for button in mouse_pressed)
+        if keys is not None:
+            self.keys_pressed = KeysPressed(keys)
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def get_mouse_pressed(self):
+        return self.mouse_pressed
+
+    def get_keys_pressed(self):
+        return self.keys_pressed
+
+
+class InputManager:
+    """
+    Static class that the game polls for mouse and keyboard state, so the source of that state can be swapped out.
+    """
+
+    provider = PygameInput()
+
+    @staticmethod
+    def set_provider(provider):
+        InputManager.provider = provider
+
+    @staticmethod
+    def get_mouse_pos():
+        return InputManager.provider.get_mouse_pos()
+
+    @staticmethod
+    def get_mouse_pressed():
+        return InputManager.provider.get_mouse_pressed()
+
+    @staticmethod
+    def get_keys_pressed():
+        return InputManager.provider.get_keys_pressed()
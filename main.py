@@ -1,27 +1,83 @@
+import time
+
+STARTED = time.perf_counter()  # Before the imports below, so the startup timings include them
+
 import pygame
 
 import constants as c
 import frame as f
 import sys
+from asset_cache import AssetCache
+from display import Display
 from sound_manager import SoundManager
 from image_manager import ImageManager
+from input_manager import PygameInput
+from preloader import Preloader
+from timestep import FixedTimestep
+from profiler import Profiler
 import asyncio
+import argparse
+import random
+
+from random_streams import RandomStreams
 
 class Game:
-    def __init__(self):
+    def __init__(self, record_path=None, seed=None, profile_csv=None, startup_report=False):
+        Preloader.begin(STARTED)
+        Preloader.mark("imports")
+        Preloader.print_report = startup_report
         pygame.init()
         pygame.mixer.set_num_channels(12)
         SoundManager.init()
         ImageManager.init()
-        self.screen = pygame.display.set_mode(c.WINDOW_SIZE)
+        Display.init()
+        AssetCache.load()
+        Preloader.mark("display and atlas")
         pygame.display.set_caption(c.CAPTION)
         self.clock = pygame.time.Clock()
         self.windowed = False
         self.clicked = False
-        asyncio.run(self.main())
+        self.timestep = FixedTimestep(c.SIMULATION_RATE, c.MAX_STEPS_PER_FRAME, c.MAX_SKIPPED_RENDERS)
+        self.pending_events = []
+        self.since_caption = 999
+
+        self.recorder = None
+        if record_path is not None or seed is not None:
+            if seed is None:
+                seed = random.randrange(2**62)
+            RandomStreams.seed(seed)
+        if record_path is not None:
+            from replay import Recorder  # Only needed when recording
+            self.recorder = Recorder(record_path, seed)
+        if profile_csv is not None:
+            Profiler.open_csv(profile_csv)
+        try:
+            asyncio.run(self.main())
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+            Profiler.close_csv()
+
+    async def load_game(self):
+        """
+        Shows a LoadingFrame until the assets a GameFrame needs have been decoded, and returns the GameFrame.
+        Nothing is recorded or simulated until then.
+        """
+        loading_frame = f.LoadingFrame(self)
+        drawn = False
+        while not loading_frame.done:
+            dt, events = self.get_events()
+            loading_frame.update(dt, events)
+            loading_frame.draw(Display.render_surface)
+            Display.present()
+            if not drawn:
+                drawn = True
+                Preloader.mark("first frame")
+            await asyncio.sleep(0)
+        return loading_frame.next_frame()
 
     async def main(self):
-        current_frame = f.GameFrame(self)
+        current_frame = await self.load_game()
         current_frame.load()
         self.clock.tick(60)
 
@@ -32,20 +88,60 @@ class Game:
 
         while True:
             dt, events = self.get_events()
+            Preloader.poll()  # Picks up the deferred assets as they finish
             await asyncio.sleep(0)
             if dt == 0:
                 dt = 1/100000
-            pygame.display.set_caption(f"{c.CAPTION} ({int(1/dt)} FPS)")
+            self.update_caption(dt)
+            if c.FIXED_TIMESTEP:
+                current_frame = self.fixed_step(current_frame, dt, events)
+                Profiler.end_frame()
+                continue
             if dt > 0.05:
                 dt = 0.05
-            current_frame.update(dt, events)
-            current_frame.draw(self.screen, (0, 0))
-            pygame.display.flip()
+            self.simulate(current_frame, dt, events)
+            current_frame.draw(Display.render_surface, (0, 0))
+            Profiler.draw_overlay(Display.render_surface, dt)
+            Display.present()
+            Profiler.end_frame()
 
             if current_frame.done:
                 current_frame = current_frame.next_frame()
                 current_frame.load()
 
+    def update_caption(self, dt):
+        # Setting the caption isn't free, so only refresh the FPS readout a couple times a second
+        self.since_caption += dt
+        if self.since_caption >= 0.5:
+            self.since_caption = 0
+            pygame.display.set_caption(f"{c.CAPTION} ({int(1/dt)} FPS)")
+
+    def simulate(self, current_frame, dt, events):
+        if self.recorder is not None:
+            self.recorder.capture(dt, events, current_frame)
+        current_frame.update(dt, events)
+
+    def fixed_step(self, current_frame, dt, events):
+        """
+        Runs as many fixed-length simulation steps as this frame's time allows, then draws the frame interpolated
+        between the last two steps. Returns the frame to use next.
+        """
+        self.pending_events += events  # Events arriving between steps wait for the next one
+        for i in range(self.timestep.advance(dt)):
+            current_frame.save_positions()
+            events, self.pending_events = self.pending_events, []
+            self.simulate(current_frame, self.timestep.step, events)
+            if current_frame.done:
+                current_frame = current_frame.next_frame()
+                current_frame.load()
+                return current_frame
+
+        if self.timestep.should_render():
+            current_frame.draw_interpolated(Display.render_surface, self.timestep.alpha())
+            Profiler.draw_overlay(Display.render_surface, dt)
+            Display.present()
+        return current_frame
+
     def get_events(self):
         dt = self.clock.tick(c.FRAMERATE)/1000
 
@@ -56,7 +152,10 @@ class Game:
                 sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_F4:
-                    pygame.display.toggle_fullscreen()
+                    Display.toggle_fullscreen()
+                if event.key == pygame.K_F3:
+                    Profiler.toggle_overlay()
+        PygameInput.refresh()
 
         pressed = pygame.mouse.get_pressed()
         try:
@@ -73,4 +172,10 @@ class Game:
 
 
 if __name__=="__main__":
-    Game()
+    parser = argparse.ArgumentParser(description=c.CAPTION)
+    parser.add_argument("--record", help="record this session's input to a file, for replay.py")
+    parser.add_argument("--seed", type=int, help="seed for the game's random streams")
+    parser.add_argument("--profile-csv", help="write per-frame stage timings to a CSV file")
+    parser.add_argument("--startup-report", action="store_true", help="print how long each asset took to load")
+    args = parser.parse_args()
+    Game(args.record, args.seed, args.profile_csv, args.startup_report)
@@ -0,0 +1,196 @@
+import ctypes
+import ctypes.util
+import glob
+import os
+import sys
+
+import pygame
+
+
+class VorbisInfo(ctypes.Structure):
+    _fields_ = [("version", ctypes.c_int), ("channels", ctypes.c_int), ("rate", ctypes.c_long)]
+
+
+class VorbisFile:
+    """
+    Reads an OGG file a chunk of 16 bit PCM at a time through libvorbisfile, looping back to the start at the end.
+    """
+
+    library = None
+    searched = False
+    hole = -3  # OV_HOLE
+    state_size = 4096  # Bytes for an OggVorbis_File, which is under 1 KB on every platform libvorbisfile supports
+
+    @staticmethod
+    def find_library():
+        """
+        Returns libvorbisfile, or None if there isn't one. pygame's wheels come with a copy, next to SDL_mixer, which
+        links its dependencies by name, so this has to run after pygame.mixer.init() has loaded them.
+        """
+        if VorbisFile.searched:
+            return VorbisFile.library
+        VorbisFile.searched = True
+        base = os.path.dirname(pygame.__file__)
+        candidates = [ctypes.util.find_library("vorbisfile")]
+        for pattern in ("../pygame.libs/libvorbisfile*", ".dylibs/libvorbisfile*", "libvorbisfile*.dll"):
+            candidates += sorted(glob.glob(os.path.join(base, pattern)))
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            try:
+                library = ctypes.CDLL(candidate)
+            except OSError:
+                continue
+            library.ov_fopen.argtypes = [ctypes.c_char_p, ctypes.c_void_p]
+            library.ov_info.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            library.ov_info.restype = ctypes.POINTER(VorbisInfo)
+            library.ov_read.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                        ctypes.c_int, ctypes.c_void_p]
+            library.ov_read.restype = ctypes.c_long
+            library.ov_pcm_seek.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+            library.ov_clear.argtypes = [ctypes.c_void_p]
+            VorbisFile.library = library
+            break
+        return VorbisFile.library
+
+    def __init__(self, path):
+        self.library = VorbisFile.find_library()
+        self.state = ctypes.create_string_buffer(VorbisFile.state_size)
+        if self.library.ov_fopen(os.fsencode(path), self.state) != 0:
+            self.state = None
+            raise ValueError(f"{path} isn't an OGG Vorbis file")
+        info = self.library.ov_info(self.state, -1).contents
+        self.rate = info.rate
+        self.channels = info.channels
+        self.big_endian = int(sys.byteorder == "big")
+
+    def read_into(self, buffer):
+        """ Fills buffer (a ctypes char array) with PCM, looping at the end of the file. """
+        address = ctypes.addressof(buffer)
+        filled = 0
+        size = len(buffer)
+        while filled < size:
+            read = self.library.ov_read(self.state, address + filled, size - filled, self.big_endian, 2, 1, None)
+            if read == 0:
+                self.library.ov_pcm_seek(self.state, 0)
+            elif read == VorbisFile.hole:  # A gap in the data, which the next read carries on after
+                continue
+            elif read < 0:
+                ctypes.memset(address + filled, 0, size - filled)
+                return
+            filled += read
+
+    def close(self):
+        if self.state is not None:
+            self.library.ov_clear(self.state)
+            self.state = None
+
+    def __del__(self):
+        self.close()
+
+
+class MusicStem:
+    """
+    One track of a MusicStems, with the part of the pygame.mixer.Sound interface GameFrame uses for music.
+    """
+
+    def __init__(self, path, chunk_size):
+        self.file = VorbisFile(path)
+        frequency, size, channels = pygame.mixer.get_init()
+        if (self.file.rate, self.file.channels) != (frequency, channels):
+            self.file.close()
+            raise ValueError(f"{path} is {self.file.rate} Hz with {self.file.channels} channels, but the mixer isn't")
+        self.buffer = ctypes.create_string_buffer(chunk_size)
+        self.chunks_read = 0
+        self.channel = None
+        self.volume = 1
+
+    def next_chunk(self):
+        self.file.read_into(self.buffer)
+        self.chunks_read += 1
+        return pygame.mixer.Sound(buffer=memoryview(self.buffer))
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.channel is not None:
+            self.channel.set_volume(volume)
+
+    def fadeout(self, time):
+        """ Fades out over time milliseconds, and stops streaming. """
+        if self.channel is None:
+            return
+        # A queued chunk would start at full volume once the fade finishes, so queue a moment of silence over it
+        self.channel.queue(MusicStems.silence())
+        self.channel.fadeout(time)
+        self.channel = None
+
+
+class MusicStems:
+    """
+    Plays several looping tracks in sync, decoding them a chunk at a time rather than all at once, for layered music
+    that crossfades with each stem's set_volume.
+
+    Each stem gets a reserved mixer channel with one chunk queued behind the one playing, and update() decodes the
+    next chunk for each stem whose queue has emptied. Every chunk is the same length for every stem, so the stems
+    stay lined up. If they ever run dry (the game stalled for longer than a chunk), they restart together.
+    """
+
+    chunk_seconds = 0.5
+    reserved_channels = 6  # Enough for one set of stems to fade out while the next starts
+    silent = None
+
+    @staticmethod
+    def available():
+        """ Whether stems can stream: libvorbisfile is around, and the mixer takes signed 16 bit samples. """
+        init = pygame.mixer.get_init()
+        return init is not None and init[1] == -16 and VorbisFile.find_library() is not None
+
+    @staticmethod
+    def silence():
+        if MusicStems.silent is None:
+            MusicStems.silent = pygame.mixer.Sound(buffer=bytes(64))
+        return MusicStems.silent
+
+    def __init__(self, paths):
+        frequency, size, channels = pygame.mixer.get_init()
+        chunk_size = int(frequency*MusicStems.chunk_seconds)*channels*2
+        self.stems = [MusicStem(path, chunk_size) for path in paths]
+        self.playing = False
+        self.next_refill = 0  # Which stem to check first next update, so refills spread over frames
+
+    def play(self):
+        """ Starts every stem from the start of its next chunk, on channels that aren't busy if there are any. """
+        pygame.mixer.set_reserved(MusicStems.reserved_channels)
+        channels = [pygame.mixer.Channel(i) for i in range(MusicStems.reserved_channels)]
+        channels.sort(key=lambda channel: channel.get_busy())
+        furthest = max(stem.chunks_read for stem in self.stems)
+        for stem in self.stems:
+            while stem.chunks_read < furthest:  # Some may have queued a chunk the others hadn't yet
+                stem.next_chunk()
+        chunks = [stem.next_chunk() for stem in self.stems]
+        for stem, channel, chunk in zip(self.stems, channels, chunks):
+            stem.channel = channel
+            channel.play(chunk)
+            channel.set_volume(stem.volume)
+        self.playing = True
+
+    def update(self):
+        """ Queues the next chunk for stems that need one. Call every frame. """
+        if not self.playing:
+            return
+        stems = self.stems
+        for stem in stems:
+            if not stem.channel.get_busy():
+                self.play()
+                return
+        for i in range(len(stems)):
+            stem = stems[(self.next_refill + i) % len(stems)]
+            if stem.channel.get_queue() is None:
+                stem.channel.queue(stem.next_chunk())
+                self.next_refill = (self.next_refill + i + 1) % len(stems)
+                return  # One a frame is plenty, since each has a whole chunk's time to refill
+
+    def fadeout(self, time):
+        for stem in self.stems:
+            stem.fadeout(time)
+        self.playing = False
@@ -1,10 +1,13 @@
 from image_manager import ImageManager
 from primitives import Pose
-import random
+from rotation_cache import RotationCache
 import math
 import pygame
 import constants as c
 from pyracy.sprite_tools import Sprite, Animation
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("particles")
 
 
 class Particle:
@@ -16,6 +19,7 @@ class Particle:
         self.duration = duration
         self.age = 0
         self.layer = c.BACKGROUND
+        self.previous_position = None
 
     def update(self, dt, events):
         if self.destroyed:
@@ -25,9 +29,14 @@ class Particle:
             self.destroy()
         self.age += dt
 
-    def draw(self, surf, offset=(0, 0)):
-        if self.destroyed:
-            return
+    def draw(self, surface, offset=(0, 0)):
+        blit = self.blit_args(offset, surface.get_size())
+        if blit is not None:
+            surface.blit(*blit)
+
+    def blit_args(self, offset, size):
+        """ Returns the (surface, position) to blit for this particle, or None if nothing should be drawn. """
+        return None
 
     def through(self):
         return min(0.999, self.age/self.duration)
@@ -43,8 +52,7 @@ class SparkParticle(Particle):
         if velocity is None:
             velocity = Pose((1, 0))
         self.angle = velocity.get_angle_of_position()*180/math.pi
-        self.angle_pos = velocity
-        self.angle_pos.scale_to(1)
+        self.angle_pos = velocity.normalize_inplace()
         super().__init__(position, velocity=(0, 0),duration=duration)
         if SparkParticle.img==None:
             SparkParticle.img=ImageManager.load("assets/images/flash.png")
@@ -70,25 +78,30 @@ class SparkParticle(Particle):
         frame = min(int(self.age*scale), 4)
         return SparkParticle.frames[frame]
 
-    def draw(self, surface, offset=(0, 0)):
+    def blit_args(self, offset, size):
         if self.destroyed:
-            return
+            return None
 
         surf = self.get_frame_cached()
-        surf = pygame.transform.rotate(surf, self.angle)
-        pos = self.position + Pose(offset) - Pose((surf.get_width()//2, surf.get_height()//2)) + self.angle_pos*15
-        surface.blit(surf, pos.get_position())
+        surf = RotationCache.rotate(surf, self.angle)
+        x = self.position.x + offset[0] - surf.get_width()//2 + self.angle_pos.x*15
+        y = self.position.y + offset[1] - surf.get_height()//2 + self.angle_pos.y*15
+        return surf, (x, y)
 
 class Poof(Particle):
+    scale_steps = 16
+    angle_steps = 64
+    table = None  # table[scale_step][angle_step] is the poof image at that scale and rotation
+
     def __init__(self, position=(0, 0), duration = 0.4):
-        velocity_angle = random.random()*360
-        velocity_magnitude = random.random()*200 + 300
+        velocity_angle = rng.random()*360
+        velocity_magnitude = rng.random()*200 + 300
         velocity = Pose((velocity_magnitude, 0))
         velocity.rotate_position(velocity_angle)
         super().__init__(position=position, velocity=velocity.get_position(), duration=duration)
         self.poof = ImageManager.load("assets/images/poof.png")
-        self.angle = random.random()*360
-        self.spin = random.random()*60 - 30
+        self.angle = rng.random()*360
+        self.spin = rng.random()*60 - 30
 
     def update(self, dt, events):
         super().update(dt, events)
@@ -96,24 +109,123 @@ class Poof(Particle):
         self.velocity.y *= 0.001**dt
         self.angle += self.spin*dt
 
-    def draw(self, surface, offset=(0, 0)):
+    @staticmethod
+    def build_table(poof):
+        """
+        Pre-renders the poof image at every quantized scale (0 to 2) and angle, so drawing doesn't have to
+        scale, rotate or copy anything.
+        """
+        table = []
+        for scale_step in range(Poof.scale_steps):
+            scale = 2*scale_step/(Poof.scale_steps - 1)
+            scaled = pygame.transform.scale(poof, (poof.get_width()*scale, poof.get_height()*scale))
+            row = []
+            for angle_step in range(Poof.angle_steps):
+                surf = pygame.transform.rotate(scaled, angle_step*360/Poof.angle_steps)
+                surf.set_alpha(255)
+                row.append(surf)
+            table.append(row)
+        Poof.table = table
+
+    def get_surf(self):
+        if Poof.table is None:
+            Poof.build_table(self.poof)
+        scale = 2 - 2*self.through()
+        scale_step = round(scale*(Poof.scale_steps - 1)/2)
+        angle_step = round(self.angle*Poof.angle_steps/360) % Poof.angle_steps
+        return Poof.table[scale_step][angle_step]
+
+    def blit_args(self, offset, size):
         if self.destroyed:
-            return
+            return None
         x = self.position.x + offset[0]
         y = self.position.y + offset[1]
-        if x < -100 or x > c.WINDOW_WIDTH + 100:
-            return
-        if y < -100 or y > c.WINDOW_HEIGHT + 100:
-            return
+        if x < -100 or x > size[0] + 100:
+            return None
+        if y < -100 or y > size[1] + 100:
+            return None
 
-        scale = 2 - 2*self.through()
-        surf = pygame.transform.scale(self.poof, (self.poof.get_width()*scale, self.poof.get_height()*scale))
-        surf = pygame.transform.rotate(surf, self.angle)
+        surf = self.get_surf()
         x -= surf.get_width()//2
         y -= surf.get_height()//2
+        return surf, (x, y)
+
+class ParticleManager:
+    """
+    Owns every live particle, stored per draw layer, and recycles destroyed particles instead of letting them pile up.
+
+    Destroyed particles are compacted out of their layer during update (keeping draw order), and go into a pool
+    for their class so the next spawn can reuse the object.
+    """
+
+    max_pool_size = 512
+
+    def __init__(self):
+        self.layers = {c.BACKGROUND: [], c.FOREGROUND: []}
+        self.pools = {}  # Maps particle class to a list of destroyed particles ready for reuse
+        self.spawned = 0
+        self.recycled = 0
+
+    def spawn(self, particle_class, *args, **kwargs):
+        """
+        Creates a particle of the given class, reusing a destroyed one if possible, and adds it to its layer.
+
+        particle_class: Particle subclass to spawn
+        args, kwargs: arguments for the particle's initializer
+        """
+        pool = self.pools.get(particle_class)
+        if pool:
+            particle = pool.pop()
+            particle.__init__(*args, **kwargs)
+            self.recycled += 1
+        else:
+            particle = particle_class(*args, **kwargs)
+        self.spawned += 1
+        self.add(particle)
+        return particle
+
+    def add(self, particle):
+        self.layers[particle.layer].append(particle)
 
-        a = 128*(1 - self.through()**1.5)
-        a = 256
-        surf.set_alpha(a)
-
-        surface.blit(surf, (x, y))
\ No newline at end of file
+    def update(self, dt, events):
+        for layer in self.layers.values():
+            alive = 0
+            for i in range(len(layer)):
+                particle = layer[i]
+                particle.update(dt, events)
+                if particle.destroyed:
+                    self.release(particle)
+                    continue
+                layer[alive] = particle
+                alive += 1
+            del layer[alive:]
+
+    def release(self, particle):
+        pool = self.pools.setdefault(type(particle), [])
+        if len(pool) < self.max_pool_size:
+            pool.append(particle)
+
+    def draw(self, surface, offset=(0, 0), layer=c.BACKGROUND):
+        for particle in self.layers[layer]:
+            particle.draw(surface, offset)
+
+    def blits(self, offset, size, layer=c.BACKGROUND):
+        """ Returns the (surface, position) blits for every visible particle on a layer, for a RenderQueue. """
+        blits = [particle.blit_args(offset, size) for particle in self.layers[layer]]
+        return [blit for blit in blits if blit is not None]
+
+    def clear(self):
+        for layer in self.layers.values():
+            for particle in layer:
+                self.release(particle)
+            layer.clear()
+
+    def pooled(self):
+        return sum(len(pool) for pool in self.pools.values())
+
+    def __len__(self):
+        return sum(len(layer) for layer in self.layers.values())
+
+    def __iter__(self):
+        for layer in self.layers.values():
+            yield from layer
@@ -1,21 +1,24 @@
-from bullet import Bullet
 from image_manager import ImageManager
+from input_manager import InputManager
 from particle import SparkParticle, Poof
 from pyracy.sprite_tools import Sprite, Animation
 from primitives import Pose
+from rotation_cache import RotationCache
 import pygame
 import constants as c
 import math
 from camera import Camera
-import random
 from sound_manager import SoundManager
+from random_streams import RandomStreams
+
+rng = RandomStreams.get("player")
 
 class Player:
 
     def __init__(self, frame):
         self.frame = frame
         self.position = Pose((-96, 0))
-        Camera.position = self.position.copy() - Pose(c.WINDOW_SIZE)*0.5
+        Camera.position = self.position.copy() - Pose(Camera.view_size)*0.5
         self.velocity = Pose((0, 0))
         self.sprite = Sprite(12, (0, 0))
 
@@ -144,7 +147,7 @@ class Player:
         self.shadow.fill((255, 255, 0))
         self.shadow.set_colorkey((255, 255, 0))
         pygame.draw.ellipse(self.shadow, (0, 0, 0), self.shadow.get_rect())
-        self.shadow.set_alpha(60)
+        self.shadow.set_alpha(60, pygame.RLEACCEL)
 
         self.holding_phone = False
         self.since_pick_up = 10
@@ -154,6 +157,7 @@ class Player:
 
         self.gun_angle = 0
         self.gun_image = ImageManager.load("assets/images/gun.png")
+        self.flipped_gun_image = pygame.transform.flip(self.gun_image, 1, 0)
 
         self.phone_surf = ImageManager.load("assets/images/phone.png")
         self.phone_surf = pygame.transform.rotate(self.phone_surf, (90))
@@ -210,7 +214,7 @@ class Player:
         self.process_inputs(dt, events)
         self.sprite.set_position(self.position.get_position())
         self.sprite.update(dt, events)
-        mpos = Camera.screen_to_world(pygame.mouse.get_pos())
+        mpos = Camera.screen_to_world(InputManager.get_mouse_pos())
         Camera.target = self.position.copy() * 0.8 + mpos * 0.2
 
         if self.health <= 0:
@@ -258,15 +262,15 @@ class Player:
 
     def process_inputs(self, dt, events):
         direction = Pose((0, 0))
-        pressed = pygame.key.get_pressed()
+        pressed = InputManager.get_keys_pressed()
         if pressed[pygame.K_w]:
-            direction += Pose((0, -1))
+            direction.y -= 1
         if pressed[pygame.K_s]:
-            direction += Pose((0, 1))
+            direction.y += 1
         if pressed[pygame.K_a]:
-            direction += Pose((-1, 0))
+            direction.x -= 1
         if pressed[pygame.K_d]:
-            direction += Pose((1, 0))
+            direction.x += 1
 
         old_state = self.animation_state
 
@@ -283,11 +287,11 @@ class Player:
             pass
         else:
             if direction.magnitude() > 0:
-                direction.scale_to(1)
+                direction.normalize_inplace()
                 self.velocity += direction * dt * 7500
                 self.animation_state = c.WALKING
             else:
-                self.velocity *= 0.0001**dt
+                self.velocity.imul(0.0001**dt)
             if direction.magnitude() == 0:
                 self.animation_state = c.IDLE
 
@@ -324,7 +328,7 @@ class Player:
         if self.velocity.magnitude() > 250 and not self.rolling:
             self.velocity.scale_to(250)
 
-        self.position += self.velocity * dt
+        self.position.iadd_scaled(self.velocity, dt)
 
     def roll(self, direction):
         self.rolling = True
@@ -335,7 +339,7 @@ class Player:
             direction.y = 0
             direction.x = 1 if self.last_lr_direction == c.RIGHT else -1
         if direction.magnitude() > 1:
-            direction.scale_to(1)
+            direction.normalize_inplace()
         self.velocity = direction * 360
         Camera.shake(10)
         self.dodge_sound.play()
@@ -354,9 +358,9 @@ class Player:
                 position = Pose((20, 0))
                 position.rotate_position(angle)
                 world_position = position + self.position
-                self.frame.bullets.append(
-                    Bullet(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce,
-                           frame=self.frame, homing=homing, refundable=True))
+                self.frame.add_bullet(
+                    self.frame.bullet_class(world_position.get_position(), position.get_position(), damage=damage,
+                                            pierce=pierce, frame=self.frame, homing=homing, refundable=True))
                 self.since_fire = 0
                 self.velocity -= position * 2
             self.gunshot_sound.play()
@@ -373,7 +377,7 @@ class Player:
 
         for i in range(12):
             pos = (self.position + Pose((0, 20))).get_position()
-            self.frame.particles.append(Poof(pos))
+            self.frame.particles.spawn(Poof, pos)
 
     def draw(self, surface, offset=(0, 0)):
         up = "Back" in self.sprite.active_animation_key
@@ -410,14 +414,14 @@ class Player:
                                    self.position.y + offset[1] - self.shadow.get_height()//2 + 25))
 
     def update_gun(self, dt, events):
-        mpos = pygame.mouse.get_pos()
+        mpos = InputManager.get_mouse_pos()
         mpos_world = Camera.screen_to_world(mpos)
         direction = mpos_world - self.position
         self.gun_angle = direction.get_angle_of_position()*180/math.pi
 
         self.since_fire += dt
 
-        buttons = pygame.mouse.get_pressed()
+        buttons = InputManager.get_mouse_pressed()
         if buttons[0]:
             if not self.rolling or "Spinning Death" in self.upgrades:
                 effective_fire_rate = self.fire_rate
@@ -447,10 +451,10 @@ class Player:
         if "Piercing" in self.upgrades:
             pierce += 1
 
-        position.rotate_position(random.random()*10 - 5)
-        self.frame.bullets.append(Bullet(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
+        position.rotate_position(rng.random()*10 - 5)
+        self.frame.add_bullet(self.frame.bullet_class(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
         self.since_fire = 0
-        self.velocity -= position*2
+        self.velocity.iadd_scaled(position, -2)
         shake_amt = 10
         if "Cricket" in self.upgrades:
             shake_amt = 20
@@ -459,14 +463,14 @@ class Player:
 
         up = "Back" in self.sprite.active_animation_key
         for i in range(1):
-            self.frame.particles.append(SparkParticle(world_position.get_position(),(position*2)))
+            self.frame.particles.spawn(SparkParticle, world_position.get_position(), (position*2))
 
         if "Hell's Shells" in self.upgrades and self.ammo>1:
             self.ammo -= 1
             position.rotate_position(15)
-            self.frame.bullets.append(Bullet(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
+            self.frame.add_bullet(self.frame.bullet_class(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
             position.rotate_position(-30)
-            self.frame.bullets.append(Bullet(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
+            self.frame.add_bullet(self.frame.bullet_class(world_position.get_position(), position.get_position(), damage=damage, pierce=pierce, frame=self.frame, homing=homing))
             self.frame.bullets_fired += 2
 
         if self.ammo < 0:
@@ -479,10 +483,10 @@ class Player:
         is_flipped = False
         gun_angle = self.gun_angle
         if self.gun_angle > 90 or self.gun_angle < -90:
-            flipped = pygame.transform.flip(self.gun_image,1,0)
+            flipped = self.flipped_gun_image
             is_flipped = True
             gun_angle += 180
-        rotated = pygame.transform.rotate(flipped, gun_angle)
+        rotated = RotationCache.rotate(flipped, gun_angle)
 
         position = Pose((min(13, -10+self.since_fire*200), 0))
 
@@ -496,7 +500,7 @@ class Player:
         surface.blit(rotated, position)
 
     def camera_target(self):
-        mpos = pygame.mouse.get_pos()
+        mpos = InputManager.get_mouse_pos()
         mpos_world = Camera.screen_to_world(mpos)
 
         weight = 0.25
@@ -0,0 +1,196 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import constants as c
+from image_manager import ImageManager
+from music_stream import MusicStems
+from sound_manager import SoundManager
+
+
+class Preloader:
+    """
+    Static class that decodes sounds and images on a thread pool at launch, so the game can show a loading frame
+    instead of a frozen window while GameFrame reads everything one file at a time.
+
+    Both pygame.mixer.Sound and pygame.image.load let go of the GIL while they decode, so the main thread keeps
+    drawing. Decoded images are converted and handed to ImageManager (and sounds to SoundManager) on the main
+    thread, in poll(). The critical assets are the ones GameFrame needs to start; deferred ones are queued after
+    them and don't hold up the loading frame. Anything asked for before it's ready just loads the usual way.
+
+    Also keeps the timings of each asset and of each startup milestone, for report().
+    """
+
+    critical_sounds = (
+        "assets/sound/gunshot.ogg",
+        "assets/sound/dodge.ogg",
+        "assets/sound/player_hurt.ogg",
+        "assets/sound/phone_ring.ogg",
+        "assets/sound/pick_up.ogg",
+        "assets/sound/hang_up.ogg",
+        "assets/sound/bip.ogg",
+        "assets/sound/gary_talk.ogg",
+    )
+    critical_images = (
+        "assets/images/background.png",
+        "assets/images/vignette.png",
+        "assets/images/hud.png",
+        "assets/images/heart.png",
+        "assets/images/gary.png",
+        "assets/images/spacebar.png",
+        "assets/images/ammo.png",
+        "assets/images/heart_icon.png",
+        "assets/images/walk_right.png",
+        "assets/images/forward_idle.png",
+        "assets/images/walk_right_back.png",
+        "assets/images/roll.png",
+        "assets/images/player_take_damage.png",
+        "assets/images/gun.png",
+        "assets/images/phone.png",
+        "assets/images/hat.png",
+        "assets/images/desk.png",
+        "assets/images/cradle.png",
+        "assets/images/e.png",
+        "assets/images/hold.png",
+        "assets/images/crosshairs.png",
+    )
+    # Not needed until a few seconds in: enemies, shooting, deliveries and dying
+    deferred_sounds = tuple(f"assets/sound/zombie_hit_{n}.ogg" for n in range(1, 8))
+    deferred_images = (
+        "assets/images/zombie_walk_right.png",
+        "assets/images/zombie_forward_idle.png",
+        "assets/images/zombie_death.png",
+        "assets/images/zombie_death_long.png",
+        "assets/images/zombie_take_damage.png",
+        "assets/images/zombie_2_walk_right.png",
+        "assets/images/zombie_2_forward_idle.png",
+        "assets/images/zombie_2_death.png",
+        "assets/images/zombie_2_death_long.png",
+        "assets/images/zombie_2_take_damage.png",
+        "assets/images/bullet.png",
+        "assets/images/flash.png",
+        "assets/images/poof.png",
+        "assets/images/small_cursor.png",
+        "assets/images/delivery_art.png",
+        "assets/images/upgrade_icon.png",
+        "assets/images/player death.png",
+        "assets/images/game_over.png",
+    )
+    workers = min(4, os.cpu_count() or 1)
+
+    started = None  # perf_counter() at launch, which timings count from
+    pool = None
+    pending = {}  # Maps each future to (kind, path, critical)
+    waiting = []  # (kind, path, critical) still to decode, when there's no pool to do it
+    critical_left = 0
+    critical_total = 0
+    milestones = []  # (label, seconds since launch)
+    timings = {}  # Maps path to (kind, decode seconds, convert seconds, seconds since launch when ready)
+    print_report = False  # Whether poll() prints report() once everything is loaded
+
+    @staticmethod
+    def begin(started=None):
+        """ Starts the clock for the timings. started is a perf_counter() reading, if launch was earlier than now. """
+        Preloader.started = time.perf_counter() if started is None else started
+        Preloader.milestones = []
+        Preloader.timings = {}
+
+    @staticmethod
+    def now():
+        return time.perf_counter() - Preloader.started
+
+    @staticmethod
+    def mark(label):
+        """ Records that a point in startup has been reached. """
+        if Preloader.started is not None:
+            Preloader.milestones.append((label, Preloader.now()))
+
+    @staticmethod
+    def start():
+        """ Queues every critical, then every deferred asset that isn't loaded already (e.g. from AssetCache). """
+        if Preloader.started is None:
+            Preloader.begin()
+        critical_sounds = Preloader.critical_sounds
+        if not (c.STREAM_MUSIC and MusicStems.available()):
+            critical_sounds = c.MUSIC_STEMS + critical_sounds  # Decoded whole, and they take longest, so first
+        jobs = [("sound", path, True) for path in critical_sounds if not SoundManager.has(path)]
+        jobs += [("image", path, True) for path in Preloader.critical_images if not ImageManager.has(path)]
+        jobs += [("sound", path, False) for path in Preloader.deferred_sounds if not SoundManager.has(path)]
+        jobs += [("image", path, False) for path in Preloader.deferred_images if not ImageManager.has(path)]
+        Preloader.critical_total = Preloader.critical_left = sum(1 for job in jobs if job[2])
+        Preloader.pending = {}
+        Preloader.waiting = []
+        try:
+            Preloader.pool = ThreadPoolExecutor(Preloader.workers, thread_name_prefix="preload")
+            for job in jobs:
+                Preloader.pending[Preloader.pool.submit(Preloader.decode, job[0], job[1])] = job
+        except RuntimeError:  # No threads (e.g. in a browser), so poll() decodes them one at a time instead
+            Preloader.pool = None
+            Preloader.waiting = jobs
+
+    @staticmethod
+    def decode(kind, path):
+        """ Runs on a worker. Returns (sound or unconverted surface, seconds taken). """
+        start = time.perf_counter()
+        loaded = pygame.mixer.Sound(path) if kind == "sound" else pygame.image.load(path)
+        return loaded, time.perf_counter() - start
+
+    @staticmethod
+    def poll():
+        """
+        Hands whatever has finished decoding to the asset managers. Call once a frame from the main thread.
+        Returns whether everything critical is loaded.
+        """
+        if Preloader.waiting:
+            job = Preloader.waiting.pop(0)
+            Preloader.finish(job, *Preloader.decode(job[0], job[1]))
+        elif Preloader.pending:
+            for future in [future for future in Preloader.pending if future.done()]:
+                Preloader.finish(Preloader.pending.pop(future), *future.result())
+            if not Preloader.pending:
+                Preloader.pool.shutdown(wait=False)
+                Preloader.pool = None
+        else:
+            return True
+        if not Preloader.pending and not Preloader.waiting:
+            Preloader.mark("all assets")
+            if Preloader.print_report:
+                print(Preloader.report())
+        return Preloader.critical_left == 0
+
+    @staticmethod
+    def finish(job, loaded, seconds):
+        kind, path, critical = job
+        start = time.perf_counter()
+        if kind == "sound":
+            if not SoundManager.has(path):
+                SoundManager.put(path, loaded)
+        elif not ImageManager.has(path):  # Otherwise something needed it first, and loaded it itself
+            ImageManager.put(path, loaded.convert_alpha())
+        Preloader.timings[path] = kind, seconds, time.perf_counter() - start, Preloader.now()
+        if critical:
+            Preloader.critical_left -= 1
+            if Preloader.critical_left == 0:
+                Preloader.mark("critical assets")
+
+    @staticmethod
+    def progress():
+        """ How much of the critical assets have loaded, from 0 to 1. """
+        if not Preloader.critical_total:
+            return 1
+        return 1 - Preloader.critical_left/Preloader.critical_total
+
+    @staticmethod
+    def report():
+        """ Returns a table of the startup milestones and of each asset's timings, slowest decode first. """
+        lines = ["Startup (ms since launch)"]
+        for label, seconds in Preloader.milestones:
+            lines.append(f"  {label:<42}{seconds*1000:>9.1f}")
+        lines.append(f"{'Asset':<44}{'decode':>9}{'convert':>9}{'ready':>9}")
+        for path, (kind, decode, convert, ready) in sorted(Preloader.timings.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {path:<42}{decode*1000:>9.1f}{convert*1000:>9.1f}{ready*1000:>9.1f}")
+        total = sum(timing[1] for timing in Preloader.timings.values())
+        lines.append(f"  {f'{len(Preloader.timings)} assets, decoding in total':<42}{total*1000:>9.1f}")
+        return "\n".join(lines)
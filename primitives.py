@@ -15,12 +15,14 @@ class GameObject:
 
 
 class Pose:
+    __slots__ = ("x", "y", "angle")
+
     def __init__(self, position, angle=0):
         """ Initialize the Pose.
             position: two-length tuple (x, y)
             angle: angle, in degrees counterclockwise from right ->
         """
-        self.set_position(position)
+        self.x, self.y = position
         self.angle = angle
 
     def set_x(self, new_x):
@@ -64,11 +66,7 @@ class Pose:
         self.set_angle(self.angle + angle)
 
     def rotate_position(self, angle):
-        x = self.x*math.cos(angle*math.pi/180) \
-            + self.y*math.sin(angle*math.pi/180)
-        y = -self.x*math.sin(angle*math.pi/180) \
-            + self.y*math.cos(angle*math.pi/180)
-        self.set_position((x, y))
+        self.rotate_inplace(angle)
 
     def add_pose(self, other, weight=1, frame=None):
         if frame:
@@ -84,13 +82,16 @@ class Pose:
         distance = math.sqrt(self.x*self.x + self.y*self.y)
         return distance
 
+    def magnitude_sq(self):
+        return self.x*self.x + self.y*self.y
+
     def clear(self):
         self.x = 0
         self.y = 0
         self.angle = 0
 
     def copy(self):
-        return Pose(self.get_position(), self.angle)
+        return Pose((self.x, self.y), self.angle)
 
     def scale_to(self, magnitude):
         """ Scale the X and Y components of the Pose to have a particular
@@ -104,20 +105,58 @@ class Pose:
         self.x *= magnitude / my_magnitude
         self.y *= magnitude / my_magnitude
 
+    # In-place versions of the operators below, for hot code that would otherwise make a temporary Pose per
+    # operation. Each returns self (or out) so calls can be chained.
+
+    def iadd_scaled(self, other, scale=1):
+        """ self += other*scale, without making a Pose for other*scale. """
+        self.x += other.x*scale
+        self.y += other.y*scale
+        self.angle += other.angle*scale
+        return self
+
+    def imul(self, scale):
+        """ self *= scale, in place. """
+        self.x *= scale
+        self.y *= scale
+        self.angle *= scale
+        return self
+
+    def sub_into(self, other, out):
+        """ Writes self - other into out, and returns out. """
+        out.x = self.x - other.x
+        out.y = self.y - other.y
+        out.angle = self.angle - other.angle
+        return out
+
+    def rotate_inplace(self, angle):
+        """ Rotates the position by angle degrees, with a single cos/sin pair. """
+        radians = angle*math.pi/180
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+        x = self.x
+        y = self.y
+        self.x = x*cos + y*sin
+        self.y = -x*sin + y*cos
+        return self
+
+    def normalize_inplace(self):
+        """ scale_to(1) in one step, except that zero stays zero. """
+        my_magnitude = math.sqrt(self.x*self.x + self.y*self.y)
+        if my_magnitude != 0:
+            scale = 1/my_magnitude
+            self.x *= scale
+            self.y *= scale
+        return self
+
     def __add__(self, other):
-        copy = self.copy()
-        copy.add_pose(other)
-        return copy
+        return Pose((self.x + other.x, self.y + other.y), self.angle + other.angle)
 
     def __sub__(self, other):
         return Pose((self.x - other.x, self.y - other.y), self.angle - other.angle)
 
     def __mul__(self, other):
-        copy = self.copy()
-        copy.x *= other
-        copy.y *= other
-        copy.angle *= other
-        return copy
+        return Pose((self.x*other, self.y*other), self.angle*other)
 
     def __pow__(self, other):
         copy = self.copy()
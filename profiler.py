@@ -0,0 +1,187 @@
+import time
+from collections import deque
+
+import pygame
+
+
+class Profiler:
+    """
+    Static class that times each stage of the game's update and draw, keeps a rolling window of samples per stage,
+    and can show percentiles in an overlay (F3) and stream per-frame samples to a CSV file.
+
+    Wrap a stage like this:
+
+        start = Profiler.start()
+        ...
+        Profiler.stop("update.bullets", start)
+
+    Caches can also tally their hits and misses with Profiler.count("name", hit), for a hit rate in the overlay.
+
+    While disabled, start() returns 0 and stop() returns straight away, so instrumented code costs next to nothing.
+    """
+
+    stages = (
+        "update.delivery",
+        "update.gary",
+        "update.spawning",
+        "update.bullets",
+        "update.projectiles",
+        "update.agents",
+        "update.particles",
+        "update.phone",
+        "update.audio",
+        "draw.background",
+        "draw.particles",
+        "draw.agents",
+        "draw.bullets",
+        "draw.queue",
+        "draw.vignette",
+        "draw.gary",
+        "draw.hud",
+        "draw.delivery",
+    )
+    window = 300  # Frames of history kept per stage for percentiles
+    overlay_refresh = 0.25  # Seconds between overlay redraws
+
+    enabled = False
+    overlay = False
+    samples = {}  # Maps stage (or "frame") to a deque of recent per-frame times, in seconds
+    current = {}  # Maps stage to time spent in it so far this frame
+    counters = {}  # Maps a cache's name to [hits, misses] while enabled
+    frame_count = 0
+    last_frame_end = None
+    csv_file = None
+    font = None
+    overlay_surf = None
+    since_overlay = 0
+
+    @staticmethod
+    def start():
+        if not Profiler.enabled:
+            return 0
+        return time.perf_counter()
+
+    @staticmethod
+    def stop(stage, start):
+        if not start:
+            return
+        current = Profiler.current
+        current[stage] = current.get(stage, 0) + time.perf_counter() - start
+
+    @staticmethod
+    def count(name, hit):
+        if not Profiler.enabled:
+            return
+        counts = Profiler.counters.get(name)
+        if counts is None:
+            counts = Profiler.counters[name] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    @staticmethod
+    def hit_rate(name):
+        """ The fraction of lookups in the named cache that were hits, or None if there haven't been any. """
+        hits, misses = Profiler.counters.get(name, (0, 0))
+        return hits/(hits + misses) if hits + misses else None
+
+    @staticmethod
+    def update_enabled():
+        Profiler.enabled = Profiler.overlay or Profiler.csv_file is not None
+        if not Profiler.enabled:
+            Profiler.last_frame_end = None
+            Profiler.current = {}
+
+    @staticmethod
+    def toggle_overlay():
+        Profiler.overlay = not Profiler.overlay
+        Profiler.update_enabled()
+
+    @staticmethod
+    def open_csv(path):
+        """
+        Starts writing one row per frame to path, with the frame time and each stage's time in milliseconds.
+        """
+        Profiler.csv_file = open(path, "w")
+        Profiler.csv_file.write(",".join(("frame", "frame_ms") + tuple(f"{stage}_ms" for stage in Profiler.stages)) + "\n")
+        Profiler.update_enabled()
+
+    @staticmethod
+    def close_csv():
+        if Profiler.csv_file is not None:
+            Profiler.csv_file.close()
+            Profiler.csv_file = None
+        Profiler.update_enabled()
+
+    @staticmethod
+    def end_frame():
+        """
+        Files this frame's stage times into the rolling windows and the CSV. Call once per rendered frame.
+        """
+        if not Profiler.enabled:
+            return
+        now = time.perf_counter()
+        frame_time = now - Profiler.last_frame_end if Profiler.last_frame_end is not None else 0
+        Profiler.last_frame_end = now
+        Profiler.frame_count += 1
+
+        samples = Profiler.samples
+        current = Profiler.current
+        if "frame" not in samples:
+            samples["frame"] = deque(maxlen=Profiler.window)
+        samples["frame"].append(frame_time)
+        for stage in Profiler.stages:
+            if stage not in samples:
+                samples[stage] = deque(maxlen=Profiler.window)
+            samples[stage].append(current.get(stage, 0))
+
+        if Profiler.csv_file is not None:
+            row = [str(Profiler.frame_count), f"{frame_time*1000:.4f}"]
+            row += [f"{current.get(stage, 0)*1000:.4f}" for stage in Profiler.stages]
+            Profiler.csv_file.write(",".join(row) + "\n")
+        Profiler.current = {}
+
+    @staticmethod
+    def percentiles(stage, quantiles=(0.5, 0.95, 0.99)):
+        """
+        Returns the given quantiles of the stage's recent per-frame times, in seconds.
+        """
+        values = sorted(Profiler.samples.get(stage, ()))
+        if not values:
+            return tuple(0 for quantile in quantiles)
+        return tuple(values[min(len(values) - 1, int(quantile*len(values)))] for quantile in quantiles)
+
+    @staticmethod
+    def draw_overlay(surface, dt):
+        if not Profiler.overlay:
+            return
+        Profiler.since_overlay += dt
+        if Profiler.overlay_surf is None or Profiler.since_overlay > Profiler.overlay_refresh:
+            Profiler.since_overlay = 0
+            Profiler.overlay_surf = Profiler.render_overlay()
+        surface.blit(Profiler.overlay_surf, (surface.get_width() - Profiler.overlay_surf.get_width() - 8, 8))
+
+    @staticmethod
+    def render_overlay():
+        if Profiler.font is None:
+            Profiler.font = pygame.font.Font("assets/fonts/RPGSystem.ttf", 16)
+        font = Profiler.font
+        rows = [("stage", "p50", "p95", "p99")]
+        for stage in ("frame",) + Profiler.stages:
+            rows.append((stage,) + tuple(f"{value*1000:.2f}" for value in Profiler.percentiles(stage)))
+        if Profiler.counters:
+            rows.append(("cache", "hit %", "hits", "miss"))
+            for name, (hits, misses) in sorted(Profiler.counters.items()):
+                rows.append((name, f"{Profiler.hit_rate(name)*100:.1f}", str(hits), str(misses)))
+        label_width = 120
+        column_width = 44
+        line_height = font.get_linesize()
+        surf = pygame.Surface((label_width + column_width*3 + 12, line_height*len(rows) + 8))
+        surf.fill((0, 0, 0))
+        surf.set_alpha(190)
+        for i, row in enumerate(rows):
+            y = 4 + i*line_height
+            surf.blit(font.render(row[0], 0, (255, 255, 255)), (6, y))
+            for j, cell in enumerate(row[1:]):
+                # Right-align the numbers in their column
+                text = font.render(cell, 0, (255, 255, 255))
+                surf.blit(text, (6 + label_width + column_width*(j + 1) - text.get_width(), y))
+        return surf
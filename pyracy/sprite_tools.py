@@ -7,12 +7,16 @@ import pygame
 import time
 import sys
 from image_manager import ImageManager
+from rotation_cache import RotationCache
 
 class Animation(object):
     """
     Represents a single animation from a sprite sheet.
     """
 
+    cache = {}  # Maps from_path arguments to an already split Animation, shared by every Sprite that uses it
+    use_cache = True
+
     def __init__(self, surface, sheet_size=(1, 1), frame_count=1, rect=None,
                  reverse_x=False, reverse_y=False, reverse_animation=False, colorkey=None, scale=1.0, start_frame=0, time_scaling = 1):
         """
@@ -41,11 +45,56 @@ class Animation(object):
         self.time_scaling = time_scaling
 
     @staticmethod
-    def from_path(path, *args, **kwargs):
+    def from_path(path, sheet_size=(1, 1), frame_count=1, rect=None, reverse_x=False, reverse_y=False,
+                  reverse_animation=False, colorkey=None, scale=1.0, start_frame=0, time_scaling=1):
         """
         Initializes an Animation from a file path rather than a pygame surface.
+
+        Animations are cached by their arguments, so asking for the same one again returns the already split frames
+        instead of slicing, flipping and scaling the sheet again. The returned Animation is shared; don't modify it.
+        """
+        key = Animation.cache_key(path, sheet_size, frame_count, rect, reverse_x, reverse_y, reverse_animation,
+                                  colorkey, scale, start_frame, time_scaling)
+        if Animation.use_cache and key in Animation.cache:
+            return Animation.cache[key]
+        animation = Animation(ImageManager.load(path), sheet_size, frame_count, rect, reverse_x, reverse_y,
+                              reverse_animation, colorkey, scale, start_frame, time_scaling)
+        if Animation.use_cache:
+            Animation.cache[key] = animation
+        return animation
+
+    @staticmethod
+    def cache_key(path, sheet_size=(1, 1), frame_count=1, rect=None, reverse_x=False, reverse_y=False,
+                  reverse_animation=False, colorkey=None, scale=1.0, start_frame=0, time_scaling=1):
+        """ The key from_path caches an Animation under. Takes the same arguments. """
+        return (path, tuple(sheet_size), frame_count, tuple(rect) if rect is not None else None, reverse_x, reverse_y,
+                reverse_animation, tuple(colorkey) if colorkey is not None else None, scale, start_frame, time_scaling)
+
+    @staticmethod
+    def from_frames(frames, reverse_x=False, reverse_y=False, reverse_animation=False, colorkey=None, scale=1.0,
+                    time_scaling=1):
+        """
+        Makes an Animation out of frames that have already been split, flipped and scaled (like the ones in a baked
+        AssetCache), without going back to the sheet they came from.
+        """
+        animation = Animation.__new__(Animation)
+        animation.surface = None
+        animation.reverse_x = reverse_x
+        animation.reverse_y = reverse_y
+        animation.reverse_animation = reverse_animation
+        animation.colorkey = colorkey
+        animation.scale = scale
+        animation.frames = list(frames)
+        animation.frame_count = len(animation.frames)
+        animation.time_scaling = time_scaling
+        return animation
+
+    @staticmethod
+    def clear_cache():
+        """
+        Forgets every cached Animation, e.g. after the images they were made from have been cleared.
         """
-        return Animation(ImageManager.load(path), *args, **kwargs)
+        Animation.cache = {}
 
     def split(self, surface, sheet_size, frame_count, rect=None, scale=1.0):
         """
@@ -115,9 +164,8 @@ class Animation(object):
         ybool: if true, mirrors frames vertically
         """
 
-        #   Flip each frame
-        for idx, frame in enumerate(self.frames):
-            self.frames[idx] = pygame.transform.flip(frame, x_bool, y_bool)
+        #   Flip each frame into a new list, since the old one may be shared through the cache
+        self.frames = [pygame.transform.flip(frame, x_bool, y_bool) for frame in self.frames]
 
 
 class Sprite(pygame.sprite.Sprite):
@@ -218,7 +266,7 @@ class Sprite(pygame.sprite.Sprite):
 
         image = active_animation.frames[frame_number]
         if self.angle != 0:
-            image = pygame.transform.rotate(image, self.angle)
+            image = RotationCache.rotate(image, self.angle)
         return image
 
     def update_image(self):
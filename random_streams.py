@@ -0,0 +1,33 @@
+import random
+
+
+class RandomStreams:
+    """
+    Static class handing out a separate random number generator per subsystem, so that (for instance) cosmetic
+    particle randomness can't change which way the zombies walk. Seeding it makes a whole run reproducible.
+    """
+
+    streams = {}  # Maps subsystem name to its random.Random
+    seed_value = None
+
+    @staticmethod
+    def get(name):
+        """
+        Returns the generator for a subsystem. It's the same object for the life of the program, so it's safe to
+        keep a reference to it; seed() reseeds it in place.
+        """
+        if name not in RandomStreams.streams:
+            stream = random.Random()
+            if RandomStreams.seed_value is not None:
+                stream.seed(f"{RandomStreams.seed_value}:{name}")
+            RandomStreams.streams[name] = stream
+        return RandomStreams.streams[name]
+
+    @staticmethod
+    def seed(seed):
+        """
+        Reseeds every stream, each from a combination of seed and its own name.
+        """
+        RandomStreams.seed_value = seed
+        for name, stream in RandomStreams.streams.items():
+            stream.seed(f"{seed}:{name}")
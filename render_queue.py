@@ -0,0 +1,78 @@
+from operator import itemgetter
+
+
+class RenderQueue:
+    """
+    Collects a frame's blits into layers, then draws each layer with a single Surface.blits call.
+
+    Layers are drawn in the order they were given. A sorted layer is ordered by each record's sort key when it's
+    flushed; records with equal keys stay in the order they were pushed. Since Python's sort is adaptive, pushing in
+    roughly the right order (like the order things were in last frame) keeps that close to a single pass.
+
+    The queue can also stand in for a surface: after at(layer, sort_key), blit() pushes onto that layer, so draw
+    methods written for a surface can be pointed at the queue unchanged.
+    """
+
+    def __init__(self, size, layers):
+        """
+        size: size of the surface the queue will be flushed to, for get_width() and friends
+        layers: sequence of (layer, sorted) pairs, in drawing order
+        """
+        self.size = tuple(size)
+        self.records = {}  # Maps layer to a list of blit tuples, or (sort_key, blit tuple) pairs if sorted
+        self.sorted = {}
+        for layer, sort in layers:
+            self.records[layer] = []
+            self.sorted[layer] = sort
+        self.layer = None
+        self.sort_key = 0
+
+    def push(self, source, dest, layer, sort_key=0):
+        if self.sorted[layer]:
+            self.records[layer].append((sort_key, (source, dest)))
+        else:
+            self.records[layer].append((source, dest))
+
+    def extend(self, layer, blits):
+        """ Pushes an iterable of (source, dest) pairs onto an unsorted layer. """
+        self.records[layer] += blits
+
+    def at(self, layer, sort_key=0):
+        """ Points blit() at a layer and sort key, and returns the queue. """
+        self.layer = layer
+        self.sort_key = sort_key
+        return self
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if area is None and not special_flags:
+            record = (source, dest)
+        else:
+            record = (source, dest, area, special_flags)
+        if self.sorted[self.layer]:
+            self.records[self.layer].append((self.sort_key, record))
+        else:
+            self.records[self.layer].append(record)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def flush(self, surface):
+        """ Draws every layer onto surface, and empties the queue. """
+        for layer, records in self.records.items():
+            if not records:
+                continue
+            if self.sorted[layer]:
+                records.sort(key=itemgetter(0))
+                surface.blits([record for key, record in records], doreturn=False)
+            else:
+                surface.blits(records, doreturn=False)
+            records.clear()
+
+    def __len__(self):
+        return sum(len(records) for records in self.records.values())
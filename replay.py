@@ -0,0 +1,243 @@
+"""
+Records the exact input a game session received, tick by tick, into a compact binary log, and replays it through
+GameFrame headless. With the random streams seeded from the log, a replay runs bit-identically to the recording,
+which makes it possible to benchmark the exact same late-game wave before and after a change.
+
+Record: python main.py --record session.hrec [--seed N]
+Replay: python replay.py session.hrec
+"""
+
+import hashlib
+import struct
+import sys
+import time
+
+import headless
+import pygame
+
+from input_manager import InputManager, PygameInput, ScriptedInput
+from random_streams import RandomStreams
+
+MAGIC = b"HOLDREC1"
+HEADER = struct.Struct("<8sq")  # Magic, seed
+FLAGS = struct.Struct("<B")
+DT = struct.Struct("<d")
+MOUSE_POS = struct.Struct("<hh")
+BUTTONS = struct.Struct("<B")
+COUNT = struct.Struct("<B")
+KEY = struct.Struct("<I")
+EVENT = struct.Struct("<BIhh")  # Type index, key or button, x, y
+CHECKSUM = struct.Struct("<8s")
+
+# Per-tick flags saying which parts of the record follow. Anything not flagged is unchanged from the last tick.
+DT_CHANGED = 1
+MOUSE_POS_CHANGED = 2
+BUTTONS_CHANGED = 4
+KEYS_CHANGED = 8
+HAS_EVENTS = 16
+HAS_CHECKSUM = 32
+
+EVENT_TYPES = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+RECORDED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)  # Every key the game polls through InputManager
+CHECKSUM_INTERVAL = 100
+
+
+def state_digest(frame):
+    """
+    Returns a short hash of the simulation state of a GameFrame, for checking that a replay hasn't diverged.
+    """
+    player = frame.player
+    state = [
+        player.position.x, player.position.y, player.velocity.x, player.velocity.y, player.health, player.ammo,
+        frame.zombies_killed, frame.bullets_fired, frame.spawn_intensity,
+    ]
+    for enemy in frame.enemies:
+        state += [enemy.position.x, enemy.position.y, enemy.velocity.x, enemy.velocity.y, enemy.health]
+    for bullet in frame.bullets:
+        state += [bullet.position.x, bullet.position.y]
+    return hashlib.blake2b(repr(state).encode(), digest_size=8).digest()
+
+
+class Recorder:
+    """
+    Writes each simulation tick's dt, events and input state to a log while the game runs.
+
+    While recording, the game polls a snapshot of the input taken at the start of the tick (through InputManager)
+    rather than the live devices, so the log holds exactly what the simulation saw.
+    """
+
+    def __init__(self, path, seed, source=None):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, seed))
+        self.source = source if source is not None else PygameInput()
+        self.input = ScriptedInput()
+        InputManager.set_provider(self.input)
+        self.ticks = 0
+        self.dt = None
+        self.mouse_pos = None
+        self.buttons = None
+        self.keys = None
+
+    def capture(self, dt, events, frame):
+        """
+        Snapshots input for the tick about to be simulated and logs it. Call right before frame.update.
+        """
+        mouse_pos = tuple(int(value) for value in self.source.get_mouse_pos())
+        pressed = self.source.get_mouse_pressed()
+        buttons = sum(1 << i for i, button in enumerate(pressed[:3]) if button)
+        pressed_keys = self.source.get_keys_pressed()
+        keys = tuple(key for key in RECORDED_KEYS if pressed_keys[key])
+        self.input.set_state(mouse_pos, [buttons & (1 << i) for i in range(3)], keys)
+        recorded_events = [event for event in events if event.type in EVENT_TYPES]
+
+        flags = 0
+        body = b""
+        if dt != self.dt:
+            flags |= DT_CHANGED
+            body += DT.pack(dt)
+            self.dt = dt
+        if mouse_pos != self.mouse_pos:
+            flags |= MOUSE_POS_CHANGED
+            body += MOUSE_POS.pack(*mouse_pos)
+            self.mouse_pos = mouse_pos
+        if buttons != self.buttons:
+            flags |= BUTTONS_CHANGED
+            body += BUTTONS.pack(buttons)
+            self.buttons = buttons
+        if keys != self.keys:
+            flags |= KEYS_CHANGED
+            body += COUNT.pack(len(keys)) + b"".join(KEY.pack(key) for key in keys)
+            self.keys = keys
+        if recorded_events:
+            flags |= HAS_EVENTS
+            body += COUNT.pack(len(recorded_events))
+            for event in recorded_events:
+                type_index = EVENT_TYPES.index(event.type)
+                if event.type == pygame.KEYDOWN:
+                    body += EVENT.pack(type_index, event.key, 0, 0)
+                else:
+                    body += EVENT.pack(type_index, event.button, *[int(value) for value in event.pos])
+        if self.ticks % CHECKSUM_INTERVAL == 0:
+            flags |= HAS_CHECKSUM
+            body += CHECKSUM.pack(state_digest(frame))
+        self.file.write(FLAGS.pack(flags) + body)
+        self.ticks += 1
+
+    def close(self):
+        self.file.close()
+
+
+class Replayer:
+    """
+    Reads a log written by Recorder.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = file.read()
+        magic, self.seed = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+
+    def ticks(self, scripted_input):
+        """
+        Yields (dt, events, checksum) for each recorded tick, after setting scripted_input to that tick's input.
+        checksum is None for ticks that didn't record one.
+        """
+        data = self.data
+        offset = HEADER.size
+        dt = None
+        while offset < len(data):
+            flags, = FLAGS.unpack_from(data, offset)
+            offset += FLAGS.size
+            if flags & DT_CHANGED:
+                dt, = DT.unpack_from(data, offset)
+                offset += DT.size
+            if flags & MOUSE_POS_CHANGED:
+                scripted_input.set_state(mouse_pos=MOUSE_POS.unpack_from(data, offset))
+                offset += MOUSE_POS.size
+            if flags & BUTTONS_CHANGED:
+                buttons, = BUTTONS.unpack_from(data, offset)
+                scripted_input.set_state(mouse_pressed=[buttons & (1 << i) for i in range(3)])
+                offset += BUTTONS.size
+            if flags & KEYS_CHANGED:
+                count, = COUNT.unpack_from(data, offset)
+                offset += COUNT.size
+                keys = [KEY.unpack_from(data, offset + i*KEY.size)[0] for i in range(count)]
+                scripted_input.set_state(keys=keys)
+                offset += count*KEY.size
+            events = []
+            if flags & HAS_EVENTS:
+                count, = COUNT.unpack_from(data, offset)
+                offset += COUNT.size
+                for i in range(count):
+                    type_index, value, x, y = EVENT.unpack_from(data, offset)
+                    offset += EVENT.size
+                    event_type = EVENT_TYPES[type_index]
+                    if event_type == pygame.KEYDOWN:
+                        events.append(pygame.event.Event(event_type, key=value))
+                    else:
+                        events.append(pygame.event.Event(event_type, button=value, pos=(x, y)))
+            checksum = None
+            if flags & HAS_CHECKSUM:
+                checksum, = CHECKSUM.unpack_from(data, offset)
+                offset += CHECKSUM.size
+            yield dt, events, checksum
+
+
+def replay(path):
+    """
+    Replays a recording headless as fast as possible, and returns a dictionary of results.
+    """
+    import frame as f
+
+    if not pygame.get_init():
+        headless.init()
+    replayer = Replayer(path)
+    scripted_input = ScriptedInput()
+    InputManager.set_provider(scripted_input)
+    RandomStreams.seed(replayer.seed)
+
+    frame = f.GameFrame(None)
+    frame.load()
+    ticks = 0
+    checksums = 0
+    diverged_at = None
+    start = time.perf_counter()
+    for dt, events, checksum in replayer.ticks(scripted_input):
+        if checksum is not None:
+            checksums += 1
+            if diverged_at is None and state_digest(frame) != checksum:
+                diverged_at = ticks
+        frame.update(dt, events)
+        ticks += 1
+        if frame.done:
+            frame = frame.next_frame()
+            frame.load()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": ticks,
+        "wall_seconds": elapsed,
+        "ticks_per_second": ticks/elapsed if elapsed else 0,
+        "checksums": checksums,
+        "diverged_at": diverged_at,
+        "frame": frame,
+    }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    results = replay(sys.argv[1])
+    print(f"{results['ticks']} ticks in {results['wall_seconds']:.2f}s: {results['ticks_per_second']:.0f} ticks/sec")
+    if results["diverged_at"] is None:
+        print(f"Matched all {results['checksums']} recorded checksums")
+    else:
+        print(f"Diverged from the recording by tick {results['diverged_at']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
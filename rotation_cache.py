@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class RotationCache:
+    """
+    Static class that caches rotated copies of surfaces, so things that spin every frame don't have to call
+    pygame.transform.rotate every frame.
+
+    Angles are snapped to one of RotationCache.steps directions, and the cache forgets the least recently used
+    rotations once it holds more than RotationCache.max_size surfaces.
+    """
+
+    steps = 128
+    max_size = 2048
+    cache = OrderedDict()  # Maps (surface, step) to the rotated surface
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def quantize(angle):
+        """
+        Returns the index of the step closest to angle, in degrees counterclockwise.
+        """
+        return round(angle * RotationCache.steps / 360) % RotationCache.steps
+
+    @staticmethod
+    def rotate(surface, angle):
+        """
+        Returns surface rotated by angle (snapped to the nearest step), from the cache if possible.
+        :param surface: The surface to rotate. Don't draw on it afterwards, or cached rotations will be stale.
+        :param angle: Angle in degrees counterclockwise
+        :return: The rotated surface. This is likely the same reference others are using, so don't be destructive.
+        """
+        key = (surface, RotationCache.quantize(angle))
+        cache = RotationCache.cache
+        rotated = cache.get(key)
+        if rotated is not None:
+            cache.move_to_end(key)
+            RotationCache.hits += 1
+            return rotated
+        RotationCache.misses += 1
+        rotated = pygame.transform.rotate(surface, key[1] * 360 / RotationCache.steps)
+        cache[key] = rotated
+        if len(cache) > RotationCache.max_size:
+            cache.popitem(last=False)
+        return rotated
+
+    @staticmethod
+    def prebake(surface):
+        """
+        Fills the cache with every rotation of surface up front.
+        """
+        for step in range(RotationCache.steps):
+            RotationCache.rotate(surface, step * 360 / RotationCache.steps)
+
+    @staticmethod
+    def clear_all():
+        RotationCache.cache.clear()
+        RotationCache.hits = 0
+        RotationCache.misses = 0
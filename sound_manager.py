@@ -38,6 +38,14 @@ class SoundManager:
         SoundManager.check_initialized()
         SoundManager.sounds = {}
 
+    @staticmethod
+    def has(path):
+        """
+        Whether path is already loaded, so load(path) won't have to read the file.
+        """
+        SoundManager.check_initialized()
+        return path in SoundManager.sounds
+
     @staticmethod
     def load(path):
         """
@@ -51,3 +59,11 @@ class SoundManager:
         sound = pygame.mixer.Sound(path)
         SoundManager.sounds[path] = sound
         return sound
+
+    @staticmethod
+    def put(path, sound):
+        """
+        Caches an already loaded sound, so load(path) returns it instead of reading the file.
+        """
+        SoundManager.check_initialized()
+        SoundManager.sounds[path] = sound
@@ -0,0 +1,113 @@
+class SpatialHash:
+    """
+    Uniform grid that buckets objects by their position, so neighbourhood queries only look at a few cells
+    instead of every object in the arena.
+
+    Objects only need a ``position`` Pose. Each object also remembers the order it was inserted in, and queries
+    return matches in that order, so callers see items in the same order they would by walking the source list.
+    """
+
+    def __init__(self, cell_size=50):
+        self.cell_size = cell_size
+        self.cells = {}  # Maps (cell_x, cell_y) to a list of objects in that cell
+        self.item_cells = {}  # Maps each object to the cell it was last filed under
+        self.order = {}  # Maps each object to its insertion order
+        self.next_order = 0
+
+    def cell_for(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def clear(self):
+        self.cells = {}
+        self.item_cells = {}
+        self.order = {}
+        self.next_order = 0
+
+    def rebuild(self, items):
+        """
+        Forgets everything and re-files every object in items, keeping their list order.
+        """
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def rebuild_at(self, items, cells):
+        """
+        rebuild(), for objects whose cells have been worked out already, given as (cell_x, cell_y) in the same order.
+        """
+        self.clear()
+        buckets = self.cells
+        for item, cell in zip(items, cells):
+            buckets.setdefault(cell, []).append(item)
+        self.item_cells = dict(zip(items, cells))
+        self.order = dict(zip(items, range(len(items))))
+        self.next_order = len(items)
+
+    def insert(self, item):
+        cell = self.cell_for(item.position.x, item.position.y)
+        self.cells.setdefault(cell, []).append(item)
+        self.item_cells[item] = cell
+        self.order[item] = self.next_order
+        self.next_order += 1
+
+    def remove(self, item):
+        if item not in self.item_cells:
+            return
+        cell = self.item_cells.pop(item)
+        del self.order[item]
+        bucket = self.cells[cell]
+        bucket.remove(item)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, item):
+        """
+        Re-files an object after its position has changed. Cheap if it's still in the same cell.
+        """
+        cell = self.cell_for(item.position.x, item.position.y)
+        old_cell = self.item_cells[item]
+        if cell == old_cell:
+            return
+        bucket = self.cells[old_cell]
+        bucket.remove(item)
+        if not bucket:
+            del self.cells[old_cell]
+        self.cells.setdefault(cell, []).append(item)
+        self.item_cells[item] = cell
+
+    def query(self, x, y, half_width, half_height=None):
+        """
+        Returns every object filed in a cell touching the given box, in insertion order.
+
+        Objects near the edge of the box may be outside it, so callers should still do their own exact test.
+        """
+        if half_height is None:
+            half_height = half_width
+        return self.query_rect(x - half_width, y - half_height, x + half_width, y + half_height)
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        size = self.cell_size
+        x0, y0 = int(min_x // size), int(min_y // size)
+        x1, y1 = int(max_x // size), int(max_y // size)
+        cells = self.cells
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # Box covers more cells than are occupied, so it's cheaper to check the occupied ones
+            for (cell_x, cell_y), bucket in cells.items():
+                if x0 <= cell_x <= x1 and y0 <= cell_y <= y1:
+                    found += bucket
+        else:
+            for cell_y in range(y0, y1 + 1):
+                for cell_x in range(x0, x1 + 1):
+                    bucket = cells.get((cell_x, cell_y))
+                    if bucket:
+                        found += bucket
+        if len(found) > 1:
+            found.sort(key=self.order.__getitem__)
+        return found
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
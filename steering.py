@@ -0,0 +1,259 @@
+import atexit
+import math
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy
+except ImportError:  # Only AgentWorld uses this, and it needs numpy too
+    numpy = None
+
+
+class Steering:
+    """
+    Works out steering (Enemy.update_target_motion) and separation (the enemy to enemy half of
+    Enemy.update_collisions) for every living enemy in an AgentWorld, optionally across several workers.
+
+    The world copies its living enemies into arrays, run() fills in the results, and the world applies them. With
+    workers, the arena is split into vertical stripes holding about as many enemies each. A stripe's worker handles
+    the enemies inside it, reading the ones in a halo a collision's reach either side as neighbours, and writes
+    results into its own enemies' rows only. Each enemy adds up its neighbours in the same order however the arena
+    is split, so the results are the same to the bit for any number of workers, including none.
+
+    Workers are processes sharing the arrays through shared memory, or threads on a free-threaded Python, where
+    they can share them directly.
+    """
+
+    # (name, width, dtype) of each array. The first seven are inputs; steer_stripe fills in the rest, and updates
+    # velocity and since_start_walking in place.
+    fields = (
+        ("position", 2, "float64"),
+        ("target_position", 2, "float64"),
+        ("velocity", 2, "float64"),
+        ("max_speed", 1, "float64"),
+        ("radius", 1, "float64"),
+        ("arrived", 1, "bool"),
+        ("since_start_walking", 1, "float64"),
+        ("target_velocity", 2, "float64"),
+        ("far", 1, "bool"),  # Whether each is more than 20 px from its target, and so has a new target_velocity
+        ("stopping", 1, "bool"),  # Whether each should arrive_at_target
+        ("nudge", 2, "float64"),  # What its neighbours add to its velocity
+        ("push", 2, "float64"),  # What its neighbours add to its position
+    )
+    inputs = tuple(name for name, width, dtype in fields[:7])
+    pools = {}  # Maps (kind, workers) to an executor, shared by every Steering and kept until exit
+
+    def __init__(self, workers=0, kind=None):
+        self.workers = workers
+        if kind is None:
+            free_threaded = not getattr(sys, "_is_gil_enabled", lambda: True)()
+            kind = "thread" if free_threaded else "process"
+        self.kind = kind
+        self.capacity = 0
+        self.memory = None  # SharedMemory the arrays live in, for process workers
+        self.arrays = None  # Maps each field to an array with capacity rows
+
+    @staticmethod
+    def size(capacity):
+        name, shape, dtype, size, offset = list(Steering.layout(capacity))[-1]
+        return offset + size
+
+    @staticmethod
+    def layout(capacity):
+        """ Yields (name, shape, dtype, bytes, offset) for each field, packed one after another. """
+        offset = 0
+        for name, width, dtype in Steering.fields:
+            shape = (capacity, width) if width > 1 else (capacity,)
+            size = capacity*width*numpy.dtype(dtype).itemsize
+            yield name, shape, dtype, size, offset
+            offset += -(-size//8)*8  # Keeps every array 8 byte aligned
+
+    @staticmethod
+    def views(buffer, capacity):
+        return {name: numpy.ndarray(shape, dtype, buffer, offset)
+                for name, shape, dtype, size, offset in Steering.layout(capacity)}
+
+    def reserve(self, count):
+        """ Returns the arrays, with room for at least count enemies. """
+        if count > self.capacity:
+            self.close()
+            self.capacity = max(64, 2*self.capacity, count)
+            size = Steering.size(self.capacity)
+            if self.workers and self.kind == "process":
+                self.memory = shared_memory.SharedMemory(create=True, size=size)
+                buffer = self.memory.buf
+            else:
+                buffer = bytearray(size)
+            self.arrays = Steering.views(buffer, self.capacity)
+        return self.arrays
+
+    def run(self, count, reach, dt):
+        """ Fills in the results for the first count rows. reach is the furthest apart two enemies can touch. """
+        if not self.workers:
+            steer_stripe(self.arrays, count, -math.inf, math.inf, reach, dt)
+            return
+        pool = self.pool()
+        stripes = self.stripes(count)
+        if self.kind == "process":
+            futures = [pool.submit(steer_shared_stripe, self.memory.name, self.capacity, count, low, high, reach, dt)
+                       for low, high in stripes]
+        else:
+            futures = [pool.submit(steer_stripe, self.arrays, count, low, high, reach, dt) for low, high in stripes]
+        for future in futures:
+            future.result()
+
+    def stripes(self, count):
+        """ Splits the arena at x values that give each worker about as many enemies. """
+        x = numpy.sort(self.arrays["position"][:count, 0])
+        cuts = x[numpy.arange(1, self.workers)*count//self.workers].tolist()
+        return list(zip([-math.inf] + cuts, cuts + [math.inf]))
+
+    def pool(self):
+        key = self.kind, self.workers
+        if key not in Steering.pools:
+            if self.kind == "process":
+                # Spawned rather than forked, so workers don't inherit the game's window and audio threads
+                Steering.pools[key] = ProcessPoolExecutor(self.workers, multiprocessing.get_context("spawn"))
+            else:
+                Steering.pools[key] = ThreadPoolExecutor(self.workers, thread_name_prefix="steering")
+        return Steering.pools[key]
+
+    @staticmethod
+    def shutdown():
+        for pool in Steering.pools.values():
+            pool.shutdown()
+        Steering.pools = {}
+
+    def close(self):
+        self.arrays = None
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __del__(self):
+        self.close()
+
+
+atexit.register(Steering.shutdown)
+
+attached = None  # The SharedMemory a process worker last worked in, and its arrays
+
+
+def steer_shared_stripe(name, capacity, count, low, high, reach, dt):
+    """ steer_stripe in a process worker, on the arrays in the named SharedMemory. """
+    global attached
+    if attached is None or attached[0].name != name:
+        if attached is not None:
+            memory, arrays = attached
+            attached = arrays = None
+            memory.close()
+        memory = shared_memory.SharedMemory(name=name)
+        attached = memory, Steering.views(memory.buf, capacity)
+    steer_stripe(attached[1], count, low, high, reach, dt)
+
+
+def steer_stripe(arrays, count, low, high, reach, dt):
+    """ Steering and separation for the enemies with low <= x < high, out of the first count rows. """
+    x = arrays["position"][:count, 0]
+    owned = numpy.flatnonzero((x >= low) & (x < high))
+    if not len(owned):
+        return
+    steer(arrays, owned, dt)
+    separate(arrays, owned, numpy.flatnonzero((x >= low - reach) & (x < high + reach)), reach, dt)
+
+
+def steer(arrays, rows, dt):
+    """ Enemy.update_target_motion, short of arriving, for the given rows. """
+    direction = arrays["target_position"][rows] - arrays["position"][rows]
+    distance = numpy.sqrt(direction[:, 0]*direction[:, 0] + direction[:, 1]*direction[:, 1])
+    far = distance > 20
+    arrays["far"][rows] = far
+    far_rows = rows[far]
+    target_velocity = direction[far]*(arrays["max_speed"][far_rows]/distance[far])[:, None]
+    arrays["target_velocity"][far_rows] = target_velocity
+    walking = ~arrays["arrived"][far_rows]
+    velocity = arrays["velocity"]
+    velocity[far_rows[walking]] += (target_velocity[walking] - velocity[far_rows[walking]])*5
+    since_start_walking = arrays["since_start_walking"]
+    since_start_walking[far_rows] += dt
+    stopping = ~arrays["arrived"][rows]
+    stopping[far] = since_start_walking[far_rows] > 4
+    arrays["stopping"][rows] = stopping
+
+
+def separate(arrays, rows, nearby, reach, dt):
+    """
+    What every pair of enemies does for each other in Enemy.update_collisions, for the given rows, with nearby
+    (which includes them) as possible neighbours. Overlapping enemies push apart, and ones nearly touching nudge
+    each other's velocity.
+    """
+    position = arrays["position"]
+    radius = arrays["radius"]
+    first, second = neighbour_pairs(position[nearby], reach)
+    first, second = nearby[first], nearby[second]
+    diff = position[first] - position[second]
+    distance = numpy.sqrt(diff[:, 0]*diff[:, 0] + diff[:, 1]*diff[:, 1])
+    touch = radius[first] + radius[second]
+    close = distance < touch + 5
+    first, second, diff, distance, touch = first[close], second[close], diff[close], distance[close], touch[close]
+
+    touching = distance < touch
+    nudge = diff*(~touching*(20*dt))[:, None]
+    unit = numpy.zeros_like(diff)
+    unit[:, 0] = 1  # Pose.scale_to points a zero vector along x, for both of a pair sitting on each other
+    moving = distance > 0
+    unit[moving] = diff[moving]/distance[moving, None]
+    push = unit*(numpy.where(touching, touch - distance, 0)*(100*dt))[:, None]
+    push_back = -push
+    push_back[~moving] = push[~moving]
+
+    # Each pair acts on both of its enemies. Sorting by enemy, then neighbour, adds up each one's neighbours in
+    # the same order however the arena is split.
+    mine = numpy.concatenate([first, second])
+    theirs = numpy.concatenate([second, first])
+    nudge = numpy.concatenate([nudge, -nudge])
+    push = numpy.concatenate([push, push_back])
+    if len(rows) < len(nearby):
+        keep = numpy.isin(mine, rows)
+        mine, theirs, nudge, push = mine[keep], theirs[keep], nudge[keep], push[keep]
+    order = numpy.argsort(mine*len(position) + theirs)
+    index = numpy.searchsorted(rows, mine[order])
+    for axis in (0, 1):
+        arrays["nudge"][rows, axis] = numpy.bincount(index, nudge[order, axis], len(rows))
+        arrays["push"][rows, axis] = numpy.bincount(index, push[order, axis], len(rows))
+
+
+def neighbour_pairs(position, reach):
+    """
+    Returns two index arrays, first and second, of every pair of points that might be within reach of each other:
+    each pair once, from points in the same or neighbouring cells of a grid reach wide.
+    """
+    n = len(position)
+    cells = numpy.floor(position/reach).astype(numpy.int64)
+    cells -= cells.min(axis=0) - 1  # So that every neighbouring cell has a non-negative column and row too
+    height = cells[:, 1].max() + 2
+    keys = cells[:, 0]*height + cells[:, 1]
+    order = numpy.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    first = []
+    second = []
+    # The same cell, then half of the eight around it, so each pair of cells is looked at once
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        wanted = sorted_keys + dx*height + dy
+        start = numpy.searchsorted(sorted_keys, wanted, "left")
+        end = numpy.searchsorted(sorted_keys, wanted, "right")
+        if dx == dy == 0:
+            start = numpy.arange(1, n + 1)  # Only the points after each one in its own cell
+        counts = numpy.maximum(end - start, 0)
+        total = counts.sum()
+        if not total:
+            continue
+        first.append(numpy.repeat(numpy.arange(n), counts))
+        second.append(numpy.repeat(start, counts) + numpy.arange(total) - numpy.repeat(numpy.cumsum(counts) - counts,
+                                                                                        counts))
+    if not first:
+        return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+    return order[numpy.concatenate(first)], order[numpy.concatenate(second)]
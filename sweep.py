@@ -0,0 +1,24 @@
+import math
+
+
+def segment_circle_contact(x, y, dx, dy, cx, cy, radius):
+    """
+    Returns how far along the segment from (x, y) to (x + dx, y + dy) it first comes within radius of (cx, cy), as
+    a fraction from 0 to 1, or None if it never does. A segment that starts inside the circle touches it at 0.
+    """
+    fx = x - cx
+    fy = y - cy
+    outside = fx*fx + fy*fy - radius*radius
+    if outside < 0:
+        return 0.0
+    length_sq = dx*dx + dy*dy
+    closing = fx*dx + fy*dy
+    if length_sq == 0 or closing >= 0:
+        return None  # Standing still, or heading away
+    discriminant = closing*closing - length_sq*outside
+    if discriminant < 0:
+        return None  # Passes wide
+    t = (-closing - math.sqrt(discriminant))/length_sq
+    if t > 1:
+        return None  # Would get there next tick
+    return t
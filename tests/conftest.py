@@ -0,0 +1,46 @@
+"""
+Shared setup for the tests: pygame on the dummy drivers, run from the repo root so asset paths resolve.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.chdir(ROOT)  # Asset paths are relative to the repo root
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pygame
+import pytest
+
+import constants as c
+from image_manager import ImageManager
+from random_streams import RandomStreams
+from sound_manager import SoundManager
+
+
+@pytest.fixture(scope="session")
+def screen():
+    pygame.init()
+    SoundManager.init()
+    ImageManager.init()
+    return pygame.display.set_mode(c.WINDOW_SIZE)
+
+
+@pytest.fixture
+def empty_frame(screen):
+    """ A GameFrame with only the player in it. """
+    from frame import GameFrame
+    RandomStreams.seed(0)
+    frame = GameFrame(None)
+    frame.enemies.clear()
+    for agent in list(frame.depth_order):
+        if not agent.is_player:
+            frame.depth_order.discard(agent)
+    frame.depth_order.repair()
+    frame.enemy_grid.clear()
+    return frame
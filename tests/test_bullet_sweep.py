@@ -0,0 +1,77 @@
+import pytest
+
+from bullet import Bullet
+from enemy import Enemy
+from sweep import segment_circle_contact
+
+
+def add_enemy(frame, position):
+    enemy = Enemy(frame, position)
+    enemy.health = 10**9
+    frame.enemies.append(enemy)
+    frame.depth_order.insert(enemy)
+    frame.enemy_grid.insert(enemy)
+    frame.depth_order.repair()
+    return enemy
+
+
+def test_contact_starting_inside_is_at_the_start():
+    assert segment_circle_contact(1, 1, 100, 0, 0, 0, 5) == 0.0
+    assert segment_circle_contact(1, 1, -100, 0, 0, 0, 5) == 0.0  # Even heading away
+
+
+def test_contact_part_way_along():
+    assert segment_circle_contact(-20, 0, 40, 0, 0, 0, 5) == pytest.approx(15/40)
+
+
+def test_contact_tangent_segment_touches():
+    assert segment_circle_contact(-10, 5, 20, 0, 0, 0, 5) == pytest.approx(0.5)
+    assert segment_circle_contact(-10, 5.001, 20, 0, 0, 0, 5) is None
+
+
+def test_contact_zero_length_motion():
+    assert segment_circle_contact(10, 0, 0, 0, 0, 0, 5) is None
+    assert segment_circle_contact(3, 0, 0, 0, 0, 0, 5) == 0.0
+
+
+def test_contact_misses():
+    assert segment_circle_contact(-20, 0, -40, 0, 0, 0, 5) is None  # Heading away
+    assert segment_circle_contact(-100, 0, 40, 0, 0, 0, 5) is None  # Not there by the end of the segment
+
+
+def fire(frame, distance, dt):
+    """ Fires one bullet along the x axis at the enemy at the origin, sweeping every tick, until it's past it. """
+    bullet = Bullet((-distance, 0), (1, 0), frame=frame)
+    while not bullet.destroyed and bullet.position.x < 200:
+        x, y = bullet.position.x, bullet.position.y
+        bullet.update(dt, [])
+        frame.collide_bullets([(bullet, x, y)])
+    return bullet
+
+
+def test_no_tunnelling_at_20_fps(empty_frame):
+    enemy = add_enemy(empty_frame, (0, 0))
+    # A bullet covers 125 px a tick at 20 FPS, against a 90 px wide target, so some of these would skip it
+    missed = [distance for distance in range(60, 260) if enemy not in fire(empty_frame, distance, 0.05).enemies_hit]
+    assert missed == []
+
+
+def test_pierce_hits_nearest_first(empty_frame):
+    for x in (300, 200, 100):  # Furthest first, so the hits have to be put in order along the path
+        add_enemy(empty_frame, (x, 0))
+    bullet = Bullet((0, 0), (1, 0), pierce=2, frame=empty_frame)
+    bullet.update(0.15, [])
+    empty_frame.collide_bullets([(bullet, 0, 0)])
+    assert sorted(enemy.position.x for enemy in bullet.enemies_hit) == [100, 200]
+    assert bullet.destroyed
+
+
+def test_enemies_hit_stops_a_second_hit(empty_frame):
+    enemy = add_enemy(empty_frame, (100, 0))
+    bullet = Bullet((0, 0), (1, 0), pierce=5, frame=empty_frame)
+    bullet.update(0.06, [])
+    for tick in range(3):  # The bullet is still overlapping the enemy each time
+        empty_frame.collide_bullets([(bullet, 0, 0)])
+    assert bullet.enemies_hit == {enemy}
+    assert enemy.health == 10**9 - bullet.damage
+    assert bullet.pierce == 4
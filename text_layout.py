@@ -0,0 +1,86 @@
+from bisect import bisect_left
+
+import pygame
+
+
+def composite(size, placed):
+    """
+    A transparent surface of the given size with each (surface, position) in placed copied onto it. They mustn't
+    overlap: taking the max over transparent black copies each exactly, with its own alpha.
+    """
+    rendered = pygame.Surface(size, pygame.SRCALPHA)
+    rendered.fill((0, 0, 0, 0))
+    blits = [(surface, position, None, pygame.BLEND_RGBA_MAX) for surface, position in placed]
+    rendered.blits(blits, doreturn=False)
+    return rendered
+
+
+class TextLayout:
+    """
+    A line of dialog laid out once, for revealing a character at a time.
+
+    Words wrap at max_width, and a "|" in a word draws the rest of it in the highlight colour, as Gary has always
+    done. Each wrapped row is rendered into one surface for the normal glyphs and one for the highlighted ones, so
+    revealing the first n characters is a clipped blit or two per row, rather than a blit per character.
+    """
+
+    def __init__(self, text, letters, highlight_letters, max_width, line_height):
+        self.text = text
+        space = letters[" "].get_width()
+        # Each glyph is (reveal gate, x, y, surface, highlighted). A glyph shows once more than its gate's worth of
+        # characters are showing: the letter before it, or the space before its word. The first always shows.
+        glyphs = []
+        gate = float("-inf")
+        drawn = 0
+        x = y = 0
+        for word in text.split():
+            width = sum(letters[letter].get_width() for letter in word)
+            if x + width > max_width:
+                x = 0
+                y += line_height
+            highlighted = False
+            for letter in word:
+                if letter == "|":
+                    highlighted = True
+                    continue
+                glyphs.append((gate, x, y, (highlight_letters if highlighted else letters)[letter], highlighted))
+                drawn += 1
+                gate = drawn
+                x += letters[letter].get_width()
+            gate = drawn
+            x += space
+            drawn += 1
+        self.gates = [glyph[0] for glyph in glyphs]
+
+        self.rows = []  # (y, index of its first glyph, right edge after each glyph, normal surface, highlighted surface)
+        for row_y in sorted({glyph[2] for glyph in glyphs}):
+            first = next(i for i, glyph in enumerate(glyphs) if glyph[2] == row_y)
+            row = [glyph for glyph in glyphs if glyph[2] == row_y]
+            ends = [x + surface.get_width() for gate, x, y, surface, highlighted in row]
+            height = max(surface.get_height() for gate, x, y, surface, highlighted in row)
+            layers = []
+            for layer in (False, True):
+                placed = [(surface, (x, 0)) for gate, x, y, surface, highlighted in row if highlighted == layer]
+                layers.append(composite((ends[-1], height), placed) if placed else None)
+            self.rows.append((row_y, first, ends, *layers))
+
+    def visible(self, characters):
+        """ How many glyphs show when characters worth of the line has been revealed. """
+        return bisect_left(self.gates, characters)
+
+    def draw(self, surface, position, characters, alpha=255):
+        """
+        Draws the revealed part of the line with its top left at position. alpha fades the normal glyphs only;
+        highlighted ones stay opaque.
+        """
+        count = self.visible(characters)
+        x0, y0 = position
+        for y, first, ends, normal, highlighted in self.rows:
+            if first >= count:
+                break
+            width = ends[min(count - first, len(ends)) - 1]
+            if normal is not None:
+                normal.set_alpha(alpha)
+                surface.blit(normal, (x0, y0 + y), (0, 0, width, normal.get_height()))
+            if highlighted is not None:
+                surface.blit(highlighted, (x0, y0 + y), (0, 0, width, highlighted.get_height()))
@@ -0,0 +1,75 @@
+class FixedTimestep:
+    """
+    Accumulates real frame time and hands it back out as a whole number of fixed-length simulation steps, so the
+    game's physics behave the same regardless of frame rate.
+
+    If the machine can't keep up, rendering is skipped first (up to max_skipped_renders frames in a row). If it's
+    still behind after that, the leftover time is dropped rather than simulated, so a slow frame can't snowball
+    into ever longer catch-up frames.
+    """
+
+    def __init__(self, rate=100, max_steps_per_frame=5, max_skipped_renders=2):
+        self.step = 1/rate
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_skipped_renders = max_skipped_renders
+        self.accumulator = 0
+        self.behind = False
+        self.skipped_in_a_row = 0
+
+        # Metrics
+        self.steps_last_frame = 0
+        self.most_steps_per_frame = 0
+        self.frames = 0
+        self.total_steps = 0
+        self.renders = 0
+        self.skipped_renders = 0
+        self.dropped_time = 0
+
+    def advance(self, dt):
+        """
+        Adds a frame's worth of time and returns how many fixed steps to simulate this frame.
+        """
+        self.accumulator += dt
+        steps = min(int(self.accumulator / self.step), self.max_steps_per_frame)
+        self.accumulator -= steps * self.step
+        self.behind = self.accumulator >= self.step
+        if self.behind and self.skipped_in_a_row >= self.max_skipped_renders:
+            # Spiral of death guard: give up on the backlog instead of carrying it into the next frame
+            leftover = self.accumulator % self.step
+            self.dropped_time += self.accumulator - leftover
+            self.accumulator = leftover
+            self.behind = False
+
+        self.steps_last_frame = steps
+        self.most_steps_per_frame = max(self.most_steps_per_frame, steps)
+        self.frames += 1
+        self.total_steps += steps
+        return steps
+
+    def should_render(self):
+        """
+        Returns whether this frame should be drawn, or skipped to spend the time catching up on simulation instead.
+        """
+        if self.behind:
+            self.skipped_in_a_row += 1
+            self.skipped_renders += 1
+            return False
+        self.skipped_in_a_row = 0
+        self.renders += 1
+        return True
+
+    def alpha(self):
+        """
+        How far the leftover time is into the next step, from 0 to 1, for interpolating between the last two steps.
+        """
+        return min(1, self.accumulator / self.step)
+
+    def average_steps_per_frame(self):
+        if not self.frames:
+            return 0
+        return self.total_steps / self.frames
+
+    def summary(self):
+        return (f"{self.steps_last_frame} steps last frame, {self.average_steps_per_frame():.2f} average, "
+                f"{self.most_steps_per_frame} max, {self.skipped_renders} renders skipped, "
+                f"{self.dropped_time:.2f}s dropped")